@@ -0,0 +1,61 @@
+"""
+Benchmark of TextNormalizer.replace_diacritics: legacy per-pattern `re.sub` loop vs compiled engine.
+
+The sentences of the bundled manifests/example_*.json are replicated up to `--lines` and both
+paths are timed on the same input. Outputs are compared and the run fails if they differ.
+
+Usage (from the repository root):
+    PYTHONPATH=scripts python benchmarks/bench_replace_diacritics.py --lines 1000000
+"""
+import argparse
+import itertools
+import logging
+import re
+import time
+import corpus_utils as cu
+from normalizer import TextNormalizer
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+LEGACY_EU_SPECIFIC = {
+    r"[É]": "E", r"[Á]": "A", r"[ÚÜ]": "U", r"[Ó]": "O", r"[Í]": "I",
+    r"[é]": "e", r"[á]": "a", r"[úü]": "u", r"[ó]": "o", r"[í]": "i"
+}
+
+def legacy_replace_diacritics(normalizer, text):
+    """Reference implementation: one `re.sub` per pattern, as replace_diacritics used to do."""
+    for pattern, replacement in normalizer.diacritic_map.items():
+        text = re.sub(pattern, replacement, text)
+    if normalizer.lang == "eu":
+        for pattern, replacement in LEGACY_EU_SPECIFIC.items():
+            text = re.sub(pattern, replacement, text)
+    return text
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=1_000_000, help="Number of sentences per language.")
+    parser.add_argument("--manifests", default="./manifests", help="Folder with the example_*.json manifests.")
+    args = parser.parse_args()
+
+    for lang in ["es", "eu"]:
+        sentences = [item["text"] for item in cu.read_manifest(f"{args.manifests}/example_{lang}.json", verbose=False)]
+        sentences = list(itertools.islice(itertools.cycle(sentences), args.lines))
+        normalizer = TextNormalizer(lang=lang, verbose=False)
+
+        start = time.perf_counter()
+        legacy = [legacy_replace_diacritics(normalizer, text) for text in sentences]
+        t_legacy = time.perf_counter() - start
+
+        start = time.perf_counter()
+        compiled = [normalizer.replace_diacritics({"text": text})["text"] for text in sentences]
+        t_compiled = time.perf_counter() - start
+
+        if legacy != compiled:
+            raise Exception(f"ERROR: compiled output differs from legacy output ({lang})")
+        logging.info(f"=============[ {lang} | {args.lines} lines ]=============")
+        logging.info(f"- Legacy re.sub loop: {round(t_legacy, 2)} s ({round(args.lines / t_legacy)} lines/s)")
+        logging.info(f"- Compiled engine: {round(t_compiled, 2)} s ({round(args.lines / t_compiled)} lines/s)")
+        logging.info(f"- Speedup: x{round(t_legacy / t_compiled, 1)}")
+
+if __name__ == "__main__":
+    main()
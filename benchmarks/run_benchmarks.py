@@ -0,0 +1,170 @@
+"""
+Reproducible benchmark suite: normalization, deduplication, duration stats, TSV ingestion and WER.
+
+Synthetic es/eu corpora of every `--sizes` are generated once in `--data` (see synthetic_corpus.py)
+and each benchmark runs in a fresh process, so its peak RSS is not inflated by the previous ones:
+
+    - normalizer           TextNormalizer (acronyms, blacklist) on the manifest items
+    - reduce_data          exact deduplication of the manifest items
+    - manifest_time_stats  duration statistics streamed from the manifest file
+    - tsv2data             TSV ingestion without audio probing
+    - tsv2data_probe       TSV ingestion probing a tree of `--wav_files` WAV files
+    - calculate_wer        normalization + WER of the hypothesis manifest
+
+The best wall time of `--repeat` runs, the throughput and the peak RSS of each benchmark are logged
+and saved as JSON. Pass a previous results file as `--baseline` to compare against it: benchmarks
+slower than the baseline by more than `--tolerance` are reported as regressions (exit code 1).
+
+Usage (from the repository root):
+    PYTHONPATH=scripts python benchmarks/run_benchmarks.py --sizes 10000 100000 --output benchmarks/results/new.json
+    PYTHONPATH=scripts python benchmarks/run_benchmarks.py --sizes 10000 100000 --baseline benchmarks/results/base.json
+"""
+import os
+os.environ.setdefault("TQDM_DISABLE", "1")
+import sys
+import json
+import time
+import logging
+import argparse
+import platform
+import subprocess
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import corpus_utils as cu
+import profiling
+from normalizer import TextNormalizer
+from wer_evaluator import calculate_wer
+from synthetic_corpus import BLACKLIST_TERMS, generate_corpus, generate_wav_tree
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+def _read_manifest(files, lang):
+    return cu.read_manifest(files["manifest"], verbose=False)
+
+def _normalize(data, lang):
+    TextNormalizer(lang=lang, remove_acronyms=True, blacklist_terms=BLACKLIST_TERMS, verbose=False)(data)
+    return len(data)
+
+def _reduce(data, lang):
+    cu.reduce_data(data)
+    return len(data)
+
+def _time_stats(manifest_filepath, lang):
+    return cu.manifest_time_stats(manifest_filepath, return_stats=True, verbose=False)["sentences"]
+
+def _tsv2data(tsv_filepath, lang):
+    return len(cu.tsv2data(tsv_filepath, clips_folder="clips"))
+
+def _tsv2data_probe(wavs, lang):
+    return len(cu.tsv2data(wavs["tsv"], clips_folder=wavs["clips_folder"], calculate_duration=True))
+
+def _calculate_wer(hypotheses_filepath, lang):
+    return len(calculate_wer(hypotheses_filepath, lang=lang, return_wer=True, verbose=False)[0])
+
+# name: (prepare(files, lang) -> untimed input of one run, run(input, lang) -> number of items processed)
+BENCHMARKS = {
+    "normalizer": (_read_manifest, _normalize),
+    "reduce_data": (_read_manifest, _reduce),
+    "manifest_time_stats": (lambda files, lang: files["manifest"], _time_stats),
+    "tsv2data": (lambda files, lang: files["tsv"], _tsv2data),
+    "tsv2data_probe": (lambda files, lang: files["wavs"], _tsv2data_probe),
+    "calculate_wer": (lambda files, lang: files["hypotheses"], _calculate_wer),
+}
+
+def _run_benchmark(name, files, lang, repeat):
+    """
+    Worker (fresh process): best wall time of `repeat` runs of a benchmark, and peak RSS of the
+    process after loading the input (`setup_rss_mb`) and after the runs (`peak_rss_mb`).
+    """
+    logging.disable(logging.WARNING)
+    prepare, run = BENCHMARKS[name]
+    times = []
+    setup_rss_mb = None
+    for _ in range(repeat):
+        data = prepare(files, lang)
+        if setup_rss_mb is None:
+            setup_rss_mb = profiling.peak_rss_mb()
+        start = time.perf_counter()
+        items = run(data, lang)
+        times.append(time.perf_counter() - start)
+        del data
+    return {"wall_time": round(min(times), 4), "items": items, "peak_rss_mb": profiling.peak_rss_mb(), "setup_rss_mb": setup_rss_mb}
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(results, baseline, tolerance):
+    """Logs the speedup of every benchmark found in the baseline. Returns the regressions."""
+    baseline_times = {(r["benchmark"], r["lang"], r["rows"]): r["wall_time"] for r in baseline["results"]}
+    regressions = []
+    logging.info(f"::::: Comparison with {baseline.get('commit')} ({baseline.get('date')}) :::::")
+    for result in results:
+        key = (result["benchmark"], result["lang"], result["rows"])
+        if key not in baseline_times:
+            continue
+        ratio = result["wall_time"] / baseline_times[key] if baseline_times[key] > 0 else float("inf")
+        flag = ""
+        if ratio > 1 + tolerance:
+            flag = " <-- REGRESSION"
+            regressions.append(result)
+        logging.info(f"- {key[0]} [{key[1]}, {key[2]} rows]: {baseline_times[key]} s -> {result['wall_time']} s "
+                     f"(x{round(1 / ratio, 2) if ratio > 0 else '-'} speed){flag}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000], help="Rows of the synthetic manifests.")
+    parser.add_argument("--langs", nargs="+", default=["es", "eu"], choices=["es", "eu"])
+    parser.add_argument("--benchmarks", nargs="+", default=list(BENCHMARKS), choices=list(BENCHMARKS))
+    parser.add_argument("--wav_files", type=int, default=1000, help="WAV files of the tsv2data_probe tree.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per benchmark; the best wall time is kept.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--manifests", default="./manifests", help="Folder with the example_*.json manifests.")
+    parser.add_argument("--data", default="./benchmarks/data", help="Folder of the generated corpora (reused between runs).")
+    parser.add_argument("--output", default=None, help="Results JSON (default: benchmarks/results/<date>_<commit>.json).")
+    parser.add_argument("--baseline", default=None, help="Results JSON of a previous run to compare against.")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Slowdown over the baseline reported as a regression.")
+    args = parser.parse_args()
+
+    commit = _git_commit()
+    date = time.strftime("%Y-%m-%dT%H:%M:%S")
+    output = args.output or os.path.join("benchmarks", "results", f"{date.replace(':', '')}_{commit or 'nogit'}.json")
+    results = []
+    context = multiprocessing.get_context("spawn")
+    for lang in args.langs:
+        wavs = generate_wav_tree(args.data, lang, args.wav_files, manifests_folder=args.manifests, seed=args.seed) \
+            if "tsv2data_probe" in args.benchmarks else None
+        for rows in args.sizes:
+            logging.info(f"=============[ {lang} | {rows} rows ]=============")
+            files = dict(generate_corpus(args.data, lang, rows, manifests_folder=args.manifests, seed=args.seed), wavs=wavs)
+            for name in args.benchmarks:
+                if name == "tsv2data_probe" and rows != args.sizes[0]:
+                    # Does not depend on the manifest size
+                    continue
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                    result = executor.submit(_run_benchmark, name, files, lang, args.repeat).result()
+                result = {"benchmark": name, "lang": lang, "rows": rows if name != "tsv2data_probe" else args.wav_files, **result}
+                result["items_per_s"] = round(result["items"] / result["wall_time"], 1) if result["wall_time"] > 0 else None
+                results.append(result)
+                logging.info(f"- {name}: {result['wall_time']} s | {result['items_per_s']} items/s | peak RSS {result['peak_rss_mb']} MB (input loaded: {result['setup_rss_mb']} MB)")
+
+    report = {
+        "date": date, "commit": commit, "python": platform.python_version(), "platform": platform.platform(),
+        "cpu_count": os.cpu_count(), "seed": args.seed, "repeat": args.repeat, "results": results,
+    }
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    logging.info(f"Results saved: {output}")
+
+    if args.baseline is not None:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
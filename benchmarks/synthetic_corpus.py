@@ -0,0 +1,134 @@
+"""
+Deterministic synthetic corpora for the benchmarks.
+
+Sentences are built from the vocabulary of the bundled manifests/example_{es,eu}.json and
+mixed with the cases the pipeline has to deal with: repeated prompts, foreign diacritics,
+acronyms, blacklisted tags and out-of-range durations. For every manifest a matching ASR
+hypothesis manifest and a TSV (Common Voice layout) are written, plus a small tree of
+silent WAV files with its own TSV for the audio probing benchmarks.
+
+The same `seed` always produces the same files.
+"""
+import os
+import csv
+import json
+import wave
+import random
+import corpus_utils as cu
+
+BLACKLIST_TERMS = ["<unk>", r"\[risas\]", r"\(ruido\)", "<sil>"]
+ACRONYMS = ["ONU", "EAJ", "BBK", "DNI", "UPV", "RTVE"]
+FOREIGN_CHARS = ["è", "ã", "ö", "ç", "ß", "ø", "α", "ж", "ñ", "ü", "á"]
+REPEAT_RATE = 0.15
+NOISE_RATE = 0.03
+
+def _vocabulary(manifests_folder, lang):
+    words = set()
+    for item in cu.read_manifest(os.path.join(manifests_folder, f"example_{lang}.json"), verbose=False):
+        words.update(word.strip(".,;:¿?¡!") for word in item["text"].split())
+    return sorted(word for word in words if word)
+
+def _sentence(rng, vocabulary):
+    words = [rng.choice(vocabulary) for _ in range(rng.randint(4, 16))]
+    if rng.random() < NOISE_RATE:
+        words.insert(rng.randrange(len(words)), rng.choice(ACRONYMS))
+    if rng.random() < NOISE_RATE:
+        words.insert(rng.randrange(len(words)), rng.choice(["<unk>", "[risas]", "(ruido)", "<sil>"]))
+    if rng.random() < NOISE_RATE:
+        i = rng.randrange(len(words))
+        word = words[i]
+        j = rng.randrange(len(word))
+        words[i] = word[:j] + rng.choice(FOREIGN_CHARS) + word[j + 1:]
+    text = " ".join(words)
+    return text[0].upper() + text[1:] + rng.choice([".", ".", ".", "?", "!", ","])
+
+def _duration(rng, text):
+    if rng.random() < 0.005:
+        return rng.choice([0.01, 300.0])
+    return round(0.35 * len(text.split()) + rng.uniform(0.3, 1.5), 6)
+
+def perturb(text, vocabulary, rng, error_rate=0.15):
+    """Copy of `text` with random word substitutions, deletions and insertions."""
+    words = []
+    for word in text.split():
+        p = rng.random()
+        if p < error_rate / 3:
+            words.append(rng.choice(vocabulary))
+        elif p < 2 * error_rate / 3:
+            continue
+        elif p < error_rate:
+            words.extend([word, rng.choice(vocabulary)])
+        else:
+            words.append(word)
+    return " ".join(words)
+
+def generate_corpus(data_folder, lang, rows, manifests_folder="./manifests", seed=0):
+    """
+    Writes (if missing) the synthetic manifest, hypothesis manifest and TSV of `rows` items.
+
+    Returns
+    -------
+    dict
+        {"manifest", "hypotheses", "tsv"}: paths of the files.
+    """
+    prefix = os.path.join(data_folder, f"{lang}_{rows}_seed{seed}")
+    files = {"manifest": f"{prefix}.json", "hypotheses": f"{prefix}_hyp.json", "tsv": f"{prefix}.tsv"}
+    if all(os.path.exists(path) for path in files.values()):
+        return files
+    os.makedirs(data_folder, exist_ok=True)
+    rng = random.Random(f"{lang}-{rows}-{seed}")
+    vocabulary = _vocabulary(manifests_folder, lang)
+    sentences = []
+    with open(f"{files['manifest']}.tmp", "w", encoding="utf-8") as f_manifest, \
+         open(f"{files['hypotheses']}.tmp", "w", encoding="utf-8") as f_hypotheses, \
+         open(f"{files['tsv']}.tmp", "w", encoding="utf-8", newline="") as f_tsv:
+        tsv = csv.writer(f_tsv, delimiter="\t", quoting=csv.QUOTE_NONE, escapechar="\\")
+        tsv.writerow(["client_id", "path", "sentence", "up_votes", "down_votes"])
+        for i in range(rows):
+            if sentences and rng.random() < REPEAT_RATE:
+                text = rng.choice(sentences)
+            else:
+                text = _sentence(rng, vocabulary)
+                if len(sentences) < 100000:
+                    sentences.append(text)
+            item = {"audio_filepath": f"clips/{lang}_{i:07d}.wav", "text": text, "duration": _duration(rng, text)}
+            f_manifest.write(json.dumps(item, ensure_ascii=False) + "\n")
+            item["pred_text"] = perturb(text, vocabulary, rng)
+            f_hypotheses.write(json.dumps(item, ensure_ascii=False) + "\n")
+            tsv.writerow([f"client_{i % 997}", f"{lang}_{i:07d}.wav", text, 2, 0])
+    for path in files.values():
+        os.replace(f"{path}.tmp", path)
+    return files
+
+def generate_wav_tree(data_folder, lang, files, manifests_folder="./manifests", seed=0, sample_rate=16000, files_per_folder=500):
+    """
+    Writes (if missing) `files` short silent WAV files (0.2-1.5 s) in nested folders, and a TSV listing them.
+
+    Returns
+    -------
+    dict
+        {"tsv", "clips_folder"}: paths of the TSV and of the root of the WAV tree.
+    """
+    clips_folder = os.path.join(data_folder, f"wavs_{lang}_{files}_seed{seed}")
+    tsv_filepath = f"{clips_folder}.tsv"
+    if os.path.exists(tsv_filepath):
+        return {"tsv": tsv_filepath, "clips_folder": clips_folder}
+    rng = random.Random(f"wav-{lang}-{files}-{seed}")
+    vocabulary = _vocabulary(manifests_folder, lang)
+    rows = []
+    for i in range(files):
+        relative_path = os.path.join(f"{i // files_per_folder:04d}", f"{lang}_{i:07d}.wav")
+        path = os.path.join(clips_folder, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with wave.open(path, "wb") as f:
+            f.setnchannels(1)
+            f.setsampwidth(2)
+            f.setframerate(sample_rate)
+            f.writeframes(b"\0\0" * int(sample_rate * rng.uniform(0.2, 1.5)))
+        rows.append([relative_path, _sentence(rng, vocabulary)])
+    # Written last: its presence marks a complete tree
+    with open(tsv_filepath, "w", encoding="utf-8", newline="") as f:
+        tsv = csv.writer(f, delimiter="\t", quoting=csv.QUOTE_NONE, escapechar="\\")
+        tsv.writerow(["path", "sentence"])
+        tsv.writerows(rows)
+    return {"tsv": tsv_filepath, "clips_folder": clips_folder}
@@ -0,0 +1,72 @@
+"""
+Validation and benchmark of the batched WER engine (wer_evaluator.word_edit_counts) against jiwer.
+
+Hypotheses are synthesized from the reference sentences of the bundled manifests/example_*.json
+(random substitutions, deletions and insertions, fixed seed), replicated up to `--lines` pairs.
+Sentence WERs and the corpus WER must match `jiwer.wer`, otherwise the run fails.
+
+Usage (from the repository root):
+    PYTHONPATH=scripts python benchmarks/validate_wer_engine.py --lines 100000
+"""
+import argparse
+import itertools
+import logging
+import random
+import time
+import jiwer
+from normalizer import TextNormalizer
+import corpus_utils as cu
+from wer_evaluator import word_edit_counts, wer_from_counts
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+def perturb(text, vocabulary, rng, error_rate=0.15):
+    """Return a copy of `text` with random word substitutions, deletions and insertions."""
+    words = []
+    for word in text.split():
+        p = rng.random()
+        if p < error_rate / 3:
+            words.append(rng.choice(vocabulary))
+        elif p < 2 * error_rate / 3:
+            continue
+        elif p < error_rate:
+            words.extend([word, rng.choice(vocabulary)])
+        else:
+            words.append(word)
+    return " ".join(words)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=100_000, help="Number of sentence pairs per language.")
+    parser.add_argument("--manifests", default="./manifests", help="Folder with the example_*.json manifests.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    for lang in ["es", "eu"]:
+        normalizer = TextNormalizer(lang=lang, verbose=False)
+        references = [normalizer.normalize_text(item["text"]) for item in cu.read_manifest(f"{args.manifests}/example_{lang}.json", verbose=False)]
+        vocabulary = sorted({word for text in references for word in text.split()})
+        references = list(itertools.islice(itertools.cycle(references), args.lines))
+        hypotheses = [perturb(text, vocabulary, rng) for text in references]
+
+        start = time.perf_counter()
+        jiwer_wers = [jiwer.wer(ref, hyp) for ref, hyp in zip(references, hypotheses)]
+        jiwer_total = jiwer.wer(references, hypotheses)
+        t_jiwer = time.perf_counter() - start
+
+        start = time.perf_counter()
+        wers, total = wer_from_counts(word_edit_counts(references, hypotheses))
+        t_engine = time.perf_counter() - start
+
+        mismatches = sum(abs(a - b) > 1e-12 for a, b in zip(jiwer_wers, wers))
+        if mismatches or abs(jiwer_total - total) > 1e-12:
+            raise Exception(f"ERROR: {mismatches} sentence WERs differ from jiwer (corpus: {jiwer_total} vs {total})")
+        logging.info(f"=============[ {lang} | {args.lines} pairs ]=============")
+        logging.info(f"- Corpus WER: {round(total*100, 2)} % (matches jiwer)")
+        logging.info(f"- jiwer per sentence: {round(t_jiwer, 2)} s ({round(args.lines / t_jiwer)} pairs/s)")
+        logging.info(f"- Batched engine: {round(t_engine, 2)} s ({round(args.lines / t_engine)} pairs/s)")
+        logging.info(f"- Speedup: x{round(t_jiwer / t_engine, 1)}")
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,6 @@
 import os
 import corpus_utils as cu
 from normalizer import TextNormalizer
-import random
 import logging
 
 logging.basicConfig(level=logging.INFO, format="%(message)s")
@@ -32,11 +31,10 @@ for tsv in [validated_tsv, test_tsv, dev_tsv]:
 
 validated_data = dataset['validated']
 test_data = dataset['test']
-dev_data = dataset['dev']
 
-# Reduce dev split size and write
-random.shuffle(dev_data)
-dev_s_data = dev_data[:620]
+# Reduce dev split size and write (only the sampled lines of dev.json are parsed)
+with cu.MappedManifest(f"{manifests_path}/dev.json") as dev_manifest:
+    dev_s_data = dev_manifest.sample(620)
 cu.write_manifest(f"{manifests_path}/dev-s.json", dev_s_data)
 
 # Clean validated data from test and dev-s data
@@ -0,0 +1,268 @@
+import os
+import hashlib
+import logging
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from tqdm import tqdm
+import soundfile as sf
+from audio_probe import FileCache, safe_stat, thread_map
+
+# Bump when the fingerprint computation changes, so that cached fingerprints are recomputed
+FINGERPRINT_VERSION = 1
+
+# Coarse spectral fingerprint: log band energies of SPECTRAL_SEGMENTS equal time segments of the
+# (silence-trimmed) clip in SPECTRAL_BANDS log-spaced bands, reduced to the signs of their
+# time/frequency second differences: (SEGMENTS - 1) * (BANDS - 1) = 256 bits
+SPECTRAL_SEGMENTS = 17
+SPECTRAL_BANDS = 17
+SPECTRAL_BITS = (SPECTRAL_SEGMENTS - 1) * (SPECTRAL_BANDS - 1)
+_BAND_RANGE_HZ = (250.0, 3800.0)
+_FRAME_SECONDS = 0.032
+_SILENCE_DB = -40.0
+
+def _pcm_hash(pcm, samplerate):
+    """64-bit BLAKE2b of the decoded 16-bit PCM samples, sample rate and channel count."""
+    h = hashlib.blake2b(digest_size=8)
+    h.update(f"{samplerate}:{pcm.shape[1]}:".encode("ascii"))
+    h.update(np.ascontiguousarray(pcm).tobytes())
+    return int.from_bytes(h.digest(), "little")
+
+def _spectral_fingerprint(samples, samplerate):
+    """
+    Coarse spectral fingerprint (SPECTRAL_BITS // 8 bytes) of a mono float signal, or None if it is silent.
+
+    Frame length and bands are defined in seconds and Hz, and the time axis is split in
+    equal parts of the trimmed signal, so the fingerprint does not depend on the sample
+    rate, the gain, the encoder padding or the exact length of the clip.
+    """
+    magnitude = np.abs(samples)
+    peak = magnitude.max() if len(samples) else 0.0
+    if peak <= 0:
+        return None
+    active = np.flatnonzero(magnitude > peak * 10 ** (_SILENCE_DB / 20))
+    samples = samples[active[0]:active[-1] + 1]
+    frame = max(int(samplerate * _FRAME_SECONDS), 16)
+    if len(samples) < frame:
+        samples = np.pad(samples, (0, frame - len(samples)))
+    frames = np.lib.stride_tricks.sliding_window_view(samples, frame)[::frame // 2]
+    nfft = 1 << (frame - 1).bit_length()
+    power = np.abs(np.fft.rfft(frames * np.hanning(frame).astype(np.float32), n=nfft)) ** 2
+    bins = np.searchsorted(np.fft.rfftfreq(nfft, 1 / samplerate), np.geomspace(*_BAND_RANGE_HZ, SPECTRAL_BANDS + 1))
+    # Every band keeps at least one FFT bin, even with short frames
+    bins = np.maximum.accumulate(bins - np.arange(len(bins))) + np.arange(len(bins))
+    band_energy = np.add.reduceat(power[:, :bins[-1]], bins[:-1], axis=1)
+    bounds = np.linspace(0, len(frames), SPECTRAL_SEGMENTS + 1)
+    starts = np.minimum(bounds[:-1].astype(int), len(frames) - 1)
+    stops = np.maximum(bounds[1:].astype(int), starts + 1)
+    segments = np.log(np.stack([band_energy[a:b].mean(axis=0) for a, b in zip(starts, stops)]) + 1e-10)
+    differences = np.diff(np.diff(segments, axis=0), axis=1)
+    return np.packbits(differences.ravel() > 0).tobytes()
+
+def fingerprint_audio(audio_filepath, spectral: bool = True):
+    """
+    Compute the fingerprints of an audio file from its decoded samples.
+
+    Parameters
+    ----------
+    audio_filepath : str
+        Path to the audio file (any format readable by `soundfile`).
+
+    spectral : bool, optional (default=True)
+        Whether to compute the coarse spectral fingerprint too.
+
+    Returns
+    -------
+    dict
+        {
+            'pcm_hash': int (unsigned 64-bit hash of the decoded 16-bit PCM),
+            'spectral': bytes or None (32-byte spectral fingerprint, None for
+                        silent clips or if `spectral=False`),
+            'duration': float (seconds)
+        }
+
+    Raises
+    ------
+    Exception
+        If the file does not exist or cannot be decoded.
+
+    Notes
+    -----
+    - `pcm_hash` is the same for the same samples stored under another name or
+      in another lossless container (e.g. WAV and FLAC).
+    - `spectral` fingerprints of re-encoded (e.g. MP3), resampled, gain-changed or
+      slightly trimmed copies of a clip differ in a few bits only; compare them
+      with `spectral_similarity`.
+    """
+    pcm, samplerate = sf.read(audio_filepath, dtype="int16", always_2d=True)
+    fingerprint = {"pcm_hash": _pcm_hash(pcm, samplerate), "spectral": None, "duration": len(pcm) / samplerate}
+    if spectral:
+        samples = pcm.mean(axis=1, dtype=np.float32) / 32768
+        fingerprint["spectral"] = _spectral_fingerprint(samples, samplerate)
+    return fingerprint
+
+def spectral_similarity(fingerprint_a, fingerprint_b):
+    """Fraction of equal bits of two spectral fingerprints (1.0: identical, about 0.5: unrelated clips)."""
+    a = np.frombuffer(fingerprint_a, dtype=np.uint8)
+    b = np.frombuffer(fingerprint_b, dtype=np.uint8)
+    return 1.0 - np.unpackbits(a ^ b).mean()
+
+class AudioFingerprintCache(FileCache):
+    """
+    Persistent on-disk cache of `fingerprint_audio` results (SQLite), see
+    `audio_probe.FileCache` (it can share the database file of an
+    `audio_probe.AudioMetadataCache`). Fingerprints computed with another
+    FINGERPRINT_VERSION, or without the spectral fingerprint when it is
+    requested, are cache misses.
+
+    Parameters
+    ----------
+    db_filepath : str
+        Path of the SQLite database. Created if it does not exist.
+
+    max_entries : int, optional (default=None)
+        Maximum number of cached files. None means unbounded.
+
+    Examples
+    --------
+    >>> with AudioFingerprintCache("clips_metadata.sqlite") as cache:
+    ...     hashed_data, _ = cu.audio_hashes(data, cache=cache)
+    """
+    TABLE = "audio_fingerprints"
+    COLUMNS = (("version", "INTEGER"), ("has_spectral", "INTEGER"), ("pcm_hash", "BLOB"), ("spectral", "BLOB"),
+               ("duration", "REAL"))
+
+    def get_many(self, keys, spectral: bool = True):
+        """
+        Look up several files at once.
+
+        Parameters
+        ----------
+        keys : list of (path, size, mtime_ns)
+
+        spectral : bool, optional (default=True)
+            Whether the spectral fingerprint is required.
+
+        Returns
+        -------
+        dict
+            {path: fingerprint} for the keys found with a matching size, mtime and version.
+        """
+        return super().get_many(keys, spectral=spectral)
+
+    def put_many(self, entries, spectral: bool = True):
+        """
+        Store several fingerprinted files at once, replacing stale entries.
+
+        Parameters
+        ----------
+        entries : list of ((path, size, mtime_ns), fingerprint)
+
+        spectral : bool, optional (default=True)
+            Whether the fingerprints were computed with the spectral fingerprint.
+        """
+        super().put_many(entries, spectral=spectral)
+
+    def _encode(self, fingerprint, spectral):
+        return (FINGERPRINT_VERSION, int(spectral), fingerprint["pcm_hash"].to_bytes(8, "little"),
+                fingerprint["spectral"], fingerprint["duration"])
+
+    def _decode(self, row, spectral):
+        version, has_spectral, pcm_hash, spectral_fingerprint, duration = row
+        if version != FINGERPRINT_VERSION or (spectral and not has_spectral):
+            return None
+        return {
+            "pcm_hash": int.from_bytes(pcm_hash, "little"),
+            "spectral": spectral_fingerprint if spectral else None,
+            "duration": duration,
+        }
+
+def _safe_fingerprint(args):
+    audio_filepath, spectral = args
+    try:
+        return fingerprint_audio(audio_filepath, spectral=spectral), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+def _process_map(audio_filepaths, spectral, max_workers, verbose):
+    if not audio_filepaths:
+        return []
+    args = [(path, spectral) for path in audio_filepaths]
+    if max_workers is not None and max_workers <= 1:
+        return [_safe_fingerprint(arg) for arg in tqdm(args, desc="Fingerprinting audio", disable=not verbose)]
+    # Several files per task: most clips take a few milliseconds to decode
+    chunksize = max(1, min(64, len(args) // (4 * (max_workers or os.cpu_count() or 1))))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(tqdm(executor.map(_safe_fingerprint, args, chunksize=chunksize), total=len(args),
+                         desc="Fingerprinting audio", disable=not verbose))
+
+def fingerprint_audio_files(audio_filepaths, spectral: bool = True, max_workers: int = None, verbose: bool = True, cache=None):
+    """
+    Fingerprint many audio files with `fingerprint_audio` on a process pool.
+
+    Decoding and the FFTs are CPU bound, so the files are fingerprinted in
+    `max_workers` processes. A file that cannot be decoded does not stop the
+    job: it is reported in the returned error list.
+
+    Parameters
+    ----------
+    audio_filepaths : list of str
+        Paths of the audio files.
+
+    spectral : bool, optional (default=True)
+        Whether to compute the spectral fingerprints too.
+
+    max_workers : int, optional (default=None)
+        Number of processes (None: one per CPU). Use 1 to fingerprint serially.
+
+    verbose : bool, optional (default=True)
+        If True, shows a progress bar and logs one warning per failed file.
+
+    cache : AudioFingerprintCache or str, optional (default=None)
+        Fingerprint cache (or path to its SQLite database). Files whose path,
+        size and mtime match a cached entry are not decoded again; newly
+        fingerprinted files are added to the cache.
+
+    Returns
+    -------
+    tuple (list, list)
+        - fingerprints : list of dict or None, aligned with `audio_filepaths`
+          (None for the files that could not be decoded).
+        - errors : list of (audio_filepath, error message) tuples.
+    """
+    audio_filepaths = list(audio_filepaths)
+    if cache is None:
+        results = _process_map(audio_filepaths, spectral, max_workers, verbose)
+    else:
+        own_cache = isinstance(cache, str)
+        if own_cache:
+            cache = AudioFingerprintCache(cache)
+        stats = thread_map(safe_stat, audio_filepaths, 16, "Checking fingerprint cache", verbose)
+        cached = cache.get_many([key for key, _ in stats if key is not None], spectral=spectral)
+        to_compute = list({key[0]: key for key, _ in stats if key is not None and key[0] not in cached}.values())
+        computed = _process_map([key[0] for key in to_compute], spectral, max_workers, verbose)
+        cache.put_many([(key, fingerprint) for key, (fingerprint, _) in zip(to_compute, computed) if fingerprint is not None],
+                       spectral=spectral)
+        computed = {key[0]: result for key, result in zip(to_compute, computed)}
+        results = []
+        for key, error in stats:
+            if key is None:
+                results.append((None, error))
+            elif key[0] in cached:
+                results.append((cached[key[0]], None))
+            else:
+                results.append(computed[key[0]])
+        if verbose:
+            logging.info(f"- Audio fingerprint cache: {len(cached)} hits, {len(to_compute)} computed")
+        if own_cache:
+            cache.close()
+    fingerprints = []
+    errors = []
+    for path, (fingerprint, error) in zip(audio_filepaths, results):
+        fingerprints.append(fingerprint)
+        if error is not None:
+            errors.append((path, error))
+            if verbose:
+                logging.warning(f"Audio file could not be fingerprinted: {path} ({error})")
+    if verbose and errors:
+        logging.warning(f"- Unreadable audio files: {len(errors)}/{len(audio_filepaths)}")
+    return fingerprints, errors
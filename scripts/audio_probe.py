@@ -0,0 +1,428 @@
+import os
+import time
+import sqlite3
+import struct
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from tqdm import tqdm
+import soundfile as sf
+
+# WAVE format codes whose frame count is data_size / block_align
+_WAV_LINEAR_FORMATS = {0x0001, 0x0003, 0x0006, 0x0007, 0xFFFE}
+
+_MP3_BITRATES = {
+    # (mpeg1, layer): kbps by bitrate index
+    (True, 1): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (True, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (True, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (False, 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (False, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (False, 3): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+_MP3_SAMPLERATES = {3: [44100, 48000, 32000], 2: [22050, 24000, 16000], 0: [11025, 12000, 8000]}
+
+def _info(samplerate, channels, frames):
+    return {
+        "duration": frames / samplerate,
+        "samplerate": samplerate,
+        "channels": channels,
+        "frames": frames,
+    }
+
+def _probe_wav(f, filesize):
+    f.seek(12)
+    fmt = None
+    data_size_64 = None
+    while True:
+        header = f.read(8)
+        if len(header) < 8:
+            return None
+        chunk_id, chunk_size = struct.unpack("<4sI", header)
+        if chunk_id == b"ds64":
+            # RF64: the real data size is stored here, the data chunk size is 0xFFFFFFFF
+            data_size_64 = struct.unpack("<QQ", f.read(16))[1]
+            f.seek(chunk_size - 16, os.SEEK_CUR)
+        elif chunk_id == b"fmt ":
+            fmt = struct.unpack("<HHIIHH", f.read(16))
+            f.seek(chunk_size - 16, os.SEEK_CUR)
+        elif chunk_id == b"data":
+            if fmt is None:
+                return None
+            audio_format, channels, samplerate, _, block_align, _ = fmt
+            if audio_format not in _WAV_LINEAR_FORMATS or not block_align:
+                return None
+            if data_size_64 is not None and chunk_size == 0xFFFFFFFF:
+                chunk_size = data_size_64
+            # Truncated files (or streamed WAVs with a 0/0xFFFFFFFF size) only hold what is on disk
+            data_size = min(chunk_size, filesize - f.tell()) if chunk_size else filesize - f.tell()
+            return _info(samplerate, channels, data_size // block_align)
+        else:
+            f.seek(chunk_size + (chunk_size & 1), os.SEEK_CUR)
+
+def _probe_flac(f):
+    f.seek(4)
+    while True:
+        header = f.read(4)
+        if len(header) < 4:
+            return None
+        block_type = header[0] & 0x7F
+        block_size = int.from_bytes(header[1:4], "big")
+        if block_type == 0:
+            streaminfo = f.read(34)
+            bits = int.from_bytes(streaminfo[10:18], "big")
+            samplerate = bits >> 44
+            channels = ((bits >> 41) & 0x7) + 1
+            frames = bits & 0xFFFFFFFFF
+            if not samplerate or not frames:
+                return None
+            return _info(samplerate, channels, frames)
+        if header[0] & 0x80:
+            return None
+        f.seek(block_size, os.SEEK_CUR)
+
+def _probe_mp3(f, filesize):
+    start = 0
+    header = f.read(10)
+    if header[:3] == b"ID3":
+        # ID3v2 size is a 28-bit syncsafe integer, footer flag adds 10 more bytes
+        size = (header[6] << 21) | (header[7] << 14) | (header[8] << 7) | header[9]
+        start = 10 + size + (10 if header[5] & 0x10 else 0)
+    f.seek(start)
+    buffer = f.read(64 * 1024)
+    for i in range(len(buffer) - 4):
+        if buffer[i] != 0xFF or (buffer[i + 1] & 0xE0) != 0xE0:
+            continue
+        version = (buffer[i + 1] >> 3) & 0x3
+        layer = 4 - ((buffer[i + 1] >> 1) & 0x3)
+        bitrate_index = buffer[i + 2] >> 4
+        samplerate_index = (buffer[i + 2] >> 2) & 0x3
+        if version == 1 or layer == 4 or bitrate_index in (0, 15) or samplerate_index == 3:
+            continue
+        mpeg1 = version == 3
+        samplerate = _MP3_SAMPLERATES[version][samplerate_index]
+        bitrate = _MP3_BITRATES[(mpeg1, layer)][bitrate_index] * 1000
+        channels = 1 if (buffer[i + 3] >> 6) == 3 else 2
+        samples_per_frame = 384 if layer == 1 else (1152 if mpeg1 or layer == 2 else 576)
+        # Xing/Info (VBR and LAME CBR) or VBRI headers give the exact number of frames
+        side_info = (32 if channels == 2 else 17) if mpeg1 else (17 if channels == 2 else 9)
+        xing_start = i + 4 + side_info
+        xing = buffer[xing_start:xing_start + 12]
+        if xing[:4] in (b"Xing", b"Info") and xing[7] & 0x1:
+            frames = int.from_bytes(xing[8:12], "big") * samples_per_frame
+            # LAME tag: encoder delay and padding (12 bits each) are not part of the decoded audio
+            flags = xing[7]
+            lame_start = xing_start + 8 + sum(size for bit, size in [(1, 4), (2, 4), (4, 100), (8, 4)] if flags & bit)
+            if buffer[lame_start:lame_start + 4] == b"LAME":
+                gap = buffer[lame_start + 21:lame_start + 24]
+                frames -= ((gap[0] << 4) | (gap[1] >> 4)) + (((gap[1] & 0xF) << 8) | gap[2])
+            return _info(samplerate, channels, frames)
+        vbri = buffer[i + 36:i + 54]
+        if vbri[:4] == b"VBRI":
+            return _info(samplerate, channels, int.from_bytes(vbri[14:18], "big") * samples_per_frame)
+        # Plain CBR stream: estimate from the audio payload size
+        audio_size = filesize - start - i
+        f.seek(max(filesize - 128, 0))
+        if f.read(3) == b"TAG":
+            audio_size -= 128
+        return _info(samplerate, channels, round(audio_size * 8 / bitrate * samplerate))
+    return None
+
+def probe_audio(audio_filepath):
+    """
+    Read the duration and basic metadata of an audio file from its container header.
+
+    WAV (incl. RF64/WAVE_FORMAT_EXTENSIBLE), FLAC and MP3 headers are parsed
+    directly, reading a few hundred bytes at most instead of opening the file
+    with a decoder. Any other format (or a header that cannot be interpreted)
+    falls back to `soundfile.info`.
+
+    Parameters
+    ----------
+    audio_filepath : str
+        Path to the audio file.
+
+    Returns
+    -------
+    dict
+        {
+            'duration': float (seconds),
+            'samplerate': int,
+            'channels': int,
+            'frames': int
+        }
+
+    Raises
+    ------
+    Exception
+        If the file does not exist or cannot be read by any method.
+
+    Notes
+    -----
+    - MP3 durations come from the Xing/Info/VBRI header when present (minus the
+      LAME encoder delay/padding, matching the decoded length); otherwise they
+      are estimated from the bitrate of the first frame.
+    """
+    filesize = os.path.getsize(audio_filepath)
+    with open(audio_filepath, "rb") as f:
+        magic = f.read(12)
+        f.seek(0)
+        info = None
+        try:
+            if magic[:4] in (b"RIFF", b"RF64") and magic[8:12] == b"WAVE":
+                info = _probe_wav(f, filesize)
+            elif magic[:4] == b"fLaC":
+                info = _probe_flac(f)
+            elif magic[:3] == b"ID3" or (magic[:1] == b"\xff" and (magic[1] & 0xE0) == 0xE0):
+                info = _probe_mp3(f, filesize)
+        except (struct.error, IndexError, KeyError, ZeroDivisionError):
+            info = None
+    if info is None:
+        sf_info = sf.info(audio_filepath)
+        info = _info(sf_info.samplerate, sf_info.channels, sf_info.frames)
+    return info
+
+class FileCache:
+    """
+    Base of the persistent on-disk caches of per-file results (SQLite).
+
+    Entries are keyed by the file path and validated against the file size and
+    modification time: a file that changed on disk is a cache miss and its entry
+    is replaced on the next `put_many`. When `max_entries` is set, the least
+    recently used entries are evicted beyond that size.
+
+    Subclasses set `TABLE` and `COLUMNS` (the (name, SQL type) value columns),
+    and implement `_encode` (value -> column values) and `_decode` (column
+    values -> value, or None if the stored entry cannot be used). Several caches
+    can share the same database file.
+
+    Parameters
+    ----------
+    db_filepath : str
+        Path of the SQLite database. Created if it does not exist.
+
+    max_entries : int, optional (default=None)
+        Maximum number of cached files. None means unbounded.
+    """
+    TABLE = None
+    COLUMNS = ()
+    _BATCH = 500
+
+    def __init__(self, db_filepath, max_entries: int = None):
+        self.db_filepath = db_filepath
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._columns = ", ".join(name for name, _ in self.COLUMNS)
+        self._conn = sqlite3.connect(db_filepath, timeout=60)
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.TABLE} (path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, "
+            f"{', '.join(f'{name} {sql_type}' for name, sql_type in self.COLUMNS)}, last_access REAL)"
+        )
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{self.TABLE}_last_access ON {self.TABLE} (last_access)")
+        self._conn.commit()
+
+    def _encode(self, value, **options):
+        raise NotImplementedError
+
+    def _decode(self, row, **options):
+        raise NotImplementedError
+
+    def get_many(self, keys, **options):
+        """
+        Look up several files at once.
+
+        Parameters
+        ----------
+        keys : list of (path, size, mtime_ns)
+
+        **options
+            Passed to `_decode`.
+
+        Returns
+        -------
+        dict
+            {path: value} for the keys found with a matching size and mtime.
+        """
+        found = {}
+        now = time.time()
+        for i in range(0, len(keys), self._BATCH):
+            batch = {path: (size, mtime_ns) for path, size, mtime_ns in keys[i:i + self._BATCH]}
+            rows = self._conn.execute(
+                f"SELECT path, size, mtime_ns, {self._columns} FROM {self.TABLE} "
+                f"WHERE path IN ({','.join('?' * len(batch))})", list(batch)
+            ).fetchall()
+            for path, size, mtime_ns, *row in rows:
+                if batch[path] == (size, mtime_ns):
+                    value = self._decode(row, **options)
+                    if value is not None:
+                        found[path] = value
+        self._conn.executemany(f"UPDATE {self.TABLE} SET last_access = ? WHERE path = ?", [(now, path) for path in found])
+        self._conn.commit()
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, entries, **options):
+        """
+        Store several files at once, replacing stale entries.
+
+        Parameters
+        ----------
+        entries : list of ((path, size, mtime_ns), value)
+
+        **options
+            Passed to `_encode`.
+        """
+        now = time.time()
+        self._conn.executemany(
+            f"INSERT OR REPLACE INTO {self.TABLE} (path, size, mtime_ns, {self._columns}, last_access) "
+            f"VALUES ({', '.join('?' * (len(self.COLUMNS) + 4))})",
+            [(path, size, mtime_ns, *self._encode(value, **options), now) for (path, size, mtime_ns), value in entries]
+        )
+        if self.max_entries is not None:
+            excess = len(self) - self.max_entries
+            if excess > 0:
+                self._conn.execute(
+                    f"DELETE FROM {self.TABLE} WHERE path IN "
+                    f"(SELECT path FROM {self.TABLE} ORDER BY last_access ASC LIMIT ?)", (excess,)
+                )
+        self._conn.commit()
+
+    def invalidate(self, paths=None):
+        """Remove the given paths from the cache, or every entry if `paths` is None."""
+        if paths is None:
+            self._conn.execute(f"DELETE FROM {self.TABLE}")
+        else:
+            self._conn.executemany(f"DELETE FROM {self.TABLE} WHERE path = ?", [(path,) for path in paths])
+        self._conn.commit()
+
+    def __len__(self):
+        return self._conn.execute(f"SELECT COUNT(*) FROM {self.TABLE}").fetchone()[0]
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+class AudioMetadataCache(FileCache):
+    """
+    Persistent on-disk cache of `probe_audio` results (SQLite), see `FileCache`.
+
+    Parameters
+    ----------
+    db_filepath : str
+        Path of the SQLite database. Created if it does not exist.
+
+    max_entries : int, optional (default=None)
+        Maximum number of cached files. None means unbounded.
+
+    Examples
+    --------
+    >>> with AudioMetadataCache("clips_metadata.sqlite") as cache:
+    ...     data = cu.tsv2data("validated.tsv", clips_folder="clips", calculate_duration=True, cache=cache)
+    """
+    TABLE = "audio_metadata"
+    COLUMNS = (("duration", "REAL"), ("samplerate", "INTEGER"), ("channels", "INTEGER"), ("frames", "INTEGER"))
+
+    def _encode(self, info):
+        return info["duration"], info["samplerate"], info["channels"], info["frames"]
+
+    def _decode(self, row):
+        _, samplerate, channels, frames = row
+        return _info(samplerate, channels, frames)
+
+def safe_stat(filepath):
+    """
+    ((path, size, mtime_ns), None) of a file, the key of `FileCache` entries,
+    or (None, error message) if it cannot be read.
+    """
+    try:
+        st = os.stat(filepath)
+        return (filepath, st.st_size, st.st_mtime_ns), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+def _safe_probe(audio_filepath):
+    try:
+        return probe_audio(audio_filepath), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+def thread_map(fn, items, max_workers, desc, verbose):
+    """`[fn(item) for item in items]` on a pool of `max_workers` threads (serially with 1), with a progress bar."""
+    if max_workers <= 1:
+        return [fn(item) for item in tqdm(items, desc=desc, disable=not verbose)]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(tqdm(executor.map(fn, items), total=len(items), desc=desc, disable=not verbose))
+
+def probe_audio_files(audio_filepaths, max_workers: int = 16, verbose: bool = True, cache=None):
+    """
+    Probe many audio files concurrently with `probe_audio`.
+
+    File opens are I/O bound (especially on network storage), so the files are
+    probed on a thread pool of `max_workers` threads. A file that cannot be
+    probed does not stop the job: it is reported in the returned error list.
+
+    Parameters
+    ----------
+    audio_filepaths : list of str
+        Paths of the audio files to probe.
+
+    max_workers : int, optional (default=16)
+        Number of concurrent probes. Use 1 to probe serially.
+
+    verbose : bool, optional (default=True)
+        If True, shows a progress bar and logs one warning per failed file.
+
+    cache : AudioMetadataCache or str, optional (default=None)
+        Metadata cache (or path to its SQLite database). Files whose path, size
+        and mtime match a cached entry are not opened; newly probed files are
+        added to the cache.
+
+    Returns
+    -------
+    tuple (list, list)
+        - infos : list of dict or None, aligned with `audio_filepaths`
+          (None for the files that could not be probed).
+        - errors : list of (audio_filepath, error message) tuples.
+    """
+    audio_filepaths = list(audio_filepaths)
+    if cache is None:
+        results = thread_map(_safe_probe, audio_filepaths, max_workers, "Probing audio", verbose)
+    else:
+        own_cache = isinstance(cache, str)
+        if own_cache:
+            cache = AudioMetadataCache(cache)
+        stats = thread_map(safe_stat, audio_filepaths, max_workers, "Checking audio cache", verbose)
+        cached = cache.get_many([key for key, _ in stats if key is not None])
+        to_probe = [key for key, _ in stats if key is not None and key[0] not in cached]
+        probed = thread_map(_safe_probe, [key[0] for key in to_probe], max_workers, "Probing audio", verbose)
+        cache.put_many([(key, info) for key, (info, _) in zip(to_probe, probed) if info is not None])
+        probed = {key[0]: result for key, result in zip(to_probe, probed)}
+        results = []
+        for key, error in stats:
+            if key is None:
+                results.append((None, error))
+            elif key[0] in cached:
+                results.append((cached[key[0]], None))
+            else:
+                results.append(probed[key[0]])
+        if verbose:
+            logging.info(f"- Audio metadata cache: {len(cached)} hits, {len(to_probe)} probed")
+        if own_cache:
+            cache.close()
+    infos = []
+    errors = []
+    for path, (info, error) in zip(audio_filepaths, results):
+        infos.append(info)
+        if error is not None:
+            errors.append((path, error))
+            if verbose:
+                logging.warning(f"Audio file could not be probed: {path} ({error})")
+    if verbose and errors:
+        logging.warning(f"- Unreadable audio files: {len(errors)}/{len(audio_filepaths)}")
+    return infos, errors
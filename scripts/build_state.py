@@ -0,0 +1,112 @@
+import json
+import sqlite3
+import hashlib
+
+_ENCODER = json.JSONEncoder(ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+
+def fingerprint(*parts):
+    """
+    Stable 128-bit fingerprint (bytes) of JSON-serializable parts, e.g. a normalizer
+    configuration and a manifest row. Dict key order does not change the fingerprint.
+    """
+    return hashlib.blake2b(_ENCODER.encode(parts).encode("utf-8"), digest_size=16).digest()
+
+class BuildState:
+    """
+    Persistent state of incremental corpus builds (SQLite).
+
+    Maps row fingerprints to the processed output of each build stage, so a new
+    release or delivery only has to process the rows that are new or changed:
+
+        - `TextNormalizer(..., state=state)` reuses the normalization result
+          (kept or removed, and the normalized item) of every row already seen
+          with the same configuration.
+        - `corpus_utils.tsv2data(..., state=state)` (and `probe_durations`) reuses
+          the duration of every audio file already probed, so only new clips are
+          opened.
+
+    Outputs are stored as JSON and returned exactly as they were produced, so an
+    incremental build writes the same bytes as a full rebuild.
+
+    Parameters
+    ----------
+    db_filepath : str
+        Path of the SQLite database. Created if it does not exist.
+
+    Examples
+    --------
+    >>> with BuildState("cv_eu.state.sqlite") as state:
+    ...     data = cu.tsv2data("validated.tsv", clips_folder="clips", calculate_duration=True, state=state)
+    ...     data = TextNormalizer(lang="eu", state=state)(data)
+    """
+    _BATCH = 500
+
+    def __init__(self, db_filepath):
+        self.db_filepath = db_filepath
+        self.hits = 0
+        self.misses = 0
+        self._conn = sqlite3.connect(db_filepath, timeout=60)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS build_state ("
+            "stage TEXT, fingerprint BLOB, output TEXT, PRIMARY KEY (stage, fingerprint))"
+        )
+        self._conn.commit()
+
+    def get_many(self, stage, fingerprints):
+        """
+        Look up the outputs of several rows of a stage at once.
+
+        Returns
+        -------
+        dict
+            {fingerprint: output} for the fingerprints found.
+        """
+        found = {}
+        fingerprints = list(dict.fromkeys(fingerprints))
+        for i in range(0, len(fingerprints), self._BATCH):
+            batch = fingerprints[i:i + self._BATCH]
+            rows = self._conn.execute(
+                f"SELECT fingerprint, output FROM build_state WHERE stage = ? AND fingerprint IN ({','.join('?' * len(batch))})",
+                [stage] + batch
+            ).fetchall()
+            # One JSON array per batch is much faster to decode than one document per row
+            outputs = json.loads("[" + ",".join(output for _, output in rows) + "]")
+            found.update(zip((key for key, _ in rows), outputs))
+        self.hits += len(found)
+        self.misses += len(fingerprints) - len(found)
+        return found
+
+    def put_many(self, stage, entries):
+        """
+        Store the outputs of several rows of a stage.
+
+        Parameters
+        ----------
+        entries : list of (fingerprint, output)
+            Outputs must be JSON-serializable.
+        """
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO build_state VALUES (?, ?, ?)",
+            [(stage, key, json.dumps(output, ensure_ascii=False)) for key, output in entries]
+        )
+        self._conn.commit()
+
+    def clear(self, stage=None):
+        """Remove the entries of a stage, or every entry if `stage` is None."""
+        if stage is None:
+            self._conn.execute("DELETE FROM build_state")
+        else:
+            self._conn.execute("DELETE FROM build_state WHERE stage = ?", (stage,))
+        self._conn.commit()
+
+    def __len__(self):
+        return self._conn.execute("SELECT COUNT(*) FROM build_state").fetchone()[0]
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
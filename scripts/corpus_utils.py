@@ -1,11 +1,85 @@
+import csv
+import gzip
+import hashlib
 import json
+import mmap
 import os
-import statistics
+import random
+import zlib
 import openpyxl
 import logging
+import numpy as np
 import pandas as pd
+from collections import Counter
+from itertools import chain
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from tqdm import tqdm
-import soundfile as sf
+from audio_probe import probe_audio_files, safe_stat, thread_map
+from audio_fingerprint import fingerprint_audio_files, SPECTRAL_BITS
+from build_state import fingerprint
+from iter_utils import iter_chunks
+import profiling
+
+def _open_manifest(manifest_filepath, mode: str = "r", buffer_size: int = 1024 * 1024):
+    """
+    Open a manifest file in text mode, transparently handling compression.
+
+    Files ending in `.gz` are opened with `gzip` and files ending in `.zst` with
+    `zstandard` (optional dependency); any other file is opened as plain UTF-8
+    text with a `buffer_size` bytes I/O buffer.
+    """
+    if manifest_filepath.endswith(".gz"):
+        return gzip.open(manifest_filepath, mode + "t", encoding="utf-8")
+    if manifest_filepath.endswith(".zst"):
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("Reading/writing '.zst' manifests requires 'zstandard': pip install zstandard")
+        return zstandard.open(manifest_filepath, mode + "t", encoding="utf-8")
+    return open(manifest_filepath, mode, encoding="utf-8", buffering=buffer_size)
+
+def iter_manifest(manifest_filepath, verbose: bool = True):
+    """
+    Iterate over a manifest file (JSONL format) one dictionary at a time.
+
+    Unlike `read_manifest`, only one line is held in memory at any time, so
+    manifests larger than the available RAM can be processed.
+
+    Parameters
+    ----------
+    manifest_filepath : str
+        Path to the manifest file. Files ending in `.gz` or `.zst` are
+        decompressed on the fly (`.zst` requires the `zstandard` package).
+        Files ending in `.parquet` are read with `iter_parquet_manifest`.
+
+    verbose : bool, optional (default=True)
+        If True, logs a message indicating which file is being read.
+
+    Yields
+    ------
+    dict
+        One dictionary per non-empty line of the manifest.
+
+    Raises
+    ------
+    Exception
+        If the file cannot be opened.
+    """
+    if verbose==True:
+        logging.info(f"Reading: {manifest_filepath}")
+    if manifest_filepath.endswith(".parquet"):
+        yield from iter_parquet_manifest(manifest_filepath, verbose=False)
+        return
+    try:
+        f = _open_manifest(manifest_filepath, "r")
+    except ImportError:
+        raise
+    except:
+        raise Exception(f"Manifest file could not be opened: {manifest_filepath}")
+    with f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
 
 def read_manifest(manifest_filepath, verbose: bool = True):
     """
@@ -15,6 +89,8 @@ def read_manifest(manifest_filepath, verbose: bool = True):
     ----------
     manifest_filepath : str
         Path to the manifest file. Each line of the file should be a valid JSON object.
+        Files ending in `.gz` or `.zst` are decompressed on the fly, and `.parquet`
+        manifests are read with `iter_parquet_manifest`.
     
     verbose : bool, optional (default=True)
         If True, logs a message indicating which file is being read.
@@ -32,16 +108,66 @@ def read_manifest(manifest_filepath, verbose: bool = True):
     Notes
     -----
     The manifest file is expected to be in JSON Lines format (one JSON object per line).
+    Use `iter_manifest` to stream large manifests without loading them in memory.
     """
-    if verbose==True:
-        logging.info(f"Reading: {manifest_filepath}")
-    try:
-        f = open(manifest_filepath, 'r', encoding='utf-8')
-        data = [json.loads(line) for line in f]
-        f.close()
-        return data
-    except:
-        raise Exception(f"Manifest file could not be opened: {manifest_filepath}")
+    with profiling.stage("read_manifest") as run:
+        data = list(iter_manifest(manifest_filepath, verbose=verbose))
+        run.items = len(data)
+        run.bytes_read = os.path.getsize(manifest_filepath)
+    return data
+
+class ManifestWriter:
+    """
+    Incremental writer for manifest files (JSONL format).
+
+    Items are serialized one at a time through a buffered file handle, so a
+    manifest can be written from a generator without holding it in memory.
+    Files ending in `.gz` or `.zst` are compressed on the fly.
+
+    Parameters
+    ----------
+    manifest_filepath : str
+        Path where the manifest file will be written. Overwritten if it exists.
+
+    ensure_ascii : bool, optional (default=False)
+        If True, the output will have all non-ASCII characters escaped.
+
+    buffer_size : int, optional (default=1 MiB)
+        Size of the write buffer for uncompressed manifests.
+
+    Examples
+    --------
+    >>> with ManifestWriter("train_clean.json") as writer:
+    ...     writer.write_many(normalizer.iter_clean(iter_manifest("train.json")))
+    """
+    def __init__(self, manifest_filepath, ensure_ascii: bool = False, buffer_size: int = 1024 * 1024):
+        if manifest_filepath.endswith(".parquet"):
+            raise ValueError("ERROR: ManifestWriter writes JSONL manifests; use 'write_parquet_manifest' for '.parquet' files")
+        self.manifest_filepath = manifest_filepath
+        self.ensure_ascii = ensure_ascii
+        self.count = 0
+        self._f = _open_manifest(manifest_filepath, "w", buffer_size=buffer_size)
+
+    def write(self, item):
+        """Write a single dictionary as one JSON line."""
+        self._f.write(json.dumps(item, ensure_ascii=self.ensure_ascii) + "\n")
+        self.count += 1
+
+    def write_many(self, items):
+        """Write every dictionary of an iterable. Returns the number of items written."""
+        n = self.count
+        for item in items:
+            self.write(item)
+        return self.count - n
+
+    def close(self):
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
 def write_manifest(manifest_filepath, data, ensure_ascii: bool = False, return_manifest_filepath: bool = False, verbose: bool = True):
     """
@@ -50,10 +176,13 @@ def write_manifest(manifest_filepath, data, ensure_ascii: bool = False, return_m
     Parameters
     ----------
     manifest_filepath : str
-        Path where the manifest file will be written.
+        Path where the manifest file will be written. Files ending in `.gz` or `.zst`
+        are compressed on the fly, and `.parquet` files are written with
+        `write_parquet_manifest`.
     
-    data : list of dict
-        List of dictionaries to write to the file. Each dictionary will be written as a JSON object on a separate line.
+    data : iterable of dict
+        List (or any iterable, e.g. a generator) of dictionaries to write to the file.
+        Each dictionary will be written as a JSON object on a separate line.
     
     ensure_ascii : bool, optional (default=False)
         If True, the output will have all non-ASCII characters escaped. Otherwise, non-ASCII characters are written as-is.
@@ -74,10 +203,13 @@ def write_manifest(manifest_filepath, data, ensure_ascii: bool = False, return_m
     This function overwrites the file if it already exists.
     Each dictionary in `data` is written as a single line in JSON format.
     """
-    f = open(manifest_filepath, "w", encoding="utf-8")
-    for item in data:
-        f.write(json.dumps(item,ensure_ascii=ensure_ascii) + "\n")
-    f.close()
+    with profiling.stage("write_manifest") as run:
+        if manifest_filepath.endswith(".parquet"):
+            run.items = write_parquet_manifest(manifest_filepath, data, verbose=False)
+        else:
+            with ManifestWriter(manifest_filepath, ensure_ascii=ensure_ascii) as writer:
+                run.items = writer.write_many(data)
+        run.bytes_written = os.path.getsize(manifest_filepath)
     if verbose==True:
         logging.info(f"End Writing manifest: {manifest_filepath}")
     if return_manifest_filepath:
@@ -85,14 +217,818 @@ def write_manifest(manifest_filepath, data, ensure_ascii: bool = False, return_m
     else:
         return None
 
-def tsv2data(tsv_filepath: str, clips_folder: str="", sep: str="\t", audio_field="path", text_field="sentence", duration_field=None, calculate_duration: bool=False, header='infer'):
+_ABSENT = object()
+
+class _ManifestColumn:
+    """
+    One field of a `Manifest`, stored compactly.
+
+    kind is "str" (UTF-8 buffer + offsets), "int"/"float" (numpy array), "object"
+    (numpy object array, for lists, dicts, bools or mixed types) or "null" (no
+    value at all). `nulls` is None if every row has a value, else an int8 array
+    with 0 (value), 1 (None) or 2 (key absent from the row).
+    """
+    __slots__ = ("kind", "data", "offsets", "nulls")
+
+    def __init__(self, kind, data, offsets=None, nulls=None):
+        self.kind = kind
+        self.data = data
+        self.offsets = offsets
+        self.nulls = nulls
+
+    @classmethod
+    def from_values(cls, values):
+        """Column of a list of Python values (`_ABSENT` for missing keys)."""
+        nulls = np.fromiter((0 if value is not None and value is not _ABSENT else 1 if value is None else 2
+                             for value in values), dtype=np.int8, count=len(values))
+        present = [value for value in values if value is not None and value is not _ABSENT]
+        if not nulls.any():
+            nulls = None
+        types = {type(value) for value in present}
+        if not types:
+            return cls("null", None, nulls=nulls if nulls is not None else np.zeros(len(values), np.int8))
+        filled = len(present) == len(values)
+        if types == {str}:
+            encoded = [value.encode("utf-8") for value in present] if filled else \
+                      [value.encode("utf-8") if isinstance(value, str) else b"" for value in values]
+            offsets = np.zeros(len(values) + 1, dtype=np.int64)
+            np.cumsum(np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded)), out=offsets[1:])
+            return cls("str", b"".join(encoded), offsets, nulls)
+        if types <= {int, float}:
+            kind, dtype = ("int", np.int64) if types == {int} else ("float", np.float64)
+            array = np.array(present if filled else [value if nulls_value == 0 else 0
+                                                     for value, nulls_value in zip(values, nulls)], dtype=dtype)
+            return cls(kind, array, nulls=nulls)
+        array = np.empty(len(values), dtype=object)
+        array[:] = [value if value is not _ABSENT else None for value in values]
+        return cls("object", array, nulls=nulls)
+
+    @classmethod
+    def concat(cls, columns, lengths):
+        """Column of several consecutive columns (None for a chunk without the field)."""
+        columns = [column if column is not None else cls("null", None, nulls=np.full(length, 2, np.int8))
+                   for column, length in zip(columns, lengths)]
+        if any(column.nulls is not None for column in columns):
+            nulls = np.concatenate([column.nulls if column.nulls is not None else np.zeros(length, np.int8)
+                                    for column, length in zip(columns, lengths)])
+        else:
+            nulls = None
+        kinds = {column.kind for column in columns} - {"null"}
+        if not kinds:
+            return cls("null", None, nulls=nulls)
+        if kinds == {"str"}:
+            buffers, offsets, shift = [], [np.zeros(1, np.int64)], 0
+            for column, length in zip(columns, lengths):
+                if column.kind == "null":
+                    offsets.append(np.full(length, shift, np.int64))
+                    continue
+                buffers.append(column.data)
+                offsets.append(column.offsets[1:] + shift)
+                shift += len(column.data)
+            return cls("str", b"".join(buffers), np.concatenate(offsets), nulls)
+        if kinds <= {"int", "float"}:
+            kind = "int" if kinds == {"int"} else "float"
+            dtype = np.int64 if kind == "int" else np.float64
+            return cls(kind, np.concatenate([column.data.astype(dtype) if column.kind != "null" else np.zeros(length, dtype)
+                                             for column, length in zip(columns, lengths)]), nulls=nulls)
+        values = [value for column, length in zip(columns, lengths) for value in column.take(np.arange(length))]
+        array = np.empty(len(values), dtype=object)
+        array[:] = values
+        return cls("object", array, nulls=nulls)
+
+    def take(self, index):
+        """Python values of the rows in `index` (None for null values, `_ABSENT` for missing keys)."""
+        if self.kind == "str":
+            starts = self.offsets[index].tolist()
+            ends = self.offsets[index + 1].tolist()
+            data = self.data
+            values = [data[start:end].decode("utf-8") for start, end in zip(starts, ends)]
+        elif self.kind == "null":
+            values = [None] * len(index)
+        else:
+            values = self.data[index].tolist()
+        if self.nulls is not None:
+            for i in np.flatnonzero(self.nulls[index]).tolist():
+                values[i] = None if self.nulls[index[i]] == 1 else _ABSENT
+        return values
+
+    @property
+    def nbytes(self):
+        size = 0 if self.data is None else len(self.data) if self.kind == "str" else self.data.nbytes
+        size += 0 if self.offsets is None else self.offsets.nbytes
+        return size + (0 if self.nulls is None else self.nulls.nbytes)
+
+class Manifest:
+    """
+    Compact, read-only in-memory manifest.
+
+    Each field is stored as a column instead of one dict per item: strings
+    (paths, texts) as one UTF-8 buffer with an array of offsets, numbers
+    (durations) as numpy arrays. A million Common Voice items take a fraction
+    of the memory of the equivalent list of dicts.
+
+    Iterating yields the items as new dicts, so a `Manifest` can be given to
+    every function that takes a list of dicts (`TextNormalizer`, `calculate_wer`,
+    `write_manifest`...) and the dicts can be modified without changing the
+    manifest (nested lists or dicts are shared, though). Indexing with a
+    slice, an array of indices or a boolean mask, `filter` and `reduce_data`
+    return views that share the columns instead of copying them.
+
+    Parameters
+    ----------
+    data : iterable of dict
+        Items of the manifest (a list, `iter_manifest`, another `Manifest`...).
+
+    name : str, optional (default=None)
+        Name of the manifest (e.g. its filename), used in logs and reports.
+
+    chunk_size : int, optional (default=65536)
+        Items converted at a time. Only one chunk of dicts is held in memory.
+
+    Examples
+    --------
+    >>> manifest = Manifest.read("train.json")
+    >>> short = manifest.filter(manifest.column("duration") < 10)
+    >>> texts = short.column("text")
+    >>> clean_data = normalizer(short)
+
+    Notes
+    -----
+    - Columns holding only integers are stored as int64, and columns mixing
+      integers and floats as float64 (an integer `5` comes back as `5.0`).
+      Other values (bools, lists, dicts, mixed types) are kept as Python objects.
+    - Keys missing from some items are kept missing, and None values are kept.
+    """
+    def __init__(self, data=(), name: str = None, chunk_size: int = 65536):
+        self.name = name
+        self._index = None
+        if isinstance(data, Manifest):
+            self._columns = data._columns
+            self._length = data._length
+            self._index = data._index
+            self.name = name if name is not None else data.name
+            return
+        chunks = []
+        lengths = []
+        keys = {}
+        for chunk in iter_chunks(data, chunk_size):
+            chunk_keys = dict.fromkeys(key for item in chunk for key in item)
+            keys.update(chunk_keys)
+            chunks.append({key: _ManifestColumn.from_values([item.get(key, _ABSENT) for item in chunk]) for key in chunk_keys})
+            lengths.append(len(chunk))
+        self._columns = {key: _ManifestColumn.concat([chunk.get(key) for chunk in chunks], lengths) for key in keys}
+        self._length = sum(lengths)
+
+    @classmethod
+    def read(cls, manifest_filepath, verbose: bool = True):
+        """Read a manifest file (JSONL, `.gz`, `.zst` or `.parquet`), streaming it with `iter_manifest`."""
+        return cls(iter_manifest(manifest_filepath, verbose=verbose), name=os.path.split(manifest_filepath)[1])
+
+    def _view(self, index):
+        view = Manifest.__new__(Manifest)
+        view.name = self.name
+        view._columns = self._columns
+        view._length = self._length
+        view._index = index
+        return view
+
+    def _rows(self):
+        return np.arange(self._length) if self._index is None else self._index
+
+    def __len__(self):
+        return self._length if self._index is None else len(self._index)
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            row = self._rows()[key]
+            return self._items(np.array([row]))[0]
+        if isinstance(key, slice):
+            return self._view(self._rows()[key])
+        key = np.asarray(key)
+        if key.dtype == bool:
+            if len(key) != len(self):
+                raise ValueError(f"ERROR: Boolean mask of length {len(key)} for a manifest of {len(self)} items")
+            return self._view(self._rows()[key])
+        return self._view(self._rows()[key.astype(np.int64)])
+
+    def _items(self, rows):
+        columns = [(key, column.take(rows)) for key, column in self._columns.items()]
+        items = [{} for _ in range(len(rows))]
+        for key, values in columns:
+            for item, value in zip(items, values):
+                if value is not _ABSENT:
+                    item[key] = value
+        return items
+
+    def __iter__(self, batch_size: int = 4096):
+        rows = self._rows()
+        for start in range(0, len(rows), batch_size):
+            yield from self._items(rows[start:start + batch_size])
+
+    @property
+    def keys(self):
+        """Fields of the manifest, in order of appearance."""
+        return list(self._columns)
+
+    @property
+    def nbytes(self):
+        """Memory used by the columns (shared by all the views) and by the index of this view."""
+        return sum(column.nbytes for column in self._columns.values()) + (0 if self._index is None else self._index.nbytes)
+
+    def column(self, field):
+        """
+        Values of a field for every item: a numpy array for numeric fields (NaN
+        where the value is missing), a list otherwise (None where missing).
+        """
+        if field not in self._columns:
+            raise KeyError(f"ERROR: Field '{field}' not found in the manifest")
+        column = self._columns[field]
+        rows = self._rows()
+        if column.kind in ("int", "float"):
+            values = column.data if self._index is None else column.data[rows]
+            if column.nulls is not None:
+                values = values.astype(np.float64)
+                values[column.nulls[rows] > 0] = np.nan
+            return values
+        return [value if value is not _ABSENT else None for value in column.take(rows)]
+
+    def filter(self, condition):
+        """
+        View of the items that meet `condition`: a boolean array aligned with the
+        items (e.g. `manifest.column("duration") < 10`), or a function called with
+        each item.
+        """
+        if callable(condition):
+            condition = np.fromiter((bool(condition(item)) for item in self), dtype=bool, count=len(self))
+        return self[np.asarray(condition, dtype=bool)]
+
+    def take(self, indices):
+        """View of the items at the given positions."""
+        return self[np.asarray(indices, dtype=np.int64)]
+
+    def to_list(self):
+        """Items as a list of dicts."""
+        return list(self)
+
+    def __repr__(self):
+        return f"Manifest(name={self.name!r}, items={len(self)}, fields={self.keys})"
+
+class MappedManifest:
+    """
+    Random access to the lines of a large JSONL manifest, without reading it.
+
+    The file is memory-mapped and the start/end offset of every non-empty line
+    is kept in a numpy index, so `len()`, `manifest[i]`, slicing and `sample`
+    are O(1) per item and only the requested lines are parsed by `json.loads`.
+    The index is built once (a vectorized scan for newlines) and cached next to
+    the manifest as `<manifest>.idx`; it is rebuilt when the size or the
+    modification time of the manifest change.
+
+    Parameters
+    ----------
+    manifest_filepath : str
+        Path to an uncompressed JSONL manifest (`.gz`, `.zst` and `.parquet`
+        files cannot be memory-mapped).
+
+    index_filepath : str, optional (default=None)
+        Where to cache the line index. Defaults to `<manifest_filepath>.idx`.
+        The index is not cached if the file cannot be written.
+
+    cache_index : bool, optional (default=True)
+        If False, the line index is built in memory and neither read from nor
+        written to `index_filepath`.
+
+    verbose : bool, optional (default=True)
+        If True, logs when the line index is built.
+
+    Examples
+    --------
+    >>> with MappedManifest("dev.json") as dev:
+    ...     dev_s_data = dev.sample(620, seed=0)
+    ...     last_items = dev[-10:]
+    """
+    _SCAN_SIZE = 64 * 1024 * 1024
+
+    def __init__(self, manifest_filepath, index_filepath: str = None, cache_index: bool = True, verbose: bool = True):
+        if manifest_filepath.endswith((".gz", ".zst", ".parquet")):
+            raise ValueError(f"ERROR: Random access needs an uncompressed JSONL manifest: {manifest_filepath}")
+        self.manifest_filepath = manifest_filepath
+        self.index_filepath = index_filepath if index_filepath is not None else f"{manifest_filepath}.idx"
+        self._f = open(manifest_filepath, "rb")
+        stat = os.fstat(self._f.fileno())
+        self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ) if stat.st_size else b""
+        signature = np.array([stat.st_size, stat.st_mtime_ns], dtype=np.int64)
+        index = self._load_index(signature) if cache_index else None
+        if index is None:
+            if verbose:
+                logging.info(f"Indexing lines: {manifest_filepath}")
+            index = self._build_index()
+            if cache_index:
+                self._save_index(signature, index)
+        self._starts, self._ends = index
+
+    def _load_index(self, signature):
+        try:
+            with np.load(self.index_filepath) as cached:
+                if np.array_equal(cached["signature"], signature):
+                    return cached["starts"], cached["ends"]
+        except (OSError, ValueError, KeyError):
+            pass
+        return None
+
+    def _save_index(self, signature, index):
+        tmp_filepath = f"{self.index_filepath}.tmp"
+        try:
+            with open(tmp_filepath, "wb") as f:
+                np.savez(f, signature=signature, starts=index[0], ends=index[1])
+            os.replace(tmp_filepath, self.index_filepath)
+        except OSError as e:
+            logging.warning(f"Line index could not be cached in {self.index_filepath} ({e})")
+
+    def _build_index(self):
+        """Start and end offsets of the non-empty lines."""
+        size = len(self._mm)
+        view = np.frombuffer(self._mm, dtype=np.uint8) if size else np.zeros(0, dtype=np.uint8)
+        newlines = [
+            np.flatnonzero(view[start:start + self._SCAN_SIZE] == 10) + start
+            for start in range(0, size, self._SCAN_SIZE)
+        ]
+        # The last line may not end with a newline
+        ends = np.concatenate(newlines + [np.array([size])]).astype(np.int64)
+        starts = np.concatenate([np.zeros(1, dtype=np.int64), ends[:-1] + 1])
+        keep = ends > starts
+        # Blank lines are skipped as in `iter_manifest`; only the lines starting with whitespace are checked
+        candidates = np.flatnonzero(keep)
+        candidates = candidates[np.isin(view[starts[candidates]], [9, 13, 32])]
+        del view
+        for i in candidates.tolist():
+            if not self._mm[starts[i]:ends[i]].strip():
+                keep[i] = False
+        return starts[keep], ends[keep]
+
+    def __len__(self):
+        return len(self._starts)
+
+    def _line(self, i):
+        return json.loads(self._mm[self._starts[i]:self._ends[i]])
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [self._line(i) for i in range(*key.indices(len(self)))]
+        if isinstance(key, (int, np.integer)):
+            if key < 0:
+                key += len(self)
+            if not 0 <= key < len(self):
+                raise IndexError(f"ERROR: Index {key} out of range for a manifest of {len(self)} items")
+            return self._line(key)
+        return [self[int(i)] for i in key]
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self._line(i)
+
+    def sample(self, k: int, seed=None):
+        """`k` random items without replacement (all of them, shuffled, if `k` >= len)."""
+        return self[random.Random(seed).sample(range(len(self)), min(k, len(self)))]
+
+    def close(self):
+        if self._mm:
+            self._mm.close()
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+def _import_pyarrow():
+    """Import the optional `pyarrow` dependency used by the `.parquet` manifests."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Reading/writing '.parquet' manifests requires 'pyarrow': pip install pyarrow")
+    return pa, pq
+
+def _batch_table(batch, schema=None):
+    """Arrow table of a list of manifest dicts, with a column for every key found in any of them."""
+    pa, _ = _import_pyarrow()
+    keys = schema.names if schema is not None else dict.fromkeys(key for item in batch for key in item)
+    return pa.Table.from_pydict({key: [item.get(key) for item in batch] for key in keys}, schema=schema)
+
+def _manifest_schema(batches):
+    """
+    Arrow schema of batches of manifest dicts, plus the "sparse" columns: keys missing from
+    some rows (and never explicitly null), which are dropped again when reading back.
+    """
+    pa, _ = _import_pyarrow()
+    schema = None
+    batch_keys = []
+    missing = set()
+    explicit_null = set()
+    for batch in batches:
+        batch_schema = _batch_table(batch).schema
+        schema = batch_schema if schema is None else pa.unify_schemas([schema, batch_schema], promote_options="permissive")
+        keys = set(batch_schema.names)
+        batch_keys.append(keys)
+        for item in batch:
+            if len(item) < len(keys):
+                missing.update(keys.difference(item))
+            if None in item.values():
+                explicit_null.update(key for key, value in item.items() if value is None)
+    if schema is None:
+        return pa.schema([]), []
+    for keys in batch_keys:
+        missing.update(set(schema.names) - keys)
+    sparse = [name for name in schema.names if name in missing and name not in explicit_null]
+    return schema.with_metadata({"corpus_utils": json.dumps({"sparse_columns": sparse})}), sparse
+
+def write_parquet_manifest(parquet_filepath, data, batch_size: int = 65536, compression: str = "snappy", verbose: bool = True):
+    """
+    Write a manifest in the columnar Parquet format (requires `pyarrow`).
+
+    Parameters
+    ----------
+    parquet_filepath : str
+        Destination `.parquet` file. Overwritten if it exists.
+
+    data : str, list or iterable of dict
+        Manifest items, or the path of a manifest readable by `iter_manifest`. A path is
+        streamed twice (schema inference and writing), so the JSONL file is never fully
+        loaded; any other iterable is materialized as a list first.
+
+    batch_size : int, optional (default=65536)
+        Number of rows per written record batch.
+
+    compression : str, optional (default="snappy")
+        Parquet compression codec ("snappy", "zstd", "gzip", "none"...).
+
+    verbose : bool, optional (default=True)
+        If True, logs a message when writing is finished.
+
+    Returns
+    -------
+    int
+        Number of rows written.
+
+    Notes
+    -----
+    The conversion is lossless for flat manifests: every key becomes a column (integers
+    mixed with floats are stored as floats), and keys missing from some rows are left
+    out again by `iter_parquet_manifest`.
+    """
+    pa, pq = _import_pyarrow()
+    if isinstance(data, str):
+        manifest_filepath = data
+        batches = lambda: iter_chunks(iter_manifest(manifest_filepath, verbose=False), batch_size)
+    else:
+        data = data if isinstance(data, list) else list(data)
+        batches = lambda: (data[i:i + batch_size] for i in range(0, len(data), batch_size))
+    schema, _ = _manifest_schema(batches())
+    rows = 0
+    with pq.ParquetWriter(parquet_filepath, schema, compression=compression) as writer:
+        for batch in batches():
+            writer.write_table(_batch_table(batch, schema))
+            rows += len(batch)
+    if verbose:
+        logging.info(f"End Writing manifest: {parquet_filepath} ({rows} rows)")
+    return rows
+
+def _sparse_columns(schema):
+    metadata = (schema.metadata or {}).get(b"corpus_utils")
+    return set(json.loads(metadata)["sparse_columns"]) if metadata else set()
+
+def iter_parquet_manifest(parquet_filepath, columns=None, batch_size: int = 65536, verbose: bool = True):
+    """
+    Iterate over a `.parquet` manifest one dictionary at a time (requires `pyarrow`).
+
+    Only one record batch of `batch_size` rows is decoded at a time, and with
+    `columns` the other columns are not even read from disk.
+
+    Parameters
+    ----------
+    parquet_filepath : str
+        Path of a manifest written by `write_parquet_manifest`.
+
+    columns : list of str, optional
+        Keys to read. None reads every column.
+
+    batch_size : int, optional (default=65536)
+        Number of rows decoded at a time.
+
+    verbose : bool, optional (default=True)
+        If True, logs a message indicating which file is being read.
+
+    Yields
+    ------
+    dict
+        One dictionary per row, with the same keys and values as the source manifest.
+    """
+    _, pq = _import_pyarrow()
+    if verbose:
+        logging.info(f"Reading: {parquet_filepath}")
+    parquet_file = pq.ParquetFile(parquet_filepath)
+    sparse = _sparse_columns(parquet_file.schema_arrow)
+    for batch in parquet_file.iter_batches(batch_size=batch_size, columns=columns):
+        rows = batch.to_pylist()
+        if sparse:
+            rows = [{key: value for key, value in row.items() if value is not None or key not in sparse} for row in rows]
+        yield from rows
+
+def read_parquet_manifest(parquet_filepath, columns=None, verbose: bool = True):
+    """Read a `.parquet` manifest into a list of dictionaries (see `iter_parquet_manifest`)."""
+    return list(iter_parquet_manifest(parquet_filepath, columns=columns, verbose=verbose))
+
+def convert_manifest(src_manifest_filepath, dst_manifest_filepath, verbose: bool = True):
+    """
+    Convert a manifest between the JSONL (`.json`, `.gz`, `.zst`) and Parquet (`.parquet`)
+    formats, chosen by the file extensions. The conversion is streamed and lossless in
+    both directions (see `write_parquet_manifest`).
+
+    Returns
+    -------
+    str
+        The destination path.
+    """
+    if dst_manifest_filepath.endswith(".parquet"):
+        write_parquet_manifest(dst_manifest_filepath, src_manifest_filepath, verbose=verbose)
+    else:
+        write_manifest(dst_manifest_filepath, iter_manifest(src_manifest_filepath, verbose=False), verbose=verbose)
+    return dst_manifest_filepath
+
+def read_manifest_columns(manifest_filepath, columns, verbose: bool = True):
+    """
+    Read some columns of a manifest as NumPy arrays, without building per-row dictionaries
+    for `.parquet` manifests (JSONL manifests are streamed line by line instead).
+
+    Parameters
+    ----------
+    manifest_filepath : str
+        Path to a `.parquet` or JSONL manifest.
+
+    columns : list of str
+        Keys to read, e.g. ["duration"] or ["text"].
+
+    verbose : bool, optional (default=True)
+        If True, logs a message indicating which file is being read.
+
+    Returns
+    -------
+    dict
+        {column: numpy.ndarray}. Numeric columns are numeric arrays (missing values are
+        NaN), any other column is an object array.
+    """
+    if verbose:
+        logging.info(f"Reading columns {columns}: {manifest_filepath}")
+    if manifest_filepath.endswith(".parquet"):
+        _, pq = _import_pyarrow()
+        table = pq.read_table(manifest_filepath, columns=columns)
+        return {column: table.column(column).to_numpy() for column in columns}
+    values = {column: [] for column in columns}
+    for item in iter_manifest(manifest_filepath, verbose=False):
+        for column in columns:
+            values[column].append(item.get(column))
+    arrays = {}
+    for column, column_values in values.items():
+        if not all(value is None or isinstance(value, (int, float)) for value in column_values):
+            arrays[column] = np.asarray(column_values, dtype=object)
+        elif None in column_values:
+            arrays[column] = np.array([np.nan if value is None else value for value in column_values], dtype=float)
+        else:
+            arrays[column] = np.asarray(column_values)
+    return arrays
+
+def filter_parquet_manifest(src_parquet_filepath, dst_parquet_filepath, min_duration: float = None, max_duration: float = None,
+                            compare_index=None, remove_duplicates: bool = False, field: str = "text", verbose: bool = True):
+    """
+    Column-wise duration filtering and deduplication of a `.parquet` manifest.
+
+    Only the `duration` and `field` columns are decoded to compute a row mask, and the
+    remaining columns are filtered as Arrow arrays, without building per-row dictionaries.
+
+    Parameters
+    ----------
+    src_parquet_filepath : str
+        Input `.parquet` manifest.
+
+    dst_parquet_filepath : str
+        Output `.parquet` manifest.
+
+    min_duration, max_duration : float, optional
+        Duration bounds in seconds. Rows with a missing duration are kept, as in `TextNormalizer`.
+
+    compare_index : HashIndex, optional
+        Rows whose `field` is in the index are removed (e.g. sentences of the test/dev splits).
+
+    remove_duplicates : bool, optional (default=False)
+        If True, only the first row of each distinct `field` value is kept.
+
+    field : str, optional (default="text")
+        Column used for the deduplication.
+
+    verbose : bool, optional (default=True)
+        If True, logs the number of removed rows.
+
+    Returns
+    -------
+    int
+        Number of rows written.
+    """
+    pa, pq = _import_pyarrow()
+    table = pq.read_table(src_parquet_filepath)
+    mask = np.ones(table.num_rows, dtype=bool)
+    if min_duration is not None or max_duration is not None:
+        duration = table.column("duration").to_numpy()
+        if min_duration is not None:
+            mask &= ~(duration < min_duration)
+        if max_duration is not None:
+            mask &= ~(duration > max_duration)
+    if compare_index is not None or remove_duplicates:
+        hash_index = compare_index if compare_index is not None else HashIndex()
+        hashes = hash_index.hash_texts(table.column(field).to_pylist())
+        if compare_index is not None:
+            mask &= ~compare_index.contains_hashes(hashes)
+        if remove_duplicates:
+            first = np.zeros(len(hashes), dtype=bool)
+            first[np.unique(hashes, return_index=True)[1]] = True
+            mask &= first
+    filtered = table.filter(pa.array(mask))
+    pq.write_table(filtered, dst_parquet_filepath)
+    if verbose:
+        removed = table.num_rows - filtered.num_rows
+        logging.info(f"- Removed: {removed}/{table.num_rows} ({round(100*removed/max(table.num_rows, 1), 2)}%)")
+    return filtered.num_rows
+
+def probe_durations(audio_filepaths, max_workers: int = 16, cache=None, state=None, verbose: bool = True):
+    """
+    Durations (in seconds) of many audio files, None for the files that cannot be probed.
+
+    With a `build_state.BuildState`, the durations stored by previous builds are
+    reused and only the audio files never seen are probed (with `probe_audio_files`,
+    on `max_workers` threads and with the optional `cache`). The state is keyed on
+    the path, size and mtime of each file, so a replaced file is probed again.
+    """
+    with profiling.stage("probe_durations") as run:
+        audio_filepaths = list(audio_filepaths)
+        run.items = len(audio_filepaths)
+        return _probe_durations(audio_filepaths, max_workers, cache, state, verbose)
+
+def _probe_durations(audio_filepaths, max_workers, cache, state, verbose):
+    """`probe_durations` of a list of paths."""
+    known = {}
+    if state is not None:
+        stats = thread_map(safe_stat, audio_filepaths, max_workers, "Checking build state", verbose)
+        keys = [fingerprint(*stat) if stat is not None else None for stat, _ in stats]
+        known = state.get_many("duration", [key for key in keys if key is not None])
+        to_probe = sorted({path for path, key in zip(audio_filepaths, keys) if key not in known})
+    else:
+        to_probe = audio_filepaths
+    infos, _ = probe_audio_files(to_probe, max_workers=max_workers, verbose=verbose, cache=cache)
+    probed = {path: info["duration"] for path, info in zip(to_probe, infos) if info is not None}
+    if state is not None:
+        path_keys = dict(zip(audio_filepaths, keys))
+        state.put_many("duration", [(path_keys[path], duration) for path, duration in probed.items()
+                                    if path_keys[path] is not None])
+        if verbose:
+            logging.info(f"- Build state: {len(audio_filepaths) - len(to_probe)} known durations, {len(to_probe)} probed")
+        return [known[key] if key in known else probed.get(path) for path, key in zip(audio_filepaths, keys)]
+    return [probed.get(path) for path in audio_filepaths]
+
+def _iter_arrow_tsv_columns(tsv_filepath, sep, usecols, header, quoting, chunksize):
+    """`iter_tsv_batches` backend on `pyarrow.csv` (multithreaded parser)."""
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+    except ImportError:
+        raise ImportError("engine='pyarrow' requires 'pyarrow': pip install pyarrow")
+    if header is None:
+        names = {column: f"f{column}" for column in usecols}
+        read_options = pacsv.ReadOptions(autogenerate_column_names=True, block_size=1 << 24)
+    elif header in ('infer', 0):
+        names = {column: column for column in usecols}
+        read_options = pacsv.ReadOptions(block_size=1 << 24)
+    else:
+        raise ValueError(f"ERROR: header={header!r} is not supported with engine='pyarrow'")
+    parse_options = pacsv.ParseOptions(delimiter=sep, quote_char=False if quoting == csv.QUOTE_NONE else '"')
+    convert_options = pacsv.ConvertOptions(
+        include_columns=list(names.values()), strings_can_be_null=False,
+        column_types={name: pa.float64() if i == 2 else pa.string() for i, name in enumerate(names.values())}
+    )
+    if chunksize is None:
+        table = pacsv.read_csv(tsv_filepath, read_options=read_options, parse_options=parse_options, convert_options=convert_options)
+        yield [table.column(name).to_pylist() for name in names.values()]
+        return
+    pending, pending_rows = [], 0
+    reader = pacsv.open_csv(tsv_filepath, read_options=read_options, parse_options=parse_options, convert_options=convert_options)
+    for record_batch in reader:
+        pending.append(record_batch)
+        pending_rows += record_batch.num_rows
+        while pending_rows >= chunksize:
+            table = pa.Table.from_batches(pending)
+            yield [table.column(name).slice(0, chunksize).to_pylist() for name in names.values()]
+            pending = table.slice(chunksize).to_batches()
+            pending_rows -= chunksize
+    if pending_rows:
+        table = pa.Table.from_batches(pending)
+        yield [table.column(name).to_pylist() for name in names.values()]
+
+def _iter_pandas_tsv_columns(tsv_filepath, sep, usecols, header, quoting, chunksize):
+    """`iter_tsv_batches` backend on `pandas.read_csv` (C engine)."""
+    dtype = {column: float if i == 2 else str for i, column in enumerate(usecols)}
+    na_values = {usecols[2]: [""]} if len(usecols) > 2 else None
+    reader = pd.read_csv(tsv_filepath, sep=sep, header=header, usecols=usecols, dtype=dtype, quoting=quoting,
+                         keep_default_na=False, na_values=na_values, chunksize=chunksize)
+    for df in ([reader] if chunksize is None else reader):
+        columns = [df[column].tolist() for column in usecols[:2]]
+        if len(usecols) > 2:
+            # Missing durations as None, as the pyarrow engine returns them
+            columns.append(df[usecols[2]].astype(object).where(df[usecols[2]].notna(), None).tolist())
+        yield columns
+
+def iter_tsv_batches(tsv_filepath: str, clips_folder: str = "", sep: str = "\t", audio_field="path", text_field="sentence",
+                     duration_field=None, header='infer', quoting: int = csv.QUOTE_MINIMAL, chunksize: int = None,
+                     engine: str = "c"):
+    """
+    Reads the audio paths, texts and (optional) durations of a TSV file as columnar batches.
+
+    Only the needed columns are parsed, with fixed dtypes (str for paths and texts,
+    float for durations) and without missing-value detection, so sentences such as
+    "NA" or "null" are kept as text. With `chunksize`, the file is read in chunks of
+    that many rows and never fully loaded into memory.
+
+    Parameters
+    ----------
+    tsv_filepath, clips_folder, sep, audio_field, text_field, duration_field, header
+        Same as in `tsv2data`.
+
+    quoting : int, optional (default=csv.QUOTE_MINIMAL)
+        Quoting behaviour of `pandas.read_csv`. Common Voice sentences are not quoted
+        and may contain quote characters: use `csv.QUOTE_NONE` to read them verbatim.
+        With engine="pyarrow", only `csv.QUOTE_NONE` (no quote character) and
+        quoting with '"' are distinguished.
+
+    chunksize : int, optional (default=None)
+        Rows per batch. If None, the whole file is a single batch.
+
+    engine : {"c", "pyarrow"}, optional (default="c")
+        Parser: the `pandas.read_csv` C engine, or the multithreaded `pyarrow.csv`
+        reader (several times faster on large files; requires `pyarrow`, and only
+        header='infer', 0 or None).
+
+    Yields
+    ------
+    dict
+        {'audio_filepath': list of str, 'text': list of str, 'duration': list of float or None}
+    """
+    usecols = [audio_field, text_field] + ([duration_field] if duration_field is not None else [])
+    if engine == "pyarrow":
+        batches = _iter_arrow_tsv_columns(tsv_filepath, sep, usecols, header, quoting, chunksize)
+    elif engine == "c":
+        batches = _iter_pandas_tsv_columns(tsv_filepath, sep, usecols, header, quoting, chunksize)
+    else:
+        raise ValueError(f"ERROR: Unknown engine '{engine}'. Use 'c' or 'pyarrow'.")
+    # Same result as os.path.join(clips_folder, path), without a call per row
+    prefix = os.path.join(clips_folder, "") if clips_folder else ""
+    for columns in batches:
+        yield {
+            'audio_filepath': [path if path.startswith(os.sep) else prefix + path for path in columns[0]] if prefix else columns[0],
+            'text': columns[1],
+            'duration': columns[2] if duration_field is not None else None,
+        }
+
+def iter_tsv_data(tsv_filepath: str, clips_folder: str = "", sep: str = "\t", audio_field="path", text_field="sentence",
+                  duration_field=None, calculate_duration: bool = False, header='infer', max_workers: int = 16, cache=None,
+                  state=None, quoting: int = csv.QUOTE_MINIMAL, chunksize: int = 100000, engine: str = "c"):
+    """
+    Streaming version of `tsv2data`: yields the items of a TSV file one by one,
+    reading (and probing) `chunksize` rows at a time. See `tsv2data` for the parameters.
+    """
+    for batch in iter_tsv_batches(tsv_filepath, clips_folder=clips_folder, sep=sep, audio_field=audio_field,
+                                  text_field=text_field, duration_field=duration_field, header=header,
+                                  quoting=quoting, chunksize=chunksize, engine=engine):
+        durations = batch['duration']
+        if durations is None:
+            if calculate_duration:
+                durations = probe_durations(batch['audio_filepath'], max_workers=max_workers, cache=cache, state=state)
+            else:
+                durations = [None] * len(batch['text'])
+        for audio_filepath, text, duration in zip(batch['audio_filepath'], batch['text'], durations):
+            if duration is not None or not calculate_duration or duration_field is not None:
+                yield {
+                    'audio_filepath': audio_filepath,
+                    'text': text,
+                    'duration': duration
+                }
+
+def tsv2data(tsv_filepath: str, clips_folder: str="", sep: str="\t", audio_field="path", text_field="sentence", duration_field=None, calculate_duration: bool=False, header='infer', max_workers: int=16, cache=None, state=None, quoting: int=csv.QUOTE_MINIMAL, chunksize: int=None, engine: str="c"):
     """
     Reads a TSV file containing audio file paths and corresponding text sentences,
     returning a structured list of dictionaries suitable for downstream processing.
 
     Each row in the TSV represents a single audio-text pair. Optionally, if a column
     for precomputed durations is provided, it will be used; otherwise, durations can
-    be calculated directly from the audio files using the `soundfile` library.
+    be calculated from the audio file headers with `audio_probe.probe_audio_files`.
 
     Parameters
     ----------
@@ -115,17 +1051,42 @@ def tsv2data(tsv_filepath: str, clips_folder: str="", sep: str="\t", audio_field
         or integer index.
 
     duration_field : str or int, optional (default=None)
-        Column containing precomputed duration values. If not provided, durations
-        will be calculated if `calcuate_duration` is True.
+        Column containing precomputed duration values. If provided, it is used
+        instead of reading the audio files.
 
     calculate_duration : bool, optional (default=False)
-        Whether to compute audio durations from the audio files using `soundfile`.
-        If False, duration will be set to None unless `duration_field` is provided.
+        Whether to compute audio durations from the audio file headers when no
+        `duration_field` is provided. If False, duration will be set to None
+        unless `duration_field` is provided.
 
     header : int, list of int, 'infer', or None, optional (default='infer')
         Row(s) to use as the column names. Follows the same convention as `pandas.read_csv`.
         Set to None if the TSV has no headers.
 
+    max_workers : int, optional (default=16)
+        Number of audio files probed concurrently when `calculate_duration=True`.
+
+    cache : audio_probe.AudioMetadataCache or str, optional (default=None)
+        Persistent metadata cache (or path to its SQLite database). Only the
+        audio files that are new or changed since they were cached are opened.
+
+    state : build_state.BuildState, optional (default=None)
+        Incremental build state. The durations of the audio files seen in a
+        previous build, with the same size and mtime, are read from the state
+        without opening the files, and only the new or changed files are probed.
+
+    quoting : int, optional (default=csv.QUOTE_MINIMAL)
+        Quoting behaviour of `pandas.read_csv`. Use `csv.QUOTE_NONE` for Common
+        Voice TSVs, whose sentences are not quoted but may contain quotes.
+
+    chunksize : int, optional (default=None)
+        Read the TSV in chunks of this many rows (and probe each chunk in turn)
+        to bound the memory used by pandas on huge files.
+
+    engine : {"c", "pyarrow"}, optional (default="c")
+        TSV parser, see `iter_tsv_batches`. "pyarrow" is several times faster on
+        large files.
+
     Returns
     -------
     list of dict
@@ -136,42 +1097,187 @@ def tsv2data(tsv_filepath: str, clips_folder: str="", sep: str="\t", audio_field
 
     Notes
     -----
-    - Raises an Exception if an audio file cannot be opened when duration calculation
-      is enabled.
+    - Audio files that cannot be probed are logged and left out of the returned
+      data instead of stopping the whole job.
     - The `clips_folder` is prepended to each audio path using `os.path.join`.
+    - Only the needed columns are parsed, as strings, so texts such as "NA" or
+      "null" are not turned into NaN. Use `iter_tsv_data` to stream the items or
+      `iter_tsv_batches` to get them as columns.
     """
-    data=[]
-    df = pd.read_csv(tsv_filepath, sep=sep, header=header)
-    for idx in tqdm(range(len(df))):
-        audio_filepath = os.path.join(clips_folder,df[audio_field][idx])
-        text = df[text_field][idx]
-        if calculate_duration:
-            if duration_field:
-                try:
-                    duration = df[duration_field][idx]
-                except:
-                    raise Exception(f"Audio file could not be opened: {audio_filepath}")
-            else:
-                f = sf.SoundFile(audio_filepath)
-                duration = len(f) / f.samplerate
-        else:
-            duration = None
-        item = {
-            'audio_filepath': audio_filepath,
-            'text': text,
-            'duration': duration
-        }
-        data.append(item)
+    with profiling.stage("tsv2data") as run:
+        data = list(iter_tsv_data(tsv_filepath, clips_folder=clips_folder, sep=sep, audio_field=audio_field,
+                                  text_field=text_field, duration_field=duration_field,
+                                  calculate_duration=calculate_duration, header=header, max_workers=max_workers,
+                                  cache=cache, state=state, quoting=quoting, chunksize=chunksize, engine=engine))
+        run.items = len(data)
+        run.bytes_read = os.path.getsize(tsv_filepath)
     return data
     
-def pairedfiles2data(clips_folder, sentences_folder):
+def _scan_directory(root, relative_dir, extensions):
+    """Files of one directory whose extension is in `extensions`, and its subdirectories (relative to `root`)."""
+    files = []
+    subdirs = []
+    with os.scandir(os.path.join(root, relative_dir)) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                subdirs.append(os.path.join(relative_dir, entry.name))
+                continue
+            stem, extension = os.path.splitext(entry.name)
+            if extension.lower() in extensions:
+                files.append((os.path.join(relative_dir, stem), extension.lower(), entry.path))
+    return files, subdirs
+
+def scan_files(folder, extensions, recursive: bool = True, max_workers: int = 16):
+    """
+    Find the files of a directory tree with the given extensions.
+
+    Directories are listed with `os.scandir` (no extra `stat` per file) and, when
+    `recursive`, the subdirectories are listed concurrently on a thread pool, which
+    hides the latency of network file systems.
+
+    Parameters
+    ----------
+    folder : str
+        Root directory.
+
+    extensions : str or list of str
+        Extensions to keep, e.g. ".wav" or [".txt", ".wav"] (case insensitive).
+
+    recursive : bool, optional (default=True)
+        Whether to descend into subdirectories.
+
+    max_workers : int, optional (default=16)
+        Number of directories listed concurrently.
+
+    Returns
+    -------
+    dict
+        {extension: {key: path}}, the key being the path relative to `folder`
+        without the extension (e.g. "speaker_01/utt_0001").
+    """
+    extensions = [extensions] if isinstance(extensions, str) else extensions
+    extensions = {extension.lower() for extension in extensions}
+    found = {extension: {} for extension in extensions}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {executor.submit(_scan_directory, folder, "", extensions)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                files, subdirs = future.result()
+                for key, extension, path in files:
+                    found[extension].setdefault(key, path)
+                if recursive:
+                    pending.update(executor.submit(_scan_directory, folder, subdir, extensions) for subdir in subdirs)
+    return found
+
+def _read_text_files(text_filepaths):
+    """(text, None) or (None, error message) of every file, read in order."""
+    results = []
+    for text_filepath in text_filepaths:
+        try:
+            with open(text_filepath, "r", encoding="utf-8") as f:
+                results.append((f.read(), None))
+        except Exception as e:
+            results.append((None, f"{type(e).__name__}: {e}"))
+    return results
+
+def iter_paired_files(clips_folder, sentences_folder, max_workers: int = 16, cache=None, recursive: bool = True,
+                      audio_extension: str = ".wav", text_extension: str = ".txt", chunk_size: int = 5000,
+                      report: dict = None, verbose: bool = True):
+    """
+    Streaming, concurrent version of `pairedfiles2data`: yields the manifest items of
+    the audio/transcript pairs of two directory trees.
+
+    Both trees are scanned concurrently with `scan_files` and paired by their path
+    relative to their folder, without extension (`clips/spk1/a.wav` pairs with
+    `sentences/spk1/a.txt`). The pairs are then processed `chunk_size` at a time,
+    reading the transcripts on a thread pool while the audio headers are probed
+    with `audio_probe.probe_audio_files`, so the latency of the file opens overlaps.
+
+    Parameters
+    ----------
+    clips_folder, sentences_folder : str
+        Roots of the audio and transcript trees (they can be the same folder).
+
+    max_workers : int, optional (default=16)
+        Number of concurrent directory listings, transcript reads and audio probes.
+
+    cache : audio_probe.AudioMetadataCache or str, optional (default=None)
+        Persistent audio metadata cache (or path to its SQLite database).
+
+    recursive : bool, optional (default=True)
+        Whether to pair the files of the subdirectories too.
+
+    audio_extension, text_extension : str, optional (default=".wav", ".txt")
+        Extensions of the audio and transcript files.
+
+    chunk_size : int, optional (default=5000)
+        Number of pairs read and probed at a time.
+
+    report : dict, optional (default=None)
+        If given, filled with the files left out instead of raising:
+            - "unpaired_text": transcripts without audio file
+            - "unpaired_audio": audio files without transcript
+            - "errors": (path, error message) of the unreadable transcripts and audio files
+
+    verbose : bool, optional (default=True)
+        If True, logs the number of pairs and of files left out.
+
+    Yields
+    ------
+    dict
+        {'audio_filepath', 'text', 'duration'} of every readable pair, in order of relative path.
+    """
+    audio_extension = audio_extension.lower()
+    text_extension = text_extension.lower()
+    if os.path.abspath(clips_folder) == os.path.abspath(sentences_folder):
+        found = scan_files(clips_folder, [audio_extension, text_extension], recursive=recursive, max_workers=max_workers)
+        audio_files, text_files = found[audio_extension], found[text_extension]
+    else:
+        audio_files = scan_files(clips_folder, audio_extension, recursive=recursive, max_workers=max_workers)[audio_extension]
+        text_files = scan_files(sentences_folder, text_extension, recursive=recursive, max_workers=max_workers)[text_extension]
+    keys = sorted(audio_files.keys() & text_files.keys())
+    unpaired_text = sorted(text_files[key] for key in text_files.keys() - audio_files.keys())
+    unpaired_audio = sorted(audio_files[key] for key in audio_files.keys() - text_files.keys())
+    errors = []
+    if report is not None:
+        report.update({"unpaired_text": unpaired_text, "unpaired_audio": unpaired_audio, "errors": errors})
+    if verbose:
+        logging.info(f"- Pairs found: {len(keys)}")
+        if unpaired_text or unpaired_audio:
+            logging.warning(f"- Unpaired files: {len(unpaired_text)} transcripts without audio, {len(unpaired_audio)} audio files without transcript")
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for chunk in iter_chunks(keys, chunk_size):
+            # A few reads per task: one task per file costs more than the read itself on a local disk
+            text_filepaths = [text_files[key] for key in chunk]
+            step = -(-len(chunk) // max_workers)
+            texts = chain.from_iterable(executor.map(_read_text_files, (text_filepaths[i:i + step] for i in range(0, len(chunk), step))))
+            audio_filepaths = [audio_files[key] for key in chunk]
+            infos, probe_errors = probe_audio_files(audio_filepaths, max_workers=max_workers, cache=cache, verbose=False)
+            errors.extend(probe_errors)
+            for key, audio_filepath, info, (text, error) in zip(chunk, audio_filepaths, infos, texts):
+                if error is not None:
+                    errors.append((text_files[key], error))
+                if info is None or text is None:
+                    continue
+                yield {
+                    'audio_filepath': audio_filepath,
+                    'text': text,
+                    'duration': info["duration"],
+                }
+    if verbose and errors:
+        logging.warning(f"- Unreadable files: {len(errors)}")
+        for path, error in errors[:10]:
+            logging.warning(f"  - {path} ({error})")
+
+def pairedfiles2data(clips_folder, sentences_folder, max_workers: int=16, cache=None, recursive: bool=True, report: dict=None):
     """
     Build a structured dataset by pairing text files with their corresponding audio files.
 
-    This function scans `sentences_folder` for `.txt` files and expects each one to have
-    a `.wav` file with the same base name in `clips_folder`. For every valid pair, it
-    loads the text, opens the audio file to retrieve its duration, and returns a dataset
-    where each entry contains:
+    This function scans `sentences_folder` for `.txt` files and `clips_folder` for
+    `.wav` files with the same base name. For every valid pair, it loads the text,
+    reads the audio header to retrieve its duration, and returns a dataset where
+    each entry contains:
 
         - audio_filepath : full path to the `.wav` file
         - text           : sentence string loaded from the `.txt` file
@@ -183,6 +1289,14 @@ def pairedfiles2data(clips_folder, sentences_folder):
         Path to the directory containing `.wav` audio files.
     sentences_folder : str
         Path to the directory containing `.txt` sentence files.
+    max_workers : int, optional (default=16)
+        Number of directories listed, transcripts read and audio files probed concurrently.
+    cache : audio_probe.AudioMetadataCache or str, optional (default=None)
+        Persistent metadata cache (or path to its SQLite database).
+    recursive : bool, optional (default=True)
+        Whether to pair the files of the subdirectories too, by their relative path.
+    report : dict, optional (default=None)
+        If given, filled with the unpaired and unreadable files (see `iter_paired_files`).
 
     Returns
     -------
@@ -194,60 +1308,251 @@ def pairedfiles2data(clips_folder, sentences_folder):
                 'duration': float
             }
 
-    Raises
-    ------
-    Exception
-        If a corresponding audio file cannot be opened or does not exist.
-
     Notes
     -----
     - `.txt` filenames must match the `.wav` filenames (same stem).
-    - Duration is obtained using `sf.SoundFile`, which must be available and functional.
-    """
-    data=[]
-    for file in os.listdir(sentences_folder):
-        if file.endswith(".txt"):
-            audio_filepath = os.path.join(clips_folder,file.replace(".txt",".wav"))
-            try:
-                duration = sf.SounFile(audio_filepath)
-            except:
-                raise Exception(f"Audio file could not be opened: {audio_filepath}")
-            f = open(os.path.join(sentences_folder,file),"r",encoding="utf-8")
-            sentence = f.read()
-            item = {
-                'audio_filepath': audio_filepath,
-                'text': sentence,
-                'duration': duration,
-            }
-            data.append(item)
-    return data
+    - Unpaired files, and pairs whose audio or transcript cannot be read, are
+      logged and left out of the returned data.
+    - Use `iter_paired_files` to stream the items instead of building a list.
+    """
+    return list(iter_paired_files(clips_folder, sentences_folder, max_workers=max_workers, cache=cache,
+                                  recursive=recursive, report=report))
+
+def _blake2b_64(text):
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little")
+
+def _hash_function(algorithm: str = "builtin"):
+    """Return the str -> int hash function for `algorithm` ('builtin', 'blake2b' or 'xxhash')."""
+    if algorithm == "builtin":
+        return hash
+    if algorithm == "blake2b":
+        return _blake2b_64
+    if algorithm == "xxhash":
+        try:
+            import xxhash
+        except ImportError:
+            raise ImportError("The 'xxhash' hashing backend requires 'xxhash': pip install xxhash")
+        return xxhash.xxh3_64_intdigest
+    raise ValueError(f"ERROR: hashing algorithm '{algorithm}' NOT Supported. Use 'builtin', 'blake2b' or 'xxhash'")
+
+def stable_hash(text, algorithm: str = "blake2b"):
+    """
+    Compute a 64-bit hash of a string that is identical across processes and runs.
+
+    Parameters
+    ----------
+    text : str
+        String to hash (UTF-8 encoded before hashing).
+
+    algorithm : str, optional (default="blake2b")
+        - "blake2b": 64-bit BLAKE2b digest (standard library).
+        - "xxhash": 64-bit XXH3 digest (faster, requires the `xxhash` package).
+
+    Returns
+    -------
+    int
+        Unsigned 64-bit hash value.
+    """
+    if algorithm == "builtin":
+        raise ValueError("ERROR: the built-in hash() is randomized per process, use 'blake2b' or 'xxhash'")
+    return _hash_function(algorithm)(text)
 
-def hash_sentences(data):
+def hash_sentences(data, algorithm: str = "builtin"):
     """
     Compute hash values for the `"text"` field of each item in a dataset.
 
     Parameters
     ----------
-    data : list of dict
-        A list of items where each item must contain a `"text"` key.
+    data : iterable of dict
+        Items where each item must contain a `"text"` key.
+
+    algorithm : str, optional (default="builtin")
+        Hashing backend: "builtin" (`hash()`), or the stable 64-bit "blake2b"
+        or "xxhash" backends of `stable_hash`.
 
     Returns
     -------
     list of int
-        A list of hash values corresponding to `hash(item["text"])` for each item
-        in `data`.
+        A list of hash values of `item["text"]` for each item in `data`.
 
     Notes
     -----
-    - The built-in `hash()` function is used, so hash values may differ across
-      Python sessions unless hash randomization is disabled.
+    - With the default "builtin" backend, hash values may differ across
+      Python sessions unless hash randomization is disabled. Use a stable
+      backend to save hashes or share them between processes.
     - This function is typically used to accelerate duplicate detection or
       cross-dataset comparisons.
     """
-    hashed_sentences = [hash(item["text"]) for item in tqdm(data)]
+    hash_fn = _hash_function(algorithm)
+    with profiling.stage("hash_sentences") as run:
+        hashed_sentences = [hash_fn(item["text"]) for item in tqdm(data)]
+        run.items = len(hashed_sentences)
     return hashed_sentences
 
-def reduce_data(data, compare_data=None, hashed_data=None, hashed_compare=None):
+class HashIndex:
+    """
+    Compact, persistent set of stable text hashes used as a dedup/exclusion index.
+
+    Hashes are kept in a sorted `numpy.uint64` array (8 bytes per sentence) and
+    looked up with binary search, so an index built once from the test/dev
+    splits can be saved, memory-mapped and reused to filter any number of
+    training manifests with `reduce_data(data, compare_data=index)`.
+
+    Parameters
+    ----------
+    hashes : array-like of int, optional
+        Unsigned 64-bit hashes computed with `algorithm`.
+
+    algorithm : str, optional (default="blake2b")
+        Stable hashing backend of `stable_hash` ("blake2b" or "xxhash").
+
+    Examples
+    --------
+    >>> index = HashIndex.from_data(iter_manifest("test.json"))
+    >>> index.add(iter_manifest("dev.json"))
+    >>> index.save("test_dev.idx.npy")
+    >>> index = HashIndex.load("test_dev.idx.npy")
+    >>> train = reduce_data(iter_manifest("validated.json"), compare_data=index)
+    """
+    def __init__(self, hashes=None, algorithm: str = "blake2b"):
+        if algorithm == "builtin":
+            raise ValueError("ERROR: HashIndex needs a stable hashing algorithm ('blake2b' or 'xxhash')")
+        self.algorithm = algorithm
+        self._hash_fn = _hash_function(algorithm)
+        self.hashes = np.unique(np.asarray(hashes if hashes is not None else [], dtype=np.uint64))
+
+    @classmethod
+    def from_data(cls, data, algorithm: str = "blake2b", field: str = "text"):
+        """Build an index from the `field` of every item of `data` (list or any iterable)."""
+        index = cls(algorithm=algorithm)
+        index.add(data, field=field)
+        return index
+
+    def add(self, data, field: str = "text"):
+        """Add the `field` hashes of every item of `data` to the index."""
+        new = np.fromiter((self._hash_fn(item[field]) for item in tqdm(data, desc="Indexing hashes")), dtype=np.uint64)
+        self.hashes = np.union1d(self.hashes, new)
+        return self
+
+    def hash_texts(self, texts):
+        """Hash a list of strings with the index algorithm into a `numpy.uint64` array."""
+        return np.fromiter((self._hash_fn(text) for text in texts), dtype=np.uint64, count=len(texts))
+
+    def contains_hashes(self, hashes):
+        """Vectorized membership test: boolean array telling which `hashes` are in the index."""
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        if len(self.hashes) == 0:
+            return np.zeros(len(hashes), dtype=bool)
+        positions = np.searchsorted(self.hashes, hashes)
+        return self.hashes[np.minimum(positions, len(self.hashes) - 1)] == hashes
+
+    def __contains__(self, text):
+        return bool(self.contains_hashes([self._hash_fn(text)])[0])
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def save(self, index_filepath):
+        """
+        Save the index as a `.npy` array plus a `.json` sidecar with its metadata.
+        """
+        if not index_filepath.endswith(".npy"):
+            index_filepath += ".npy"
+        np.save(index_filepath, self.hashes, allow_pickle=False)
+        with open(index_filepath + ".json", "w", encoding="utf-8") as f:
+            json.dump({"algorithm": self.algorithm, "size": len(self.hashes)}, f)
+
+    @classmethod
+    def load(cls, index_filepath, mmap: bool = True):
+        """
+        Load an index saved with `save`. With `mmap=True` the array is memory-mapped
+        instead of read, so large indexes cost no RAM until they are queried.
+        """
+        if not index_filepath.endswith(".npy"):
+            index_filepath += ".npy"
+        with open(index_filepath + ".json", "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        index = cls(algorithm=meta["algorithm"])
+        index.hashes = np.load(index_filepath, mmap_mode="r" if mmap else None, allow_pickle=False)
+        return index
+
+def iter_reduce_data(data, compare_data=None, hashed_data=None, hashed_compare=None, algorithm: str = "builtin"):
+    """
+    Streaming version of `reduce_data`: yield the items of `data` that are kept.
+
+    `data` (and `hashed_data`, if given) are consumed one item at a time, so
+    generators such as `iter_manifest` or `TextNormalizer.iter_clean` can be
+    reduced in bounded memory. Only the set of hashes is kept in memory.
+
+    Parameters
+    ----------
+    data : iterable of dict
+        The primary dataset to reduce. Each item must contain a `"text"` key.
+    compare_data : iterable of dict or HashIndex, optional
+        If provided, items from `data` whose `"text"` hashes appear in
+        `compare_data` are dropped. If None, duplicates within `data` are dropped.
+        A `HashIndex` is queried in vectorized batches, with its own algorithm.
+    hashed_data : iterable of int, optional
+        Precomputed hash values for each item in `data`, aligned by index.
+    hashed_compare : iterable of int, optional
+        Precomputed hash values for each item in `compare_data`.
+    algorithm : str, optional (default="builtin")
+        Hashing backend used when hashes are not provided (see `hash_sentences`).
+
+    Yields
+    ------
+    dict
+        The items of `data` that are kept, in input order.
+
+    Notes
+    -----
+    The number and percentage of removed items is logged once `data` is exhausted.
+    """
+    logging.info("::::: Reducing dataset :::::")
+    total = len(data) if hasattr(data, "__len__") else None
+    datalen = 0
+    keptlen = 0
+    if isinstance(compare_data, HashIndex):
+        # Filter against a persistent index in vectorized batches
+        for chunk in iter_chunks(tqdm(data, total=total, desc="Filtering hash index"), 10000):
+            hashes = compare_data.hash_texts([item["text"] for item in chunk])
+            found = compare_data.contains_hashes(hashes)
+            datalen += len(chunk)
+            for item, is_found in zip(chunk, found):
+                if not is_found:
+                    keptlen += 1
+                    yield item
+        removed_count = datalen - keptlen
+        logging.info(f"- Removed: {removed_count}/{datalen} ({round(100*removed_count/max(datalen, 1), 2)}%)")
+        return
+    hash_fn = _hash_function(algorithm)
+    if hashed_data is None:
+        pairs = ((hash_fn(item["text"]), item) for item in data)
+    else:
+        pairs = zip(hashed_data, data)
+    if compare_data is None:
+        # Remove duplicates within the same dataset
+        seen_hashes = set()
+        desc = "Removing duplicates"
+    else:
+        # Remove items in data that exist in compare_data
+        if hashed_compare is None and isinstance(compare_data, Manifest):
+            hashed_compare = (hash_fn(text) for text in compare_data.column("text"))
+        elif hashed_compare is None:
+            hashed_compare = (hash_fn(item["text"]) for item in tqdm(compare_data, desc="Hashing compare_data"))
+        seen_hashes = set(hashed_compare)
+        desc = "Filtering compare_data"
+    for h, item in tqdm(pairs, total=total, desc=desc):
+        datalen += 1
+        if h not in seen_hashes:
+            keptlen += 1
+            if compare_data is None:
+                seen_hashes.add(h)
+            yield item
+    removed_count = datalen - keptlen
+    logging.info(f"- Removed: {removed_count}/{datalen} ({round(100*removed_count/max(datalen, 1), 2)}%)")
+
+def reduce_data(data, compare_data=None, hashed_data=None, hashed_compare=None, algorithm: str = "builtin"):
     """
     Reduce a dataset by removing duplicates or by filtering out items
     that appear in another dataset. Hashes of the `"text"` field are used
@@ -255,18 +1560,23 @@ def reduce_data(data, compare_data=None, hashed_data=None, hashed_compare=None):
 
     Parameters
     ----------
-    data : list of dict
+    data : iterable of dict
         The primary dataset to reduce. Each item must contain a `"text"` key.
-    compare_data : list of dict, optional
+        Can be a list or any iterable (e.g. `iter_manifest`).
+    compare_data : iterable of dict or HashIndex, optional
         If provided, items from `data` whose `"text"` hashes appear in
         `compare_data` will be removed. If None, the function removes
-        duplicates within `data` itself.
+        duplicates within `data` itself. A persistent `HashIndex` can be
+        given instead of the compare items themselves.
     hashed_data : list of int, optional
         Precomputed hash values for each item in `data`. Must be aligned by index.
-        If not provided, hashes are computed internally as `hash(item["text"])`.
+        If not provided, hashes are computed internally with `algorithm`.
     hashed_compare : list of int, optional
         Precomputed hash values for each item in `compare_data`. Used only when
         `compare_data` is provided. If None, hashes are computed automatically.
+    algorithm : str, optional (default="builtin")
+        Hashing backend used when hashes are not provided: "builtin" (`hash()`),
+        "blake2b" or "xxhash" (stable across processes, see `stable_hash`).
 
     Returns
     -------
@@ -281,40 +1591,591 @@ def reduce_data(data, compare_data=None, hashed_data=None, hashed_compare=None):
     - When `compare_data` is provided, the function removes all `data` items
       whose `"text"` hash is found in `compare_data`.
     - The function logs the number and percentage of removed items.
+    - See `iter_reduce_data` to stream the reduced dataset instead of building a list.
+    - A `Manifest` is reduced from its text column only, and a `Manifest` view
+      is returned instead of a list of dicts.
     """
-    logging.info("::::: Reducing dataset :::::")
-    if hashed_data is None:
-        hashed_data = [hash(item["text"]) for item in tqdm(data, desc="Hashing data")]
-    datalen = len(data)
+    with profiling.stage("reduce_data") as run:
+        run.items = len(data) if hasattr(data, "__len__") else 0
+        reduced_data = _reduce_data(data, compare_data, hashed_data, hashed_compare, algorithm)
+        if not run.items:
+            run.items = len(reduced_data)
+    return reduced_data
+
+def _reduce_data(data, compare_data, hashed_data, hashed_compare, algorithm):
+    """`reduce_data` without the profiling stage."""
+    if isinstance(data, Manifest):
+        texts = data.column("text")
+        if isinstance(compare_data, HashIndex):
+            logging.info("::::: Reducing dataset :::::")
+            found = compare_data.contains_hashes(compare_data.hash_texts(texts))
+            logging.info(f"- Removed: {int(found.sum())}/{len(data)} ({round(100*found.sum()/max(len(data), 1), 2)}%)")
+            return data[~found]
+        if hashed_data is None:
+            hash_fn = _hash_function(algorithm)
+            hashed_data = [hash_fn(text) for text in texts]
+        # The row positions stand for the items: only the hashes are compared
+        kept = list(iter_reduce_data(range(len(data)), compare_data=compare_data, hashed_data=hashed_data,
+                                     hashed_compare=hashed_compare, algorithm=algorithm))
+        return data.take(kept)
+    return list(iter_reduce_data(data, compare_data=compare_data, hashed_data=hashed_data, hashed_compare=hashed_compare, algorithm=algorithm))
+
+def minhash_signatures(texts, num_perm: int = 128, ngram: int = 5, seed: int = 1, batch_size: int = 512):
+    """
+    Compute MinHash signatures of a list of strings.
+
+    Each text is represented by its set of `ngram`-byte shingles of its UTF-8
+    encoding (the whole text if it is shorter), hashed with CRC32 so the signatures are stable
+    across processes. `num_perm` multiply-shift hash functions are applied to
+    batches of texts at once with numpy.
+
+    Parameters
+    ----------
+    texts : list of str
+        Texts to sign. Normalize them first (e.g. with `TextNormalizer`) so that
+        casing, punctuation or diacritics do not count as differences.
+
+    num_perm : int, optional (default=128)
+        Number of hash permutations (signature length).
+
+    ngram : int, optional (default=5)
+        Shingle size in bytes (characters, for ASCII text).
+
+    seed : int, optional (default=1)
+        Seed of the permutation parameters. Signatures are only comparable
+        when computed with the same `num_perm`, `ngram` and `seed`.
+
+    batch_size : int, optional (default=512)
+        Number of texts processed per vectorized batch.
+
+    Returns
+    -------
+    numpy.ndarray
+        `uint32` array of shape (len(texts), num_perm).
+
+    Notes
+    -----
+    The fraction of equal positions between two signatures is an unbiased
+    estimate of the Jaccard similarity of their shingle sets.
+    """
+    rng = np.random.default_rng(seed)
+    # Multiply-shift hashing: (a*h + b) mod 2**64 (uint64 wrap-around), keeping the high 32 bits
+    a = rng.integers(0, 1 << 64, size=num_perm, dtype=np.uint64, endpoint=False) | np.uint64(1)
+    b = rng.integers(0, 1 << 64, size=num_perm, dtype=np.uint64, endpoint=False)
+    signatures = np.empty((len(texts), num_perm), dtype=np.uint32)
+    for start in tqdm(range(0, len(texts), batch_size), desc="MinHash signatures"):
+        shingle_hashes = []
+        offsets = []
+        for text in texts[start:start + batch_size]:
+            offsets.append(len(shingle_hashes))
+            encoded = text.encode("utf-8")
+            shingle_hashes.extend(map(zlib.crc32, {encoded[i:i + ngram] for i in range(max(len(encoded) - ngram + 1, 1))}))
+        hv = np.asarray(shingle_hashes, dtype=np.uint64)
+        permuted = (a[:, None] * hv[None, :] + b[:, None]) >> np.uint64(32)
+        signatures[start:start + batch_size] = np.minimum.reduceat(permuted, offsets, axis=1).T
+    return signatures
+
+def _signature_texts(data, normalizer=None, field: str = "text"):
+    if normalizer is None:
+        return [item[field] for item in data]
+    return [normalizer.normalize_text(item[field]) for item in data]
+
+def _find_root(parent, i):
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+def near_duplicate_clusters(data, threshold: float = 0.6, num_perm: int = 128, bands: int = 32, ngram: int = 5,
+                            normalizer=None, signatures=None):
+    """
+    Find clusters of near-duplicate sentences in a dataset with MinHash + LSH.
+
+    Signatures are split into `bands` bands; items sharing a band are
+    candidates, and a candidate is linked to the first item of its bucket when
+    their estimated Jaccard similarity is at least `threshold`. Linked items are
+    merged into clusters with union-find. Cost grows linearly with the number of
+    items instead of comparing every pair.
+
+    Parameters
+    ----------
+    data : list of dict
+        Items with a `"text"` key.
+
+    threshold : float, optional (default=0.6)
+        Minimum estimated Jaccard similarity of the shingle sets. With 5-byte
+        shingles, replacing one word of a short sentence typically leaves a
+        similarity of 0.6-0.9.
+
+    num_perm : int, optional (default=128)
+        Signature length. Memory is `4 * num_perm` bytes per item.
+
+    bands : int, optional (default=32)
+        Number of LSH bands (`num_perm` must be divisible by it). More bands
+        find more candidates (higher recall) at a higher verification cost.
+
+    ngram : int, optional (default=5)
+        Shingle size (see `minhash_signatures`).
+
+    normalizer : TextNormalizer, optional
+        If given, signatures are computed on `normalizer.normalize_text(text)`;
+        the items themselves are not modified.
+
+    signatures : numpy.ndarray, optional
+        Precomputed `minhash_signatures` of `data`.
+
+    Returns
+    -------
+    list of list of int
+        Clusters of indices into `data` (only clusters with 2+ items), each
+        sorted, ordered by their first index.
+    """
+    if num_perm % bands:
+        raise ValueError(f"ERROR: num_perm ({num_perm}) must be divisible by bands ({bands})")
+    if signatures is None:
+        signatures = minhash_signatures(_signature_texts(data, normalizer), num_perm=num_perm, ngram=ngram)
+    rows = num_perm // bands
+    parent = list(range(len(signatures)))
+    for band in range(bands):
+        keys = np.ascontiguousarray(signatures[:, band * rows:(band + 1) * rows]).view(np.dtype((np.void, 4 * rows))).ravel()
+        _, first_index, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        representatives = first_index[inverse.ravel()]
+        candidates = np.nonzero(representatives != np.arange(len(signatures)))[0]
+        if len(candidates) == 0:
+            continue
+        similarity = (signatures[candidates] == signatures[representatives[candidates]]).mean(axis=1)
+        for i, j in zip(candidates[similarity >= threshold], representatives[candidates[similarity >= threshold]]):
+            root_i, root_j = _find_root(parent, int(i)), _find_root(parent, int(j))
+            if root_i != root_j:
+                parent[max(root_i, root_j)] = min(root_i, root_j)
+    clusters = {}
+    for i in range(len(parent)):
+        clusters.setdefault(_find_root(parent, i), []).append(i)
+    return [cluster for cluster in clusters.values() if len(cluster) > 1]
+
+def reduce_near_duplicates(data, compare_data=None, threshold: float = 0.6, num_perm: int = 128, bands: int = 32,
+                           ngram: int = 5, normalizer=None, return_clusters: bool = False):
+    """
+    Reduce a dataset by removing near-duplicate sentences (MinHash + LSH).
+
+    The near-duplicate counterpart of `reduce_data`: sentences that differ by
+    punctuation, casing (when a `normalizer` is given) or a few words are
+    treated as duplicates.
+
+    Parameters
+    ----------
+    data : list of dict
+        The primary dataset to reduce. Each item must contain a `"text"` key.
+
+    compare_data : list of dict, optional
+        If provided, items from `data` that are near-duplicates of any item of
+        `compare_data` (e.g. test/dev splits) are removed. If None, only the
+        first item of each near-duplicate cluster within `data` is kept.
+
+    threshold, num_perm, bands, ngram, normalizer :
+        See `near_duplicate_clusters`.
+
+    return_clusters : bool, optional (default=False)
+        If True, also return the clusters that caused the removals.
+
+    Returns
+    -------
+    list of dict, or tuple (list of dict, list)
+        The reduced dataset, and if `return_clusters=True`:
+            - within-corpus mode: clusters of indices into `data`
+              (see `near_duplicate_clusters`).
+            - `compare_data` mode: list of (data index, [compare_data indices])
+              tuples, one per removed item.
+
+    Notes
+    -----
+    The function logs the number and percentage of removed items.
+    """
+    logging.info("::::: Reducing dataset (near-duplicates) :::::")
     if compare_data is None:
-        # Remove duplicates within the same dataset
-        seen_hashes = set()
-        reduced_data = []
-        for h, item in tqdm(zip(hashed_data, data), total=datalen, desc="Removing duplicates"):
-            if h not in seen_hashes:
-                reduced_data.append(item)
-                seen_hashes.add(h)
+        clusters = near_duplicate_clusters(data, threshold=threshold, num_perm=num_perm, bands=bands, ngram=ngram,
+                                           normalizer=normalizer)
+        removed = {i for cluster in clusters for i in cluster[1:]}
     else:
-        # Remove items in data that exist in compare_data
-        if hashed_compare is None:
-            hashed_compare = [hash(item["text"]) for item in tqdm(compare_data, desc="Hashing compare_data")]
-        hashed_compare_set = set(hashed_compare)
-        reduced_data = [item for h, item in tqdm(zip(hashed_data, data), total=datalen, desc="Filtering compare_data") if h not in hashed_compare_set]
-    removed_count = datalen - len(reduced_data)
-    logging.info(f"- Removed: {removed_count}/{datalen} ({round(100*removed_count/datalen, 2)}%)")
+        if num_perm % bands:
+            raise ValueError(f"ERROR: num_perm ({num_perm}) must be divisible by bands ({bands})")
+        rows = num_perm // bands
+        compare_signatures = minhash_signatures(_signature_texts(compare_data, normalizer), num_perm=num_perm, ngram=ngram)
+        tables = [{} for _ in range(bands)]
+        for j, signature in enumerate(compare_signatures):
+            for band in range(bands):
+                tables[band].setdefault(signature[band * rows:(band + 1) * rows].tobytes(), []).append(j)
+        signatures = minhash_signatures(_signature_texts(data, normalizer), num_perm=num_perm, ngram=ngram)
+        clusters = []
+        for i, signature in enumerate(signatures):
+            candidates = set()
+            for band in range(bands):
+                candidates.update(tables[band].get(signature[band * rows:(band + 1) * rows].tobytes(), ()))
+            if candidates:
+                candidates = sorted(candidates)
+                similarity = (compare_signatures[candidates] == signature).mean(axis=1)
+                matches = [j for j, sim in zip(candidates, similarity) if sim >= threshold]
+                if matches:
+                    clusters.append((i, matches))
+        removed = {i for i, _ in clusters}
+    reduced_data = [item for i, item in enumerate(data) if i not in removed]
+    datalen = len(data)
+    logging.info(f"- Removed: {len(removed)}/{datalen} ({round(100*len(removed)/max(datalen, 1), 2)}%)")
+    if return_clusters:
+        return reduced_data, clusters
     return reduced_data
 
-def manifest_time_stats(manifest, return_stats: bool = False, verbose: bool = True):
+def _union_audio_duplicates(fingerprints, threshold, bands, band_bits, seed):
+    """Union-find parents linking the fingerprints with the same PCM hash or similar spectral fingerprints."""
+    parent = list(range(len(fingerprints)))
+    def link(i, j):
+        root_i, root_j = _find_root(parent, int(i)), _find_root(parent, int(j))
+        if root_i != root_j:
+            parent[max(root_i, root_j)] = min(root_i, root_j)
+    first_by_hash = {}
+    for i, fingerprint in enumerate(fingerprints):
+        if fingerprint is not None and first_by_hash.setdefault(fingerprint["pcm_hash"], i) != i:
+            link(i, first_by_hash[fingerprint["pcm_hash"]])
+    indices = np.asarray([i for i, fingerprint in enumerate(fingerprints) if fingerprint is not None and fingerprint["spectral"] is not None])
+    if len(indices) < 2:
+        return parent
+    packed = np.frombuffer(b"".join(fingerprints[i]["spectral"] for i in indices), dtype=np.uint8).reshape(len(indices), -1)
+    rng = np.random.default_rng(seed)
+    for _ in range(bands):
+        # Bit-sampling LSH: the key of a band is `band_bits` random bits of the fingerprint
+        keys = np.zeros(len(indices), dtype=np.uint64)
+        for position in rng.choice(SPECTRAL_BITS, size=band_bits, replace=False):
+            keys = (keys << np.uint64(1)) | ((packed[:, position >> 3] >> (7 - (position & 7))) & 1).astype(np.uint64)
+        _, first_index, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        representatives = first_index[inverse.ravel()]
+        candidates = np.nonzero(representatives != np.arange(len(indices)))[0]
+        if len(candidates) == 0:
+            continue
+        similarity = 1.0 - np.unpackbits(packed[candidates] ^ packed[representatives[candidates]], axis=1).mean(axis=1)
+        matched = candidates[similarity >= threshold]
+        for i, j in zip(indices[matched], indices[representatives[matched]]):
+            link(i, j)
+    return parent
+
+def audio_duplicate_clusters(fingerprints, threshold: float = 0.8, bands: int = 64, band_bits: int = 20, seed: int = 1):
+    """
+    Find clusters of duplicate audio clips from their `audio_fingerprint` fingerprints.
+
+    Clips with the same PCM hash are exact duplicates. Clips whose spectral
+    fingerprints share at least a fraction `threshold` of their bits are
+    near-exact duplicates (re-encoded, resampled, gain-changed or re-trimmed
+    copies). Candidates are found with bit-sampling LSH: for each of `bands`
+    bands, the clips sharing `band_bits` randomly chosen bits are compared with
+    the first clip of their bucket, and matches are merged with union-find, so
+    the cost grows linearly with the number of clips.
+
+    Parameters
+    ----------
+    fingerprints : list of dict or None
+        Output of `audio_fingerprint.fingerprint_audio_files` (None items, i.e.
+        unreadable files, are never duplicates).
+
+    threshold : float, optional (default=0.8)
+        Minimum fraction of equal spectral fingerprint bits. Unrelated clips
+        share about half of their bits; a 64 kbps MP3 copy of a clip typically
+        shares 0.85-0.95, a resampled or gain-changed copy 0.9-1.0.
+
+    bands : int, optional (default=64)
+        Number of LSH bands. More bands find more candidates (higher recall) at
+        a higher cost.
+
+    band_bits : int, optional (default=20)
+        Bits per band. Fewer bits find more candidates but make the buckets of
+        large corpora crowded.
+
+    seed : int, optional (default=1)
+        Seed of the bits sampled for each band.
+
+    Returns
+    -------
+    list of list of int
+        Clusters of indices into `fingerprints` (only clusters with 2+ items),
+        each sorted, ordered by their first index.
+    """
+    parent = _union_audio_duplicates(fingerprints, threshold, bands, band_bits, seed)
+    clusters = {}
+    for i in range(len(parent)):
+        clusters.setdefault(_find_root(parent, i), []).append(i)
+    return [cluster for cluster in clusters.values() if len(cluster) > 1]
+
+def _audio_filepaths(data, field):
+    return data.column(field) if isinstance(data, Manifest) else [item[field] for item in data]
+
+def audio_hashes(data, compare_data=None, spectral: bool = True, threshold: float = 0.8, bands: int = 64, band_bits: int = 20,
+                 max_workers: int = None, cache=None, field: str = "audio_filepath", verbose: bool = True):
+    """
+    Compute audio content hashes of the items of a dataset, to be given to `reduce_data`.
+
+    The audio files are fingerprinted on a process pool (see
+    `audio_fingerprint.fingerprint_audio_files`) and grouped with
+    `audio_duplicate_clusters`. Every item gets the PCM hash of the first clip
+    of its cluster, so exact and near-exact audio duplicates share their hash
+    whatever their file name or format:
+
+        hashed_data, hashed_compare = audio_hashes(data, compare_data)
+        data = reduce_data(data, compare_data, hashed_data=hashed_data, hashed_compare=hashed_compare)
+
+    Parameters
+    ----------
+    data : list of dict or Manifest
+        Items with an audio path in `field`.
+
+    compare_data : list of dict or Manifest, optional
+        If provided, hashes are also computed for these items, clustered
+        together with `data`, so the `data` items whose audio is a duplicate
+        of a `compare_data` item get the same hash.
+
+    spectral : bool, optional (default=True)
+        If False, only exact (PCM) duplicates are detected and the FFTs are skipped.
+
+    threshold, bands, band_bits :
+        See `audio_duplicate_clusters`.
+
+    max_workers : int, optional (default=None)
+        Number of fingerprinting processes (None: one per CPU).
+
+    cache : audio_fingerprint.AudioFingerprintCache or str, optional (default=None)
+        Persistent fingerprint cache (or path to its SQLite database).
+
+    field : str, optional (default="audio_filepath")
+        Item field with the audio path.
+
+    verbose : bool, optional (default=True)
+        If True, shows progress bars and logs the unreadable files and duplicates found.
+
+    Returns
+    -------
+    tuple (list of int, list of int or None)
+        Hashes of the `data` items and of the `compare_data` items (None if
+        `compare_data` is None), aligned by index.
+
+    Notes
+    -----
+    Unreadable audio files get a hash of their path, so they are only
+    duplicates of the items with the same path.
+    """
+    audio_filepaths = _audio_filepaths(data, field)
+    if compare_data is not None:
+        audio_filepaths += _audio_filepaths(compare_data, field)
+    with profiling.stage("audio_fingerprints") as run:
+        fingerprints, _ = fingerprint_audio_files(audio_filepaths, spectral=spectral, max_workers=max_workers, cache=cache, verbose=verbose)
+        run.items = len(fingerprints)
+    parent = _union_audio_duplicates(fingerprints, threshold, bands, band_bits, seed=1)
+    hashes = []
+    for i, (audio_filepath, fingerprint) in enumerate(zip(audio_filepaths, fingerprints)):
+        if fingerprint is None:
+            hashes.append(stable_hash(f"unreadable audio: {audio_filepath}"))
+        else:
+            hashes.append(fingerprints[_find_root(parent, i)]["pcm_hash"])
+    if verbose:
+        duplicates = sum(1 for i in range(len(parent)) if fingerprints[i] is not None and _find_root(parent, i) != i)
+        logging.info(f"- Audio duplicates: {duplicates}/{len(audio_filepaths)} clips duplicate an earlier one")
+    if compare_data is None:
+        return hashes, None
+    return hashes[:len(data)], hashes[len(data):]
+
+def reduce_audio_duplicates(data, compare_data=None, spectral: bool = True, threshold: float = 0.8, bands: int = 64,
+                            band_bits: int = 20, max_workers: int = None, cache=None, field: str = "audio_filepath",
+                            verbose: bool = True):
+    """
+    Reduce a dataset by removing exact and near-exact audio duplicates.
+
+    The audio counterpart of `reduce_data`: items are compared by the content
+    of their audio files (`audio_hashes`) instead of their text, so the same
+    clip stored under another name or in another format is found when merging
+    corpora. The parameters are those of `audio_hashes`.
+
+    Returns
+    -------
+    list of dict or Manifest
+        The reduced dataset (see `reduce_data`).
+    """
+    hashed_data, hashed_compare = audio_hashes(data, compare_data=compare_data, spectral=spectral, threshold=threshold,
+                                               bands=bands, band_bits=band_bits, max_workers=max_workers, cache=cache,
+                                               field=field, verbose=verbose)
+    return reduce_data(data, compare_data=compare_data, hashed_data=hashed_data, hashed_compare=hashed_compare)
+
+class DurationStats:
+    """
+    One-pass, mergeable accumulator of segment duration statistics.
+
+    Durations up to `MAX_BINNED_DURATION` seconds are counted in centisecond bins
+    (`numpy.bincount`), so the count, sum, min, max, any quantile and duration
+    histograms come out of a single pass, without keeping or sorting the durations.
+    Longer durations (full-session recordings, corrupt headers) are counted in
+    log-spaced overflow bins `OVERFLOW_RATIO` wide (a sparse `Counter`), so memory is
+    bounded whatever the durations: at most 8 bytes per centisecond up to
+    `MAX_BINNED_DURATION` (~470 KiB for 600 s) plus one entry per overflow bin used
+    (~1000 bins up to 10^7 s). The accumulators of different shards or files are
+    combined with `merge`.
+
+    `count`, `total`, `min` and `max` are exact. Quantiles are exact up to the 0.01 s
+    bin resolution below `MAX_BINNED_DURATION`; in the overflow region a quantile is
+    the geometric center of its overflow bin (within 0.5 %), clamped to `min`/`max`.
+
+    Examples
+    --------
+    >>> stats = DurationStats()
+    >>> for manifest_filepath in sorted(glob.glob("shards/*.json")):
+    ...     stats.update_items(iter_manifest(manifest_filepath))
+    >>> manifest_time_stats(stats)
+    """
+    RESOLUTION = 100
+    MAX_BINNED_DURATION = 600
+    OVERFLOW_RATIO = 1.01
+    HISTOGRAM_EDGES = (0, 1, 2, 5, 10, 15, 20, 30)
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self.bins = np.zeros(0, dtype=np.int64)
+        # Overflow bin k holds [MAX_BINNED_DURATION * OVERFLOW_RATIO**k, MAX_BINNED_DURATION * OVERFLOW_RATIO**(k+1))
+        self.overflow_counts = Counter()
+        self.overflow_seconds = Counter()
+
+    def update(self, durations):
+        """Add an array-like of durations in seconds. NaN (missing) durations are ignored."""
+        durations = np.asarray(durations, dtype=float).ravel()
+        durations = durations[~np.isnan(durations)]
+        if len(durations) == 0:
+            return self
+        d_min = float(durations.min())
+        d_max = float(durations.max())
+        if d_min < 0:
+            raise ValueError(f"ERROR: Negative duration found: {d_min}")
+        self.count += len(durations)
+        self.total += float(durations.sum())
+        self.min = d_min if self.min is None else min(self.min, d_min)
+        self.max = d_max if self.max is None else max(self.max, d_max)
+        indices = np.rint(durations * self.RESOLUTION)
+        binned = indices <= self.MAX_BINNED_DURATION * self.RESOLUTION
+        self._add_bins(np.bincount(indices[binned].astype(np.int64)))
+        if not binned.all():
+            overflow = durations[~binned]
+            keys, inverse = np.unique(self._overflow_keys(overflow), return_inverse=True)
+            self.overflow_counts.update(dict(zip(keys.tolist(), np.bincount(inverse.ravel()).tolist())))
+            self.overflow_seconds.update(dict(zip(keys.tolist(), np.bincount(inverse.ravel(), weights=overflow).tolist())))
+        return self
+
+    def _overflow_keys(self, durations):
+        keys = np.floor(np.log(durations / self.MAX_BINNED_DURATION) / np.log(self.OVERFLOW_RATIO)).astype(np.int64)
+        return np.maximum(keys, 0)
+
+    def _overflow_value(self, key):
+        """Geometric center of an overflow bin."""
+        return self.MAX_BINNED_DURATION * self.OVERFLOW_RATIO ** (key + 0.5)
+
+    def update_items(self, data, field: str = "duration", chunk_size: int = 65536):
+        """Add the `field` of every item of `data` (list or any iterable of dicts), `chunk_size` items at a time."""
+        for chunk in iter_chunks(data, chunk_size):
+            self.update([float(item[field]) for item in chunk])
+        return self
+
+    def merge(self, other):
+        """Add the durations counted by another `DurationStats` (e.g. of another shard)."""
+        if other.count:
+            self.count += other.count
+            self.total += other.total
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+            self._add_bins(other.bins)
+            self.overflow_counts.update(other.overflow_counts)
+            self.overflow_seconds.update(other.overflow_seconds)
+        return self
+
+    def _add_bins(self, bins):
+        if len(bins) > len(self.bins):
+            bins = bins.astype(np.int64)
+            bins[:len(self.bins)] += self.bins
+            self.bins = bins
+        else:
+            self.bins[:len(bins)] += bins
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    def _rank_value(self, rank, cumulative, overflow_keys, overflow_cumulative):
+        """Duration of the item of 0-based `rank` in sorted order."""
+        if rank < cumulative[-1]:
+            return np.searchsorted(cumulative, rank, side="right") / self.RESOLUTION
+        position = np.searchsorted(overflow_cumulative, rank - cumulative[-1], side="right")
+        return self._overflow_value(overflow_keys[position])
+
+    def quantile(self, q: float):
+        """
+        Duration below which a fraction `q` of the segments fall, interpolating between
+        the two closest ranks as `statistics.median` does for `q=0.5`.
+        """
+        if not self.count:
+            return None
+        cumulative = np.cumsum(self.bins) if len(self.bins) else np.zeros(1, dtype=np.int64)
+        overflow_keys = sorted(self.overflow_counts)
+        overflow_cumulative = np.cumsum([self.overflow_counts[key] for key in overflow_keys])
+        rank = q * (self.count - 1)
+        lower, upper = (self._rank_value(r, cumulative, overflow_keys, overflow_cumulative)
+                        for r in (np.floor(rank), np.ceil(rank)))
+        value = lower + (upper - lower) * (rank - np.floor(rank))
+        return float(min(max(value, self.min), self.max))
+
+    @property
+    def median(self):
+        return self.quantile(0.5)
+
+    def histogram(self, edges=None):
+        """
+        Number of segments and seconds per duration bucket.
+
+        Parameters
+        ----------
+        edges : sequence of float, optional (default=`HISTOGRAM_EDGES`)
+            Increasing bucket edges in seconds, starting at 0. The last bucket
+            holds every duration from the last edge on.
+
+        Returns
+        -------
+        list of [lower, upper, sentences, seconds]
+            One entry per bucket [lower, upper); `upper` is None for the last one.
+            Durations above `MAX_BINNED_DURATION` are bucketed by the lower bound
+            of their overflow bin (their seconds are exact).
+        """
+        edges = np.asarray(self.HISTOGRAM_EDGES if edges is None else edges, dtype=float)
+        overflow_keys = sorted(self.overflow_counts)
+        # Overflow bins go to the bucket of their lower bound
+        values = np.concatenate([np.arange(len(self.bins)) / self.RESOLUTION,
+                                 self.MAX_BINNED_DURATION * self.OVERFLOW_RATIO ** np.asarray(overflow_keys, dtype=float)])
+        counts = np.concatenate([self.bins, [self.overflow_counts[key] for key in overflow_keys]])
+        bin_seconds = np.concatenate([self.bins * values[:len(self.bins)], [self.overflow_seconds[key] for key in overflow_keys]])
+        buckets = np.maximum(np.searchsorted(edges, values, side="right") - 1, 0)
+        seconds = np.bincount(buckets, weights=bin_seconds, minlength=len(edges))
+        counts = np.bincount(buckets, weights=counts, minlength=len(edges))
+        uppers = list(edges[1:]) + [None]
+        return [[float(lower), None if upper is None else float(upper), int(count), round(float(total), 2)]
+                for lower, upper, count, total in zip(edges, uppers, counts, seconds)]
+
+def manifest_time_stats(manifest, return_stats: bool = False, verbose: bool = True, name: str = None):
     """
     Compute duration statistics from a manifest and optionally print them.
 
     Parameters
     ----------
-    manifest : str or list
+    manifest : str, list, Manifest, iterable, numpy.ndarray or DurationStats
         - If a string: treated as a filepath to a manifest JSON/JSONL file
-          readable by `read_manifest()`.  
-        - If a list: assumed to be an already-loaded list of dicts where each
-          item contains a `"duration"` field.
+          readable by `iter_manifest()`, which is streamed line by line.
+          For `.parquet` manifests only the duration column is read.  
+        - If a list or any other iterable (e.g. a generator): assumed to yield
+          dicts where each item contains a `"duration"` field.
+        - If a NumPy array: durations in seconds.
+        - If a `Manifest`: its duration column, without building the items.
+        - If a `DurationStats`: an accumulator already filled (e.g. merged from
+          several shards or files).
 
     return_stats : bool, optional (default=False)
         If True, return a dictionary containing all computed statistics.
@@ -322,6 +2183,9 @@ def manifest_time_stats(manifest, return_stats: bool = False, verbose: bool = Tr
     verbose : bool, optional (default=True)
         If True, log the statistics to the console using `logging.info()`.
 
+    name : str, optional (default=None)
+        Name reported as "filename" instead of the one derived from `manifest`.
+
     Returns
     -------
     dict (optional)
@@ -334,30 +2198,55 @@ def manifest_time_stats(manifest, return_stats: bool = False, verbose: bool = Tr
             - "t_total": [sum of durations in seconds, hours]  
             - "t_total_median": [median * count in seconds, hours]  
             - "sentences": number of entries in the manifest
+            - "histogram": [lower, upper, sentences, seconds] per duration bucket
+              (see `DurationStats.histogram`)
 
     Notes
     -----
     The function expects each entry in the manifest to contain a
     `"duration"` key whose value can be converted to a float.
+    Statistics are accumulated in one pass with `DurationStats`: nothing is
+    sorted and the durations are not kept in memory. The median is exact up
+    to 0.01 s.
     """
-    if isinstance(manifest, str):
-        data = read_manifest(manifest)
+    if isinstance(manifest, DurationStats):
+        duration_stats = manifest
+        filename = "merged stats"
+    elif isinstance(manifest, str) and manifest.endswith(".parquet"):
+        duration_stats = DurationStats().update(read_manifest_columns(manifest, ["duration"], verbose=False)["duration"])
         filename = os.path.split(manifest)[1]
+    elif isinstance(manifest, str):
+        duration_stats = DurationStats().update_items(iter_manifest(manifest))
+        filename = os.path.split(manifest)[1]
+    elif isinstance(manifest, Manifest):
+        duration_stats = DurationStats().update(manifest.column("duration"))
+        filename = manifest.name or "in-memory data"
+    elif isinstance(manifest, np.ndarray):
+        duration_stats = DurationStats().update(manifest)
+        filename = "in-memory data"
     elif isinstance(manifest, list):
-        data = manifest
+        duration_stats = DurationStats().update_items(manifest)
         filename = "in-memory data"
+    elif hasattr(manifest, "__iter__") and not isinstance(manifest, dict):
+        duration_stats = DurationStats().update_items(manifest)
+        filename = "streamed data"
     else:
-        raise Exception(f"ERROR: 'manifest' must be 'str' or 'list'")
-    duration = [float(item['duration']) for item in data]
+        raise Exception(f"ERROR: 'manifest' must be 'str', 'list', 'Manifest', an iterable of dicts, an array or 'DurationStats'")
+    if name is not None:
+        filename = name
+    if not duration_stats.count:
+        raise ValueError(f"ERROR: No durations found in {filename}")
+    median = duration_stats.median
     stats = {
         "filename": filename,
-        "t_min": round(min(duration),2),
-        "t_mean": round(statistics.mean(duration),2),
-        "t_median": round(statistics.median(duration),2),
-        "t_max": round(max(duration),2),
-        "t_total": [round(sum(duration),2), round(sum(duration)/3600,2)],
-        "t_total_median": [round(statistics.median(duration)*len(duration),2), round(statistics.median(duration)*len(duration)/3600,2)],
-        "sentences": len(data)
+        "t_min": round(duration_stats.min,2),
+        "t_mean": round(duration_stats.mean,2),
+        "t_median": round(median,2),
+        "t_max": round(duration_stats.max,2),
+        "t_total": [round(duration_stats.total,2), round(duration_stats.total/3600,2)],
+        "t_total_median": [round(median*duration_stats.count,2), round(median*duration_stats.count/3600,2)],
+        "sentences": duration_stats.count,
+        "histogram": duration_stats.histogram()
     }
     if verbose:
         logging.info(f"=============[ {stats['filename']} ]=============")
@@ -370,11 +2259,54 @@ def manifest_time_stats(manifest, return_stats: bool = False, verbose: bool = Tr
         logging.info(f"{'-'*(30+len(stats['filename']))}")
         logging.info(f"- Median time: {stats['t_median']} s")
         logging.info(f"- Total time (median): {stats['t_total_median'][0]} s | {stats['t_total_median'][1]} h")
+        logging.info(f"{'-'*(30+len(stats['filename']))}")
+        for lower, upper, sentences, seconds in stats["histogram"]:
+            bucket = f"[{lower:g}, {upper:g}) s" if upper is not None else f">= {lower:g} s"
+            logging.info(f"- {bucket}: {sentences} ({round(100*sentences/stats['sentences'], 2)}%) | {round(seconds/3600, 2)} h")
         logging.info(f"{'='*(30+len(stats['filename']))}")
     if return_stats:
         return stats
     
-def stats2xlsx(stats_list, dst_xlsx_filepath):
+def _append_profile_sheets(wb, profile_report):
+    """Adds the "Profile" (stages) and "Profile Rules" sheets of a `profiling.Profiler.report()` to a workbook."""
+    ws = wb.create_sheet("Profile")
+    ws.append(profiling.Profiler.STAGE_FIELDS)
+    for record in profile_report["stages"]:
+        ws.append([record.get(key) for key in profiling.Profiler.STAGE_FIELDS])
+    if profile_report["rules"]:
+        ws = wb.create_sheet("Profile Rules")
+        ws.append(profiling.Profiler.RULE_FIELDS)
+        for record in profile_report["rules"]:
+            ws.append([record.get(key) for key in profiling.Profiler.RULE_FIELDS])
+
+def profile2xlsx(profile_report, dst_xlsx_filepath):
+    """
+    Export a profiling report to an Excel file.
+
+    Parameters
+    ----------
+    profile_report : dict or profiling.Profiler
+        Report returned by `profiling.Profiler.report()` (or the profiler itself).
+
+    dst_xlsx_filepath : str
+        Path where the Excel (.xlsx) file will be saved.
+
+    Notes
+    -----
+    - The "Profile" sheet has one row per stage: calls, wall/CPU time (s), items,
+      items/s, bytes read/written and peak RSS (MB).
+    - The "Profile Rules" sheet (if any) has the time spent in each normalization rule.
+    - Use `stats2xlsx(..., profile_report=...)` to add these sheets next to the duration statistics.
+    - Existing files at the destination path will be overwritten.
+    """
+    if isinstance(profile_report, profiling.Profiler):
+        profile_report = profile_report.report()
+    wb = openpyxl.Workbook()
+    wb.remove(wb.active)
+    _append_profile_sheets(wb, profile_report)
+    wb.save(dst_xlsx_filepath)
+
+def stats2xlsx(stats_list, dst_xlsx_filepath, profile_report=None):
     """
     Export a list of statistics dictionaries to an Excel file.
 
@@ -392,13 +2324,16 @@ def stats2xlsx(stats_list, dst_xlsx_filepath):
     dst_xlsx_filepath : str
         Path where the Excel (.xlsx) file will be saved.
 
+    profile_report : dict or profiling.Profiler, optional (default=None)
+        If given, the "Profile" sheets of `profile2xlsx` are added to the workbook.
+
     Returns
     -------
     None
 
     Notes
     -----
-    - The Excel file will have a single sheet named "Stats".
+    - The Excel file will have a sheet named "Stats" (plus the profile sheets, if any).
     - Columns include: filename, min/mean/max times, total time in hours, and number of sentences.
     - Existing files at the destination path will be overwritten.
     """
@@ -417,6 +2352,10 @@ def stats2xlsx(stats_list, dst_xlsx_filepath):
             stat["sentences"]
         ]
         ws.append(row)
+    if profile_report is not None:
+        if isinstance(profile_report, profiling.Profiler):
+            profile_report = profile_report.report()
+        _append_profile_sheets(wb, profile_report)
     wb.save(dst_xlsx_filepath)
     
 def resultwer2xlsx(resultwer_list, dst_xlsx_filepath):
@@ -444,20 +2383,17 @@ def resultwer2xlsx(resultwer_list, dst_xlsx_filepath):
     -----
     - The Excel file will have a single sheet named "WER Results".
     - Columns include: filename, mean WER with/without case-preserving, and total WER with/without case-preserving.
+    - The optional "sentences", "wall_time" and "utt_per_s" columns (added by
+      `wer_evaluator.evaluate_manifests`) are included when present in any result.
     - Existing files at the destination path will be overwritten.
     """
     wb = openpyxl.Workbook()
     ws = wb.active
     ws.title = "WER Results"
     headers = ["filename", "mean_wer_cp", "mean_wer", "total_wer_cp", "total_wer"]
+    headers += [key for key in ["sentences", "wall_time", "utt_per_s"] if any(key in resultwer for resultwer in resultwer_list)]
     ws.append(headers)
     for resultwer in resultwer_list:
-        row = [
-            resultwer["filename"],
-            resultwer["mean_wer_cp"],
-            resultwer["mean_wer"],
-            resultwer["total_wer_cp"],
-            resultwer["total_wer"]
-        ]
+        row = [resultwer.get(key) for key in headers]
         ws.append(row)
     wb.save(dst_xlsx_filepath)
\ No newline at end of file
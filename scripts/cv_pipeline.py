@@ -0,0 +1,340 @@
+"""
+Sharded, resumable build of Common Voice style releases.
+
+The TSV splits of a release (validated, test, dev) are cut into shards of
+`shard_size` rows that are built on a process pool: audio probing, text
+normalization and writing of one manifest per shard. The train split is then
+obtained by removing the test and dev-s sentences from the validated shards,
+also shard by shard.
+
+Every finished shard is recorded in `index.json` in the output folder, with a
+fingerprint of its input rows and of the build configuration. When the build is
+run again (e.g. after a crash) the shards whose fingerprint did not change are
+not rebuilt.
+
+Usage:
+    python cv_pipeline.py ./common_voice_v18/eu ./manifests --lang eu --workers 8
+"""
+import os
+import bisect
+import itertools
+import json
+import time
+import random
+import hashlib
+import logging
+import argparse
+import csv
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import corpus_utils as cu
+from normalizer import TextNormalizer
+from build_state import BuildState, fingerprint
+
+INDEX_FILENAME = "index.json"
+
+def _write_json_atomic(json_filepath, content):
+    """Write a JSON file through a temporary file, so a crash never leaves it half written."""
+    tmp_filepath = json_filepath + ".tmp"
+    with open(tmp_filepath, "w", encoding="utf-8") as f:
+        json.dump(content, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_filepath, json_filepath)
+
+def _write_manifest_atomic(manifest_filepath, data):
+    """Write a manifest through a temporary file and return the number of items written."""
+    tmp_filepath = manifest_filepath + ".tmp"
+    with cu.ManifestWriter(tmp_filepath) as writer:
+        count = writer.write_many(data)
+    os.replace(tmp_filepath, manifest_filepath)
+    return count
+
+def load_index(output_folder):
+    """Load the shard index of a build (an empty one if the build never ran)."""
+    index_filepath = os.path.join(output_folder, INDEX_FILENAME)
+    if not os.path.exists(index_filepath):
+        return {"config": None, "shards": {}, "splits": {}}
+    with open(index_filepath, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def _iter_tsv_shards(tsv_filepath, audio_field, text_field, shard_size):
+    """
+    Lists of `shard_size` (audio path, sentence) rows of a TSV split, read lazily.
+    Common Voice sentences are not quoted.
+    """
+    for batch in cu.iter_tsv_batches(tsv_filepath, audio_field=audio_field, text_field=text_field,
+                                     quoting=csv.QUOTE_NONE, chunksize=shard_size):
+        if batch["text"]:
+            yield list(zip(batch["audio_filepath"], batch["text"]))
+
+def _build_shard(task):
+    """
+    Worker: probe, normalize and write one shard of TSV rows.
+    Returns the index entry of the shard.
+    """
+    start = time.perf_counter()
+    config = task["config"]
+    audio_filepaths = [os.path.join(config["clips_folder"], path) for path, _ in task["rows"]]
+    state = BuildState(config["state"]) if config["state"] is not None else None
+    durations = cu.probe_durations(audio_filepaths, max_workers=config["probe_workers"], cache=config["cache"],
+                                   state=state, verbose=False)
+    data = [
+        {"audio_filepath": audio_filepath, "text": text, "duration": duration}
+        for audio_filepath, (_, text), duration in zip(audio_filepaths, task["rows"], durations)
+        if duration is not None
+    ]
+    normalizer = TextNormalizer(lang=config["lang"], remove_acronyms=config["remove_acronyms"],
+                                blacklist_terms=config["blacklist_terms"], verbose=False, state=state)
+    count = _write_manifest_atomic(os.path.join(task["output_folder"], task["path"]), normalizer.iter_clean(data))
+    if state is not None:
+        state.close()
+    return {
+        "split": task["split"],
+        "path": task["path"],
+        "fingerprint": task["fingerprint"],
+        "rows_in": len(task["rows"]),
+        "rows_out": count,
+        "unreadable": len(audio_filepaths) - len(data),
+        "build_time": round(time.perf_counter() - start, 3),
+    }
+
+def _reduce_shard(task):
+    """Worker: write the items of a validated shard that are not in the exclusion index."""
+    start = time.perf_counter()
+    output_folder = task["output_folder"]
+    exclude = task["exclude"]
+    data = cu.read_manifest(os.path.join(output_folder, task["source"]), verbose=False)
+    found = exclude.contains_hashes(exclude.hash_texts([item["text"] for item in data]))
+    count = _write_manifest_atomic(os.path.join(output_folder, task["path"]),
+                                   (item for item, is_found in zip(data, found) if not is_found))
+    return {
+        "split": task["split"],
+        "path": task["path"],
+        "fingerprint": task["fingerprint"],
+        "rows_in": task["rows_in"],
+        "rows_out": count,
+        "build_time": round(time.perf_counter() - start, 3),
+    }
+
+def _run_tasks(fn, tasks, index, output_folder, workers, desc, verbose):
+    """
+    Run shard tasks on a process pool, saving the index after every finished shard.
+    The tasks are consumed lazily, with at most 2 * workers of them in flight, so only
+    their rows are held in memory. Returns the number of shards built.
+    """
+    index_filepath = os.path.join(output_folder, INDEX_FILENAME)
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    done = 0
+
+    def save(future):
+        nonlocal done
+        done += 1
+        entry = future.result()
+        index["shards"][entry["path"]] = entry
+        _write_json_atomic(index_filepath, index)
+        if verbose:
+            logging.info(f"[{desc} {done}] {entry['path']}: {entry['rows_out']}/{entry['rows_in']} rows "
+                         f"in {entry['build_time']} s")
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for task in tasks:
+            pending.append(executor.submit(fn, task))
+            if len(pending) >= 2 * workers:
+                save(pending.popleft())
+        while pending:
+            save(pending.popleft())
+    if verbose and done:
+        logging.info(f"- {desc}: {done} shards in {round(time.perf_counter() - start, 2)} s")
+    return done
+
+def _pending(tasks, index, output_folder, resume):
+    """Tasks whose shard is missing, or was built from other rows or with another configuration."""
+    return (
+        task for task in tasks
+        if not resume
+        or index["shards"].get(task["path"], {}).get("fingerprint") != task["fingerprint"]
+        or not os.path.exists(os.path.join(output_folder, task["path"]))
+    )
+
+def build_common_voice(cv_folder, output_folder, lang: str, splits=("validated", "test", "dev"),
+                       dev_size: int = 620, seed: int = 0, shard_size: int = 50000, workers: int = None,
+                       probe_workers: int = 16, remove_acronyms: bool = True, blacklist_terms=None,
+                       audio_field: str = "path", text_field: str = "sentence", cache=None, state=None,
+                       resume: bool = True, verbose: bool = True):
+    """
+    Build the manifests of a Common Voice style release in parallel, resumable shards.
+
+    Parameters
+    ----------
+    cv_folder : str
+        Release folder with the `<split>.tsv` files and the `clips` folder.
+
+    output_folder : str
+        Destination folder. Each split is written to `<split>/shard-XXXXX.json`, and
+        the shard list of every split to `index.json`.
+
+    lang : str
+        Normalization language ('es' or 'eu').
+
+    splits : tuple of str, optional (default=("validated", "test", "dev"))
+        TSV splits to build. "validated", "test" and "dev" are needed for the train split.
+
+    dev_size : int, optional (default=620)
+        Number of dev sentences sampled (with `seed`) for the dev-s split.
+
+    seed : int, optional (default=0)
+        Seed of the dev-s sampling, so a resumed build samples the same sentences.
+
+    shard_size : int, optional (default=50000)
+        Number of TSV rows per shard.
+
+    workers : int, optional (default=None)
+        Number of processes. None uses one per CPU core.
+
+    probe_workers : int, optional (default=16)
+        Threads used by each process to probe the audio files.
+
+    remove_acronyms, blacklist_terms :
+        Passed to `TextNormalizer`.
+
+    audio_field, text_field : str, optional
+        TSV columns with the audio path and the sentence.
+
+    cache : str, optional (default=None)
+        Path of an `audio_probe.AudioMetadataCache` SQLite database shared by the workers.
+
+    state : str, optional (default=None)
+        Path of a `build_state.BuildState` database shared by the workers. Shards that
+        have to be rebuilt, e.g. because a new release shifted their rows, only probe and
+        normalize the rows that were never processed, and produce the same files as a
+        full rebuild.
+
+    resume : bool, optional (default=True)
+        If True, the shards already built with the same rows and configuration are kept.
+
+    verbose : bool, optional (default=True)
+        If True, logs the progress and the duration statistics of each split.
+
+    Returns
+    -------
+    dict
+        The build index: {"config", "shards": {path: entry}, "splits": {split: [shard paths]}}.
+    """
+    os.makedirs(output_folder, exist_ok=True)
+    config = {
+        "lang": lang, "remove_acronyms": remove_acronyms, "blacklist_terms": blacklist_terms,
+        "clips_folder": os.path.join(cv_folder, "clips"), "probe_workers": probe_workers, "cache": cache,
+        "state": state,
+    }
+    build_config = {key: config[key] for key in ["lang", "remove_acronyms", "blacklist_terms", "clips_folder"]}
+    index = load_index(output_folder) if resume else {"config": None, "shards": {}, "splits": {}}
+    index["config"] = dict(build_config, shard_size=shard_size, dev_size=dev_size, seed=seed)
+    splits_shards = {}
+
+    # 1. TSV splits, in shards of `shard_size` rows, read as they are submitted
+    def split_tasks():
+        for split in splits:
+            os.makedirs(os.path.join(output_folder, split), exist_ok=True)
+            splits_shards[split] = []
+            tsv_shards = _iter_tsv_shards(os.path.join(cv_folder, f"{split}.tsv"), audio_field, text_field, shard_size)
+            for shard, shard_rows in enumerate(tsv_shards):
+                task = {
+                    "split": split, "path": f"{split}/shard-{shard:05d}.json", "rows": shard_rows,
+                    "fingerprint": fingerprint(build_config, shard_rows).hex(),
+                    "config": config, "output_folder": output_folder,
+                }
+                splits_shards[split].append(task["path"])
+                yield task
+    built = _run_tasks(_build_shard, _pending(split_tasks(), index, output_folder, resume), index, output_folder,
+                       workers, "Shards", verbose)
+    if verbose:
+        total = sum(len(paths) for paths in splits_shards.values())
+        logging.info(f"::::: Built {built}/{total} shards ({total - built} already built) :::::")
+
+    # 2. dev-s and train splits
+    if all(split in splits_shards for split in ["validated", "test", "dev"]):
+        # Only the sampled dev lines are parsed. Shuffling the row numbers gives the same
+        # permutation as shuffling the items themselves.
+        dev_manifests = [cu.MappedManifest(os.path.join(output_folder, path), cache_index=False, verbose=False)
+                         for path in splits_shards["dev"]]
+        bounds = list(itertools.accumulate(len(manifest) for manifest in dev_manifests))
+        rows = list(range(bounds[-1] if bounds else 0))
+        random.Random(seed).shuffle(rows)
+        dev_s_data = []
+        for row in rows[:dev_size]:
+            shard = bisect.bisect_right(bounds, row)
+            dev_s_data.append(dev_manifests[shard][row - (bounds[shard - 1] if shard else 0)])
+        for manifest in dev_manifests:
+            manifest.close()
+        dev_s_path = "dev-s/shard-00000.json"
+        os.makedirs(os.path.join(output_folder, "dev-s"), exist_ok=True)
+        _write_manifest_atomic(os.path.join(output_folder, dev_s_path), dev_s_data)
+        index["shards"][dev_s_path] = {"split": "dev-s", "path": dev_s_path, "rows_in": len(rows),
+                                       "rows_out": len(dev_s_data)}
+        splits_shards["dev-s"] = [dev_s_path]
+
+        exclude = cu.HashIndex([
+            cu.stable_hash(item["text"])
+            for path in splits_shards["test"] + splits_shards["dev-s"]
+            for item in cu.iter_manifest(os.path.join(output_folder, path), verbose=False)
+        ])
+        exclude_fingerprint = hashlib.blake2b(exclude.hashes.tobytes(), digest_size=16).hexdigest()
+        os.makedirs(os.path.join(output_folder, "train"), exist_ok=True)
+        tasks = []
+        for source in splits_shards["validated"]:
+            source_entry = index["shards"][source]
+            task = {
+                "split": "train", "path": source.replace("validated/", "train/", 1), "source": source,
+                "rows_in": source_entry["rows_out"], "exclude": exclude, "output_folder": output_folder,
+                "fingerprint": fingerprint(source_entry["fingerprint"], exclude_fingerprint).hex(),
+            }
+            tasks.append(task)
+        splits_shards["train"] = [task["path"] for task in tasks]
+        _run_tasks(_reduce_shard, _pending(tasks, index, output_folder, resume), index, output_folder, workers, "Train shards", verbose)
+
+    # 3. Index of the current build (entries of shards that are no longer part of it are dropped)
+    current = {path for paths in splits_shards.values() for path in paths}
+    index["shards"] = {path: entry for path, entry in index["shards"].items() if path in current}
+    index["splits"] = splits_shards
+    _write_json_atomic(os.path.join(output_folder, INDEX_FILENAME), index)
+
+    if verbose:
+        for split, paths in splits_shards.items():
+            stats = cu.DurationStats()
+            for path in paths:
+                stats.update(cu.read_manifest_columns(os.path.join(output_folder, path), ["duration"], verbose=False)["duration"])
+            if stats.count:
+                cu.manifest_time_stats(stats, name=split)
+    return index
+
+def iter_split(output_folder, split):
+    """Stream the items of a built split, shard by shard, in index order."""
+    index = load_index(output_folder)
+    for path in index["splits"][split]:
+        yield from cu.iter_manifest(os.path.join(output_folder, path), verbose=False)
+
+def main():
+    parser = argparse.ArgumentParser(description="Sharded, resumable build of a Common Voice style release.")
+    parser.add_argument("cv_folder", help="Release folder with the <split>.tsv files and the clips folder.")
+    parser.add_argument("output_folder", help="Destination folder of the shards and index.json.")
+    parser.add_argument("--lang", required=True, help="Normalization language: 'es' or 'eu'.")
+    parser.add_argument("--splits", nargs="+", default=["validated", "test", "dev"])
+    parser.add_argument("--dev_size", type=int, default=620)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--shard_size", type=int, default=50000)
+    parser.add_argument("--workers", type=int, default=None, help="Number of processes (default: one per core).")
+    parser.add_argument("--probe_workers", type=int, default=16)
+    parser.add_argument("--keep_acronyms", action="store_true", help="Do not remove the sentences with acronyms.")
+    parser.add_argument("--cache", default=None, help="SQLite audio metadata cache.")
+    parser.add_argument("--state", default=None, help="SQLite incremental build state (row fingerprints to outputs).")
+    parser.add_argument("--no_resume", action="store_true", help="Rebuild every shard.")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    build_common_voice(args.cv_folder, args.output_folder, lang=args.lang, splits=tuple(args.splits),
+                       dev_size=args.dev_size, seed=args.seed, shard_size=args.shard_size, workers=args.workers,
+                       probe_workers=args.probe_workers, remove_acronyms=not args.keep_acronyms, cache=args.cache,
+                       state=args.state, resume=not args.no_resume)
+
+if __name__ == "__main__":
+    main()
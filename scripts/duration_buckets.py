@@ -0,0 +1,300 @@
+"""
+Duration-bucketed sharding of training manifests, with a precomputed batch plan.
+
+The items of one or more manifests (streamed, any size) are routed to duration
+buckets with configurable boundaries. Every bucket is written as uncompressed
+shards of `shard_size` items, sorted by duration. Consecutive items of a shard
+are grouped into batches capped by total duration (`max_batch_duration`) and/or
+number of items (`max_batch_size`), and the batches of all the buckets are
+written, shuffled, to a batch plan. A trainer can read the plan instead of
+sorting or bucketing the data itself. Each batch holds clips of similar length,
+so little time is spent on padding.
+
+Output folder:
+    bucket-XX/shard-XXXXX.json   items of the bucket, sorted by duration
+    batches.json                 batch plan, one JSON line per batch:
+                                 {"shard", "start", "stop", "offset", "nbytes", "size", "duration", "max_duration"}
+                                 (lines [start, stop) of the shard, i.e. `nbytes` bytes from byte `offset`)
+    index.json                   configuration, buckets and their shards, counts and padding estimate
+
+Only one shard per bucket is held in memory at a time.
+
+Usage:
+    python duration_buckets.py ./manifests/train/*.json ./buckets --boundaries 2 4 6 8 10 15 \
+        --max_batch_duration 300 --max_batch_size 64
+"""
+import os
+import json
+import bisect
+import random
+import logging
+import argparse
+import corpus_utils as cu
+import profiling
+
+INDEX_FILENAME = "index.json"
+PLAN_FILENAME = "batches.json"
+
+def bucket_ranges(boundaries):
+    """[min, max) duration range of every bucket (len(boundaries) + 1 buckets, the last one unbounded)."""
+    edges = [0.0] + list(boundaries) + [None]
+    return [(edges[i], edges[i + 1]) for i in range(len(edges) - 1)]
+
+def plan_batches(durations, max_batch_duration: float = None, max_batch_size: int = None):
+    """
+    Greedy split of a list of durations into batches of consecutive items.
+
+    A batch is closed before an item that would make its total duration exceed
+    `max_batch_duration` or its size exceed `max_batch_size`. An item longer than
+    `max_batch_duration` gets a batch of its own.
+
+    Returns
+    -------
+    list of (start, stop)
+        Item ranges of the batches.
+    """
+    batches = []
+    start = 0
+    total = 0.0
+    for i, duration in enumerate(durations):
+        full = (max_batch_size is not None and i - start >= max_batch_size) or \
+               (max_batch_duration is not None and total + duration > max_batch_duration)
+        if full and i > start:
+            batches.append((start, i))
+            start = i
+            total = 0.0
+        total += duration
+    if start < len(durations):
+        batches.append((start, len(durations)))
+    return batches
+
+class _BucketWriter:
+    """Buffers the items of one bucket and writes them as sorted shards, planning their batches."""
+    def __init__(self, output_folder, bucket, shard_size, max_batch_duration, max_batch_size, field, ensure_ascii):
+        self.output_folder = output_folder
+        self.bucket = bucket
+        self.shard_size = shard_size
+        self.max_batch_duration = max_batch_duration
+        self.max_batch_size = max_batch_size
+        self.field = field
+        self.ensure_ascii = ensure_ascii
+        self.items = []
+        self.shards = []
+        self.batches = []
+        self.count = 0
+        self.duration = 0.0
+        self.padded_duration = 0.0
+        self.bytes_written = 0
+
+    def add(self, item):
+        self.items.append(item)
+        if len(self.items) >= self.shard_size:
+            self.flush()
+
+    def flush(self):
+        if not self.items:
+            return
+        items = sorted(self.items, key=lambda item: item[self.field])
+        self.items = []
+        path = f"bucket-{self.bucket:02d}/shard-{len(self.shards):05d}.json"
+        shard_filepath = os.path.join(self.output_folder, path)
+        os.makedirs(os.path.dirname(shard_filepath), exist_ok=True)
+        offsets = [0]
+        with open(shard_filepath + ".tmp", "wb") as f:
+            for item in items:
+                line = (json.dumps(item, ensure_ascii=self.ensure_ascii) + "\n").encode("utf-8")
+                f.write(line)
+                offsets.append(offsets[-1] + len(line))
+        os.replace(shard_filepath + ".tmp", shard_filepath)
+        durations = [item[self.field] for item in items]
+        for start, stop in plan_batches(durations, self.max_batch_duration, self.max_batch_size):
+            # Sorted shard: the last item of a batch is the longest one
+            batch_duration = sum(durations[start:stop])
+            self.batches.append({
+                "shard": path, "start": start, "stop": stop,
+                "offset": offsets[start], "nbytes": offsets[stop] - offsets[start],
+                "size": stop - start, "duration": round(batch_duration, 3), "max_duration": durations[stop - 1],
+            })
+            self.padded_duration += (stop - start) * durations[stop - 1]
+            self.duration += batch_duration
+        self.shards.append({"path": path, "items": len(items), "min_duration": durations[0], "max_duration": durations[-1]})
+        self.count += len(items)
+        self.bytes_written += offsets[-1]
+
+def write_duration_buckets(data, output_folder, boundaries=(2, 4, 6, 8, 10, 15, 20), shard_size: int = 50000,
+                           max_batch_duration: float = None, max_batch_size: int = None, shuffle: bool = True,
+                           seed: int = 0, field: str = "duration", ensure_ascii: bool = False, verbose: bool = True):
+    """
+    Split a manifest into duration buckets, written as sharded manifests, plus a batch plan.
+
+    Parameters
+    ----------
+    data : iterable of dict
+        Items with a duration in `field` (a list, `Manifest` or any iterable,
+        e.g. `iter_manifest`, consumed once).
+
+    output_folder : str
+        Destination folder (see the module docstring for its layout). Shards of
+        a previous run are overwritten; `index.json` only lists the new ones.
+
+    boundaries : list of float, optional (default=(2, 4, 6, 8, 10, 15, 20))
+        Increasing duration boundaries in seconds. Bucket 0 holds the items
+        shorter than `boundaries[0]`, bucket i those in
+        [boundaries[i-1], boundaries[i]) and the last one the rest.
+
+    shard_size : int, optional (default=50000)
+        Maximum number of items per shard. Up to `shard_size` items per bucket
+        are held in memory.
+
+    max_batch_duration : float, optional (default=None)
+        Maximum total duration (seconds) of a batch.
+
+    max_batch_size : int, optional (default=None)
+        Maximum number of items of a batch. If neither limit is given, every
+        shard is a single batch.
+
+    shuffle : bool, optional (default=True)
+        Whether to shuffle the order of the batches of the plan (with `seed`).
+        Otherwise they are listed bucket by bucket and shard by shard.
+
+    seed : int, optional (default=0)
+        Seed of the batch order.
+
+    field : str, optional (default="duration")
+        Item field with the duration.
+
+    ensure_ascii : bool, optional (default=False)
+        If True, non-ASCII characters are escaped in the shards.
+
+    verbose : bool, optional (default=True)
+        If True, logs the items, shards and batches of every bucket.
+
+    Returns
+    -------
+    dict
+        The content of `index.json`: {"config", "buckets", "items", "skipped",
+        "batches", "padding"}. "padding" is the fraction of padded audio in the
+        plan: 1 - total duration / sum of (batch size * longest item of the batch).
+
+    Notes
+    -----
+    Items without duration cannot be bucketed: they are skipped and counted in
+    "skipped". Filter them out (or probe their audio) beforehand.
+    """
+    boundaries = list(boundaries)
+    if any(b <= a for a, b in zip(boundaries, boundaries[1:])):
+        raise ValueError(f"ERROR: duration boundaries must be increasing: {boundaries}")
+    if max_batch_size is not None and max_batch_size < 1:
+        raise ValueError(f"ERROR: max_batch_size must be at least 1, got {max_batch_size}")
+    ranges = bucket_ranges(boundaries)
+    writers = [_BucketWriter(output_folder, i, shard_size, max_batch_duration, max_batch_size, field, ensure_ascii)
+               for i in range(len(ranges))]
+    skipped = 0
+    # Created up front: without any bucketed item no shard creates it, but the plan and index are still written
+    os.makedirs(output_folder, exist_ok=True)
+    if verbose:
+        logging.info(f"::::: Duration buckets: {output_folder} :::::")
+    with profiling.stage("duration_buckets") as run:
+        for item in data:
+            duration = item.get(field)
+            if duration is None:
+                skipped += 1
+                continue
+            writers[bisect.bisect_right(boundaries, duration)].add(item)
+        for writer in writers:
+            writer.flush()
+        batches = [batch for writer in writers for batch in writer.batches]
+        if shuffle:
+            random.Random(seed).shuffle(batches)
+        plan_filepath = os.path.join(output_folder, PLAN_FILENAME)
+        with open(plan_filepath + ".tmp", "w", encoding="utf-8") as f:
+            for batch in batches:
+                f.write(json.dumps(batch) + "\n")
+        os.replace(plan_filepath + ".tmp", plan_filepath)
+        items = sum(writer.count for writer in writers)
+        run.items = items
+        run.bytes_written = sum(writer.bytes_written for writer in writers) + os.path.getsize(plan_filepath)
+    duration = sum(writer.duration for writer in writers)
+    padded_duration = sum(writer.padded_duration for writer in writers)
+    index = {
+        "config": {"boundaries": boundaries, "shard_size": shard_size, "max_batch_duration": max_batch_duration,
+                   "max_batch_size": max_batch_size, "shuffle": shuffle, "seed": seed, "field": field},
+        "buckets": [{"bucket": writer.bucket, "min_duration": low, "max_duration": high, "items": writer.count,
+                     "duration": round(writer.duration, 3), "batches": len(writer.batches), "shards": writer.shards}
+                    for writer, (low, high) in zip(writers, ranges)],
+        "items": items,
+        "skipped": skipped,
+        "batches": len(batches),
+        "padding": round(1 - duration / padded_duration, 4) if padded_duration > 0 else 0.0,
+    }
+    index_filepath = os.path.join(output_folder, INDEX_FILENAME)
+    with open(index_filepath + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, indent=1)
+    os.replace(index_filepath + ".tmp", index_filepath)
+    if verbose:
+        for bucket in index["buckets"]:
+            high = f"{bucket['max_duration']} s" if bucket["max_duration"] is not None else "inf"
+            logging.info(f"- Bucket {bucket['bucket']:02d} [{bucket['min_duration']} s, {high}): {bucket['items']} items, "
+                         f"{round(bucket['duration'] / 3600, 2)} h, {len(bucket['shards'])} shards, {bucket['batches']} batches")
+        logging.info(f"- Batch plan: {index['batches']} batches, {round(100 * index['padding'], 2)}% padding")
+        if skipped:
+            logging.warning(f"- Items without '{field}' skipped: {skipped}")
+    return index
+
+def iter_batch_plan(output_folder):
+    """Stream the batches of the plan written by `write_duration_buckets`, in plan order."""
+    yield from cu.iter_manifest(os.path.join(output_folder, PLAN_FILENAME), verbose=False)
+
+def iter_batches(output_folder, plan=None):
+    """
+    Stream the batches of a bucketed output folder as lists of items.
+
+    Each batch is read with a single seek and read of its byte range in the
+    shard, so no manifest has to be parsed or indexed.
+
+    Parameters
+    ----------
+    output_folder : str
+        Folder written by `write_duration_buckets`.
+
+    plan : iterable of dict, optional (default=None)
+        Batches to read (e.g. a slice of the plan for one data-parallel rank).
+        Defaults to the whole plan, in order.
+
+    Yields
+    ------
+    list of dict
+        The items of every batch.
+    """
+    files = {}
+    try:
+        for batch in (iter_batch_plan(output_folder) if plan is None else plan):
+            f = files.get(batch["shard"])
+            if f is None:
+                f = files[batch["shard"]] = open(os.path.join(output_folder, batch["shard"]), "rb")
+            f.seek(batch["offset"])
+            yield [json.loads(line) for line in f.read(batch["nbytes"]).splitlines()]
+    finally:
+        for f in files.values():
+            f.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Duration-bucketed sharding of manifests with a precomputed batch plan.")
+    parser.add_argument("manifests", nargs="+", help="Input manifests (JSONL, .gz/.zst or .parquet), read in order.")
+    parser.add_argument("output_folder", help="Destination folder of the bucket shards, batches.json and index.json.")
+    parser.add_argument("--boundaries", type=float, nargs="+", default=[2, 4, 6, 8, 10, 15, 20],
+                        help="Increasing bucket boundaries in seconds.")
+    parser.add_argument("--shard_size", type=int, default=50000)
+    parser.add_argument("--max_batch_duration", type=float, default=None, help="Maximum total seconds of audio per batch.")
+    parser.add_argument("--max_batch_size", type=int, default=None, help="Maximum items per batch.")
+    parser.add_argument("--no_shuffle", action="store_true", help="Keep the batches in bucket/shard order.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    data = (item for manifest_filepath in args.manifests for item in cu.iter_manifest(manifest_filepath))
+    write_duration_buckets(data, args.output_folder, boundaries=args.boundaries, shard_size=args.shard_size,
+                           max_batch_duration=args.max_batch_duration, max_batch_size=args.max_batch_size,
+                           shuffle=not args.no_shuffle, seed=args.seed)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+from itertools import islice
+
+def iter_chunks(iterable, size):
+    """Yield lists of up to `size` consecutive items of `iterable` (any iterable, consumed lazily)."""
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
@@ -1,12 +1,158 @@
 import re
 import logging
+from collections import deque, Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
 from tqdm import tqdm
+from build_state import fingerprint
+from iter_utils import iter_chunks
+import profiling
+
+def _compile_replacement_map(*maps):
+    """
+    Compiles ordered {pattern: replacement} maps into a single-pass replacement engine.
+    Plain character classes (e.g. r"[ÈËÊ]") are expanded into a `str.translate` table; any other
+    pattern is joined into one alternation regex applied after the table. When a character appears
+    in several rules the first one wins, as it did when the rules were applied one `re.sub` at a time.
+    :param maps: {pattern: replacement} dictionaries, in application order.
+    :return: (translate table, compiled alternation regex or None, replacement for each regex group name)
+    """
+    table = {}
+    patterns = []
+    replacements = {}
+    for mapping in maps:
+        for pattern, replacement in mapping.items():
+            chars = pattern[1:-1]
+            if pattern.startswith("[") and pattern.endswith("]") and chars and not any(c in chars for c in "\\^-[]"):
+                for char in chars:
+                    table.setdefault(ord(char), replacement)
+            else:
+                name = f"r{len(patterns)}"
+                patterns.append(f"(?P<{name}>{pattern})")
+                replacements[name] = replacement
+    regex = re.compile("|".join(patterns)) if patterns else None
+    return table, regex, replacements
+
+def _literal_term(pattern):
+    """Returns the text matched by `pattern` if it is a plain literal (escaped symbols allowed, e.g. r"\(RI\)"), else None."""
+    chars = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            if i + 1 == len(pattern) or pattern[i + 1].isalnum():
+                return None
+            chars.append(pattern[i + 1])
+            i += 2
+        elif char in ".^$*+?{}[]|()":
+            return None
+        else:
+            chars.append(char)
+            i += 1
+    return "".join(chars)
+
+def _trie_pattern(words):
+    """
+    Builds a regex matching any of `words` from their character trie, so the regex engine only follows the
+    branches that share the prefix read so far (the longest word wins when one is a prefix of another).
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        pattern = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{pattern})?" if "" in node else pattern
+    return build(trie)
+
+def _compile_blacklist(terms):
+    """
+    Compiles the blacklist terms (case insensitive regex patterns) into a single regex.
+    Plain literal terms, usually most of the list, are merged into one trie so the matching cost stays flat as the
+    list grows; any other term is kept as its own alternative.
+    The trie holds the literals as written: case insensitivity is left to re.IGNORECASE, as with the per-term
+    patterns, so the terms match exactly the same text as one `re.sub` per term would.
+    Literals that only differ in case (e.g. "\\(Ri\\)" and "\\(RI\\)") match the same text, so they share one
+    trie entry and keep all their (literal, term) pairs, in list order.
+    :return: (compiled regex or None, {lowercased literal: [(literal, term)]}, {regex group name: term})
+    """
+    literals = {}
+    written = []
+    patterns = {}
+    for term in terms or []:
+        literal = _literal_term(term)
+        if literal is None:
+            patterns[f"b{len(patterns)}"] = term
+        elif literal:
+            if literal.lower() not in literals:
+                literals[literal.lower()] = []
+                written.append(literal)
+            literals[literal.lower()].append((literal, term))
+    alternatives = [f"(?P<lit>{_trie_pattern(written)})"] if literals else []
+    alternatives += [f"(?P<{name}>{term})" for name, term in patterns.items()]
+    regex = re.compile("|".join(alternatives), flags=re.IGNORECASE) if alternatives else None
+    return regex, literals, patterns
+
+_ACRONYM_REGEX = re.compile(r'\b[\w\d]*[A-Z]{2,}[\w\d]*\b')
+_LETTER_REGEX = re.compile(r"[A-Za-z]")
+_SPACES_REGEX = re.compile(r" +")
+
+class NormalizationCache:
+    def __init__(self, max_entries: int = 100000):
+        """
+        Bounded LRU memo of normalized sentences, keyed on (normalizer config, raw text).
+        Corpora that repeat the same prompt across many speakers normalize each distinct sentence once.
+        One cache can be shared by several normalizers (e.g. the `text` and `pred_text` ones): the config
+        part of the key keeps different rule sets apart.
+        :param max_entries: Maximum number of cached sentences; the least recently used ones are evicted.
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        """Returns the cached value of `key` (marking it as recently used) or None."""
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self._entries[key] = value
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __len__(self):
+        return len(self._entries)
 
 class TextNormalizer:
+    # Removed entries listed in the verbose summary (per reason); the rest are only counted
+    MAX_LOGGED_REMOVED = 100
+
     def __init__(self, lang: str, tag: str = "text", keep_cp: bool = False, 
                  remove_acronyms: bool = False, remove_emptytext: bool = True, blacklist_terms = None, 
                  min_duration: float = 0.025, max_duration: float = 240,
-                 verbose: bool = True, verbose_type: str = "simple"):
+                 verbose: bool = True, verbose_type: str = "simple",
+                 workers: int = 1, chunk_size: int = 10000, cache: NormalizationCache = None, state = None):
         """
         Initializes the sentence cleaner with the necessary parameters.
         :param lang: Language ('es' or 'eu') if Bilingual 'es+eu' is wanted just select 'es'.
@@ -14,10 +160,24 @@ class TextNormalizer:
         :param keep_cp: Whether to preserve Capitalization and Punctuation.
         :param remove_acronyms: Whether to remove entries with acronyms
         :param remove_emptytext: Whether to remove emptytext entries
-        :param blacklist_terms: List of terms to remove (if provided).
+        :param blacklist_terms: List of terms (regex patterns, case insensitive) to remove (if provided). They are
+                                compiled once into a single regex, so the cost per sentence barely grows with the
+                                list; the hits of each term are counted in `blacklist_hits`.
         :param min/max_duration: duration threshold in seconds for the audios, will remove the sentence if it's out of bounds.
         :param verbose: Whether to show logging info.
         :param verbose_type: 'simple' or 'all'
+        :param workers: Number of processes used to normalize the data. With workers > 1 the data is split in shards
+                        of `chunk_size` items, normalized in a process pool and merged back in input order; the output
+                        is identical to the serial path, but the input items are not modified in place.
+        :param chunk_size: Number of items per shard.
+        :param cache: Optional `NormalizationCache` to memoize normalized sentences. With workers > 1 each worker
+                      process uses its own copy of the cache, and the hit/miss counters of this one are not updated.
+                      The blacklist hits of a sentence are cached with it and added to `blacklist_hits` on every
+                      cache hit; the rule timings only cover the sentences that are actually normalized.
+        :param state: Optional `build_state.BuildState` for incremental builds: the result of every item already
+                      normalized with the same configuration is read from the state instead of being computed again,
+                      and new items are added to it. Items read from the state do not count towards the character
+                      lists nor `blacklist_hits`.
         """
         self.lang = lang.lower()
         if self.lang not in ['es', 'eu']:
@@ -31,6 +191,24 @@ class TextNormalizer:
         self.max_duration = max_duration
         self.verbose = verbose
         self.verbose_type = verbose_type
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.cache = cache
+        self.state = state
+        self._cache_config = (self.lang, self.keep_cp, tuple(blacklist_terms) if blacklist_terms else None)
+
+        allowed_chars = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZáéíóúüÁÉÍÓÚÜñÑ "
+        if self.keep_cp:
+            allowed_chars += ".,¿?¡!;:"
+        self._disallowed_regex = re.compile(f"[^{allowed_chars}]")
+        self.blacklist_hits = Counter()
+        # Per-rule timings, only recorded while a `profiling.Profiler` is active
+        self.rule_times = Counter()
+        self.rule_calls = Counter()
+        self._time_rules = False
+        # Blacklist terms matched by the sentence being normalized, stored with it in the cache
+        self._matched_terms = None
+        self._blacklist_regex, self._blacklist_literals, self._blacklist_patterns = _compile_blacklist(blacklist_terms)
 
         self.unclean_char_list = set()
         self.clean_char_list = set()
@@ -48,85 +226,373 @@ class TextNormalizer:
             r"[èëēêе]": "e", r"[аãâāàä]": "a", r"[ùūû]": "u", r"[ôōòöõ]": "o", r"[ćç]": "c", r"[ïīìî]": "i",
             r"[ż]": "z", r"[ ]": " "
         }
+        self.eu_diacritic_map = {
+            r"[É]": "E", r"[Á]": "A", r"[ÚÜ]": "U", r"[Ó]": "O", r"[Í]": "I",
+            r"[é]": "e", r"[á]": "a", r"[úü]": "u", r"[ó]": "o", r"[í]": "i"
+        } if self.lang == "eu" else {}
+        self._diacritic_table, self._diacritic_regex, self._diacritic_replacements = _compile_replacement_map(
+            self.diacritic_map, self.eu_diacritic_map)
+        self._state_config = fingerprint(
+            type(self).__name__, getattr(self, "fields", None), self.lang, self.tag, self.keep_cp,
+            self.remove_acronyms, self.remove_emptytext, self.blacklist_terms, self.min_duration, self.max_duration,
+            self.diacritic_map, self.eu_diacritic_map
+        ).hex()
+
+    def __getstate__(self):
+        # The build state (an open database) stays in the parent process
+        attributes = self.__dict__.copy()
+        attributes["state"] = None
+        return attributes
 
     def replace_diacritics(self, item):
         """Replaces diacritic characters with their normalized versions."""
-        for pattern, replacement in self.diacritic_map.items():
-            item[self.tag] = re.sub(pattern, replacement, item[self.tag])
-        if self.lang == "eu":
-            eu_specific = {
-                r"[É]": "E", r"[Á]": "A", r"[ÚÜ]": "U", r"[Ó]": "O", r"[Í]": "I",
-                r"[é]": "e", r"[á]": "a", r"[úü]": "u", r"[ó]": "o", r"[í]": "i"
-            }
-            for pattern, replacement in eu_specific.items():
-                item[self.tag] = re.sub(pattern, replacement, item[self.tag])
+        text = item[self.tag].translate(self._diacritic_table)
+        if self._diacritic_regex is not None:
+            text = self._diacritic_regex.sub(lambda m: self._diacritic_replacements[m.lastgroup], text)
+        item[self.tag] = text
         return item
 
+    def _remove_blacklist_term(self, match):
+        """`re.sub` callback of the blacklist regex: counts the matched term and removes it."""
+        if match.lastgroup == "lit":
+            text = match.group()
+            variants = self._blacklist_literals.get(text.lower())
+            if variants is None:
+                # re.IGNORECASE and str.lower() disagree on a few characters (e.g. "İ")
+                variants = next((variants for variants in self._blacklist_literals.values()
+                                 if re.fullmatch(variants[0][1], text, flags=re.IGNORECASE)), [(text, text)])
+            # Case variants of a literal: the one written as matched, or else the first one listed
+            term = next((term for literal, term in variants if literal == text), variants[0][1])
+        else:
+            term = self._blacklist_patterns[match.lastgroup]
+        self.blacklist_hits[term] += 1
+        if self._matched_terms is not None:
+            self._matched_terms.append(term)
+        return ""
+
     def remove_special_chars_whitelist(self, item):
-        """Removes not allowed special characters."""
-        allowed_chars = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZáéíóúüÁÉÍÓÚÜñÑ "
-        if self.keep_cp:
-            allowed_chars += ".,¿?¡!;:"
-        allowed_chars_pattern = f"[^{allowed_chars}]"
-        if self.blacklist_terms:
-            for term in self.blacklist_terms:
-                item[self.tag] = re.sub(term, "", item[self.tag], flags=re.IGNORECASE)
-        item[self.tag] = re.sub(allowed_chars_pattern, " ", item[self.tag])
-        item[self.tag] = re.sub(r" +", " ", item[self.tag]).strip()
+        """
+        Removes blacklisted terms and not allowed special characters.
+        The blacklist is matched in a single left-to-right scan; when two terms overlap the earliest match wins
+        (at the same position, the longest literal term, then the non literal terms in list order).
+        """
+        text = item[self.tag]
+        if self._blacklist_regex is not None:
+            text = self._blacklist_regex.sub(self._remove_blacklist_term, text)
+        text = self._disallowed_regex.sub(" ", text)
+        text = _SPACES_REGEX.sub(" ", text).strip()
         if not self.keep_cp:
-            item[self.tag] = item[self.tag].lower()
+            text = text.lower()
+        item[self.tag] = text
         return item
     
+    def normalize_text(self, text):
+        """Returns the normalized version of a single string (diacritics and special characters), without any filtering."""
+        if self.cache is not None:
+            key = (self._cache_config, text)
+            cached = self.cache.get(key)
+            if cached is None:
+                self._matched_terms = []
+                cached = (self._normalize_uncached(text), tuple(self._matched_terms))
+                self._matched_terms = None
+                self.cache.put(key, cached)
+            else:
+                # Replay the blacklist hits of the sentence, so the counts do not depend on the cache contents
+                self.blacklist_hits.update(cached[1])
+            return cached[0]
+        return self._normalize_uncached(text)
+
+    def _normalize_uncached(self, text):
+        if self._time_rules:
+            return self._normalize_text_timed(text)
+        item = self.replace_diacritics({self.tag: text})
+        return self.remove_special_chars_whitelist(item)[self.tag]
+
+    def _normalize_text_timed(self, text):
+        """Same as `replace_diacritics` + `remove_special_chars_whitelist`, timing each rule in `rule_times`."""
+        times = self.rule_times
+        start = perf_counter()
+        text = text.translate(self._diacritic_table)
+        if self._diacritic_regex is not None:
+            text = self._diacritic_regex.sub(lambda m: self._diacritic_replacements[m.lastgroup], text)
+        end = perf_counter()
+        times["diacritics"] += end - start
+        rules = ["diacritics"]
+        if self._blacklist_regex is not None:
+            start = end
+            text = self._blacklist_regex.sub(self._remove_blacklist_term, text)
+            end = perf_counter()
+            times["blacklist"] += end - start
+            rules.append("blacklist")
+        start = end
+        text = self._disallowed_regex.sub(" ", text)
+        end = perf_counter()
+        times["special_chars"] += end - start
+        start = end
+        text = _SPACES_REGEX.sub(" ", text).strip()
+        if not self.keep_cp:
+            text = text.lower()
+        times["spaces_case"] += perf_counter() - start
+        self.rule_calls.update(rules + ["special_chars", "spaces_case"])
+        return text
+
+    def _set_rule_timing(self, enabled):
+        self._time_rules = enabled
+        self.rule_times.clear()
+        self.rule_calls.clear()
+
     def in_duration_threshold(self, item):
         """Returns True if duration is within min/max threshold or missing; False if duration exists and is out of bounds."""
         duration = item.get("duration")
         if duration is None:
             return True
-        if not (self.min_duration <= duration <= self.max_duration):
-            if self.verbose:
-                logging.info(f"Removed (duration out of bounds): {item.get('audio_filepath', 'Unknown file')}")
-            return False
-        return True
+        return self.min_duration <= duration <= self.max_duration
 
-    def clean_sentences(self, data):
-        clean_data = []
-        emptytext_entries = []
-        acronyms_entries = []
-        for item in tqdm(data, disable=not self.verbose):
-            if self.in_duration_threshold(item):
-                acronyms = bool(re.search(r'\b[\w\d]*[A-Z]{2,}[\w\d]*\b', item[self.tag])) if self.remove_acronyms else False
-                if not acronyms:
-                    self.unclean_char_list.update(set(item[self.tag]))
-                    item = self.replace_diacritics(item)
-                    item = self.remove_special_chars_whitelist(item)
-                    if self.remove_emptytext and not re.search(r"[A-Za-z]",item["text"]):
-                        emptytext_entries.append(item)
-                    else:
-                        clean_data.append(item)
-                    self.clean_char_list.update(set(item[self.tag]))
+    def _clean_shard(self, data):
+        """
+        Normalizes a shard of items.
+        :return: list of (status, item) in input order, status being 'clean', 'duration', 'acronyms' or 'emptytext',
+                 plus the sets of characters seen before and after cleaning.
+        """
+        results = []
+        unclean_chars = set()
+        clean_chars = set()
+        for item in data:
+            if not self.in_duration_threshold(item):
+                results.append(("duration", item))
+                continue
+            if self.remove_acronyms and _ACRONYM_REGEX.search(item[self.tag]):
+                results.append(("acronyms", item))
+                continue
+            unclean_chars.update(item[self.tag])
+            item[self.tag] = self.normalize_text(item[self.tag])
+            clean_chars.update(item[self.tag])
+            if self.remove_emptytext and not _LETTER_REGEX.search(item[self.tag]):
+                results.append(("emptytext", item))
+            else:
+                results.append(("clean", item))
+        return results, unclean_chars, clean_chars
+
+    def _iter_shard_results(self, data):
+        """
+        Yields the `_clean_shard` results of `data` in input order, one shard of `chunk_size` items at a time.
+        With workers > 1 the shards are normalized in a process pool, keeping at most 2 shards per worker in flight.
+        """
+        shards = iter_chunks(tqdm(data, disable=not self.verbose), self.chunk_size)
+        if self.state is not None:
+            yield from self._iter_shard_results_with_state(shards)
+            return
+        yield from self._iter_computed_shards(shards)
+
+    def _iter_computed_shards(self, shards):
+        """Yields the `_clean_shard` result of each shard, serially or in a process pool."""
+        if self.workers <= 1:
+            for shard in shards:
+                yield self._clean_shard(shard)
+            return
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=(self,)) as executor:
+            pending = deque()
+            for shard in shards:
+                pending.append(executor.submit(_clean_shard_worker, shard))
+                if len(pending) >= 2 * self.workers:
+                    yield self._merge_worker_result(pending.popleft().result())
+            while pending:
+                yield self._merge_worker_result(pending.popleft().result())
+
+    def _iter_shard_results_with_state(self, shards):
+        """
+        Same as `_iter_shard_results`, computing only the items that are not in the build state.
+        The fingerprints are taken before normalization, as the serial path modifies the items in place.
+        """
+        pending = deque()
+        def missing_items():
+            for shard in shards:
+                fingerprints = [fingerprint(self._state_config, item) for item in shard]
+                cached = self.state.get_many("normalizer", fingerprints)
+                pending.append((fingerprints, cached))
+                yield [item for item, key in zip(shard, fingerprints) if key not in cached]
+        for computed, unclean_chars, clean_chars in self._iter_computed_shards(missing_items()):
+            fingerprints, cached = pending.popleft()
+            computed = iter(computed)
+            results = []
+            new_entries = []
+            for key in fingerprints:
+                if key in cached:
+                    status, item = cached[key]
                 else:
-                    acronyms_entries.append(item)
+                    status, item = next(computed)
+                    new_entries.append((key, (status, item)))
+                results.append((status, item))
+            self.state.put_many("normalizer", new_entries)
+            yield results, unclean_chars, clean_chars
+
+    def _merge_worker_result(self, worker_result):
+        """
+        Adds the blacklist hits (and rule timings) of a worker shard to `blacklist_hits` (and `rule_times`)
+        and returns its `_clean_shard` result.
+        """
+        shard_result, blacklist_hits, rule_times, rule_calls = worker_result
+        self.blacklist_hits.update(blacklist_hits)
+        self.rule_times.update(rule_times)
+        self.rule_calls.update(rule_calls)
+        return shard_result
+
+    def iter_clean(self, data):
+        """
+        Streaming version of `clean_sentences`: yields the clean items of `data` (list or any iterable, e.g.
+        `corpus_utils.iter_manifest`) without holding the whole dataset in memory. The summary is logged
+        once `data` is exhausted; it lists the first `MAX_LOGGED_REMOVED` removed entries of each reason and
+        counts the rest.
+        """
+        total = 0
+        counts = {"duration": 0, "acronyms": 0, "emptytext": 0}
+        removed = {"duration": [], "acronyms": [], "emptytext": []}
+        profiling_on = profiling.active_profiler() is not None
+        self._set_rule_timing(profiling_on)
+        for results, unclean_chars, clean_chars in self._iter_shard_results(data):
+            self.unclean_char_list.update(unclean_chars)
+            self.clean_char_list.update(clean_chars)
+            total += len(results)
+            for status, item in results:
+                if status == "clean":
+                    yield item
+                else:
+                    counts[status] += 1
+                    if self.verbose and (status == "duration" or self.verbose_type == "all") \
+                            and len(removed[status]) < self.MAX_LOGGED_REMOVED:
+                        removed[status].append(item)
+        if profiling_on:
+            profiling.add_rule_times(f"normalize ({self.lang})", self.rule_times, self.rule_calls)
+            self._set_rule_timing(False)
         if self.verbose:
-            logging.info(f"::::: Character List :::::")
-            logging.info(f"- Before cleaning (size: {len(self.unclean_char_list)})\n  {sorted(self.unclean_char_list)}")
-            logging.info(f"- After cleaning (size: {len(self.clean_char_list)})\n  {sorted(self.clean_char_list)}")
-            logging.info(f"\n::::: Removed sentences :::::")
-            n = len(acronyms_entries)
-            m = len(emptytext_entries)
-            total = len(data)
-            logging.info(f"- Total: {n+m}/{total} ({round(100*(n+m) / total, 2)}%)")
-            logging.info(f"- Entries with Acronyms:")
-            logging.info(f"  · {n}/{total} ({round(100*n / total, 2)}%)")
-            if self.verbose_type == 'all':
-                for entry in emptytext_entries:
-                    logging.info(f"    audio: {entry['audio_filepath']}")
-            logging.info(f"- Entries without Text:")
-            logging.info(f"  · {m}/{total} ({round(100*m / total, 2)}%)")
-            if self.verbose_type == 'all':
-                for entry in acronyms_entries:
-                    logging.info(f"    audio: {entry['audio_filepath']}")
-                    logging.info(f"     text: {entry[self.tag]}")
+            self._log_summary(counts, removed, total)
+
+    def clean_sentences(self, data):
+        with profiling.stage("normalize") as run:
+            clean_data = list(self.iter_clean(data))
+            run.items = len(data) if hasattr(data, "__len__") else len(clean_data)
         return clean_data
+
+    @staticmethod
+    def _log_not_listed(count, listed):
+        if count > len(listed):
+            logging.info(f"    ... and {count - len(listed)} more")
+
+    def _log_summary(self, counts, removed, total):
+        """Logs the character lists and the removed entries of a `clean_sentences` run."""
+        logging.info(f"::::: Character List :::::")
+        logging.info(f"- Before cleaning (size: {len(self.unclean_char_list)})\n  {sorted(self.unclean_char_list)}")
+        logging.info(f"- After cleaning (size: {len(self.clean_char_list)})\n  {sorted(self.clean_char_list)}")
+        logging.info(f"\n::::: Removed sentences :::::")
+        d = counts["duration"]
+        n = counts["acronyms"]
+        m = counts["emptytext"]
+        total = max(total, 1)
+        logging.info(f"- Total: {d+n+m}/{total} ({round(100*(d+n+m) / total, 2)}%)")
+        logging.info(f"- Entries with duration out of bounds [{self.min_duration}, {self.max_duration}] s:")
+        logging.info(f"  · {d}/{total} ({round(100*d / total, 2)}%)")
+        for entry in removed["duration"]:
+            logging.info(f"    audio: {entry.get('audio_filepath', 'Unknown file')}")
+        self._log_not_listed(d, removed["duration"])
+        logging.info(f"- Entries with Acronyms:")
+        logging.info(f"  · {n}/{total} ({round(100*n / total, 2)}%)")
+        if self.verbose_type == 'all':
+            for entry in removed["acronyms"]:
+                logging.info(f"    audio: {entry['audio_filepath']}")
+                logging.info(f"     text: {entry[self.tag]}")
+            self._log_not_listed(n, removed["acronyms"])
+        logging.info(f"- Entries without Text:")
+        logging.info(f"  · {m}/{total} ({round(100*m / total, 2)}%)")
+        if self.verbose_type == 'all':
+            for entry in removed["emptytext"]:
+                logging.info(f"    audio: {entry['audio_filepath']}")
+            self._log_not_listed(m, removed["emptytext"])
+        if self.blacklist_terms:
+            logging.info(f"- Blacklist hits (total: {sum(self.blacklist_hits.values())}):")
+            for term, hits in self.blacklist_hits.most_common():
+                logging.info(f"  · {term}: {hits}")
+            for variants in self._blacklist_literals.values():
+                if len({term for _, term in variants}) > 1:
+                    logging.info(f"    Case variants {', '.join(term for _, term in variants)}: each match is counted on "
+                                 f"the variant written the same way, or else on {variants[0][1]}")
     
     def __call__(self,data):
         return self.clean_sentences(data)
+
+class MultiFieldNormalizer(TextNormalizer):
+    def __init__(self, lang: str, fields: dict,
+                 remove_acronyms: bool = False, remove_emptytext: bool = True, blacklist_terms = None,
+                 min_duration: float = 0.025, max_duration: float = 240,
+                 verbose: bool = True, verbose_type: str = "simple",
+                 workers: int = 1, chunk_size: int = 10000, cache: NormalizationCache = None, state = None):
+        """
+        Normalizes several text fields of each item in a single pass (e.g. references and predictions for WER).
+        The rules are compiled once per keep_cp setting and shared by all the fields that use it.
+        Duration, acronym and empty-text filtering are applied once per item, so all the fields stay row-aligned.
+        :param lang: Language ('es' or 'eu').
+        :param fields: {tag: keep_cp} of the fields to normalize, e.g. {"text": False, "pred_text": False}.
+                       The first field is the reference one: acronyms, empty text and the character lists are
+                       checked on it only (an empty prediction is a valid hypothesis).
+        :param remove_acronyms, remove_emptytext, blacklist_terms, min/max_duration, verbose, verbose_type,
+               workers, chunk_size, cache, state: As in `TextNormalizer`. The cache is shared by all the fields.
+        """
+        if not fields:
+            raise ValueError("ERROR: At least one field is needed.")
+        self.fields = dict(fields)
+        tag, keep_cp = next(iter(self.fields.items()))
+        super().__init__(lang, tag=tag, keep_cp=keep_cp, remove_acronyms=remove_acronyms,
+                         remove_emptytext=remove_emptytext, blacklist_terms=blacklist_terms,
+                         min_duration=min_duration, max_duration=max_duration,
+                         verbose=verbose, verbose_type=verbose_type, workers=workers, chunk_size=chunk_size,
+                         cache=cache, state=state)
+        normalizers = {self.keep_cp: self}
+        if not all(field_keep_cp == self.keep_cp for field_keep_cp in self.fields.values()):
+            normalizers[not self.keep_cp] = TextNormalizer(lang, keep_cp=not self.keep_cp,
+                                                           blacklist_terms=blacklist_terms, verbose=False, cache=cache)
+            normalizers[not self.keep_cp].blacklist_hits = self.blacklist_hits
+        if len(normalizers) > 1:
+            normalizers[not self.keep_cp].rule_times = self.rule_times
+            normalizers[not self.keep_cp].rule_calls = self.rule_calls
+        self._field_normalizers = [(field, normalizers[field_keep_cp]) for field, field_keep_cp in self.fields.items()]
+
+    def _set_rule_timing(self, enabled):
+        super()._set_rule_timing(enabled)
+        for _, normalizer in self._field_normalizers:
+            normalizer._time_rules = enabled
+
+    def _clean_shard(self, data):
+        """Same as `TextNormalizer._clean_shard`, normalizing every field of `fields` in the same pass."""
+        results = []
+        unclean_chars = set()
+        clean_chars = set()
+        for item in data:
+            if not self.in_duration_threshold(item):
+                results.append(("duration", item))
+                continue
+            if self.remove_acronyms and _ACRONYM_REGEX.search(item[self.tag]):
+                results.append(("acronyms", item))
+                continue
+            unclean_chars.update(item[self.tag])
+            for field, normalizer in self._field_normalizers:
+                item[field] = normalizer.normalize_text(item[field])
+            clean_chars.update(item[self.tag])
+            if self.remove_emptytext and not _LETTER_REGEX.search(item[self.tag]):
+                results.append(("emptytext", item))
+            else:
+                results.append(("clean", item))
+        return results, unclean_chars, clean_chars
+
+_worker_normalizer = None
+
+def _init_worker(normalizer):
+    """Process pool initializer: keeps one copy of the normalizer per worker process."""
+    global _worker_normalizer
+    _worker_normalizer = normalizer
+
+def _clean_shard_worker(shard):
+    """Returns the `_clean_shard` result of `shard`, the blacklist hits and the rule timings it produced."""
+    _worker_normalizer.blacklist_hits.clear()
+    _worker_normalizer.rule_times.clear()
+    _worker_normalizer.rule_calls.clear()
+    return (_worker_normalizer._clean_shard(shard), _worker_normalizer.blacklist_hits,
+            _worker_normalizer.rule_times, _worker_normalizer.rule_calls)
@@ -0,0 +1,214 @@
+"""
+Opt-in instrumentation of the corpus pipeline.
+
+While a `Profiler` is active, the main stages of `corpus_utils`, `normalizer`
+and `wer_evaluator` (manifest I/O, TSV ingestion, audio probing, hashing and
+reduction, normalization, WER alignment) record their wall and CPU time, number
+of items, bytes read/written and the peak RSS of the process, and
+`TextNormalizer` records the time spent in each normalization rule. When no
+profiler is active the instrumentation is a no-op.
+
+Usage:
+    import profiling
+    with profiling.Profiler() as profiler:
+        data = cu.tsv2data("validated.tsv", clips_folder="clips", calculate_duration=True)
+        data = TextNormalizer(lang="eu")(data)
+    profiler.log()
+    profiler.to_json("profile.json")
+    cu.profile2xlsx(profiler.report(), "profile.xlsx")
+"""
+import os
+import sys
+import json
+import time
+import logging
+from collections import Counter
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_active_profilers = []
+
+def active_profiler():
+    """The innermost active `Profiler`, or None if profiling is off."""
+    return _active_profilers[-1] if _active_profilers else None
+
+def peak_rss_mb():
+    """Peak resident set size (MB) of this process or of its largest finished child process, None if unknown."""
+    if resource is None:
+        return None
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    return round(peak * scale / 1024**2, 1)
+
+def _cpu_time():
+    """CPU time of this process and of its finished child processes (e.g. process pools)."""
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+class StageRun:
+    """Counters of one run of a stage, filled in by the instrumented code."""
+    __slots__ = ("items", "bytes_read", "bytes_written")
+
+    def __init__(self):
+        self.items = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+
+class _NullRun:
+    """Stage run of the disabled profiler: the counters stay at 0 and every update is discarded."""
+    __slots__ = ()
+    items = 0
+    bytes_read = 0
+    bytes_written = 0
+
+    def __setattr__(self, name, value):
+        pass
+
+_NULL_RUN = _NullRun()
+
+@contextmanager
+def _null_stage():
+    yield _NULL_RUN
+
+def stage(name):
+    """
+    Context manager timing a stage in the active profiler (a no-op if there is none).
+    The yielded run has `items`, `bytes_read` and `bytes_written` counters to fill in.
+    """
+    profiler = active_profiler()
+    if profiler is None:
+        return _null_stage()
+    return profiler.stage(name)
+
+def add_rule_times(stage_name, seconds, calls):
+    """Adds per-rule timings (dicts keyed by rule name) to the active profiler, if any."""
+    profiler = active_profiler()
+    if profiler is not None:
+        profiler.add_rule_times(stage_name, seconds, calls)
+
+class Profiler:
+    """
+    Collects per-stage timings while active (as a context manager, or between
+    `start` and `stop`). Profilers can be nested; stages are recorded by the
+    innermost one.
+
+    Every stage is aggregated over all its runs: calls, wall time, CPU time
+    (including the process pools that finished during the stage), items,
+    items/s, bytes read/written and peak RSS at the end of the stage. Nested
+    stages are also included in the time of the outer ones.
+    Work done inside the worker processes of a pool is only seen through the
+    stage that runs the pool, except for the normalization rule timings, which
+    the workers send back.
+    """
+    STAGE_FIELDS = ["stage", "calls", "wall_time", "cpu_time", "items", "items_per_s", "bytes_read", "bytes_written", "peak_rss_mb"]
+    RULE_FIELDS = ["stage", "rule", "calls", "time", "time_per_call_us", "share"]
+
+    def __init__(self):
+        self.stages = {}
+        self.rules = {}
+        self.wall_time = 0.0
+        self._start = None
+
+    def start(self):
+        self._start = time.perf_counter()
+        _active_profilers.append(self)
+        return self
+
+    def stop(self):
+        if self in _active_profilers:
+            _active_profilers.remove(self)
+            self.wall_time += time.perf_counter() - self._start
+        return self
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    @contextmanager
+    def stage(self, name):
+        run = StageRun()
+        wall_start = time.perf_counter()
+        cpu_start = _cpu_time()
+        try:
+            yield run
+        finally:
+            record = self.stages.setdefault(name, {"calls": 0, "wall_time": 0.0, "cpu_time": 0.0, "items": 0,
+                                                   "bytes_read": 0, "bytes_written": 0, "peak_rss_mb": None})
+            record["calls"] += 1
+            record["wall_time"] += time.perf_counter() - wall_start
+            record["cpu_time"] += _cpu_time() - cpu_start
+            record["items"] += run.items
+            record["bytes_read"] += run.bytes_read
+            record["bytes_written"] += run.bytes_written
+            rss = peak_rss_mb()
+            if rss is not None:
+                record["peak_rss_mb"] = max(record["peak_rss_mb"] or 0, rss)
+
+    def add_rule_times(self, stage_name, seconds, calls):
+        record = self.rules.setdefault(stage_name, {"time": Counter(), "calls": Counter()})
+        record["time"].update(seconds)
+        record["calls"].update(calls)
+
+    def report(self):
+        """
+        Returns
+        -------
+        dict
+            {"wall_time", "peak_rss_mb", "stages": list of dict (STAGE_FIELDS), "rules": list of dict (RULE_FIELDS)}
+        """
+        stages = []
+        for name, record in self.stages.items():
+            stages.append({
+                "stage": name,
+                "calls": record["calls"],
+                "wall_time": round(record["wall_time"], 4),
+                "cpu_time": round(record["cpu_time"], 4),
+                "items": record["items"],
+                "items_per_s": round(record["items"] / record["wall_time"], 1) if record["items"] and record["wall_time"] > 0 else None,
+                "bytes_read": record["bytes_read"],
+                "bytes_written": record["bytes_written"],
+                "peak_rss_mb": record["peak_rss_mb"],
+            })
+        rules = []
+        for stage_name, record in self.rules.items():
+            total = sum(record["time"].values())
+            for rule, seconds in record["time"].most_common():
+                calls = record["calls"][rule]
+                rules.append({
+                    "stage": stage_name,
+                    "rule": rule,
+                    "calls": calls,
+                    "time": round(seconds, 4),
+                    "time_per_call_us": round(seconds / calls * 1e6, 3) if calls else None,
+                    "share": round(seconds / total, 4) if total > 0 else None,
+                })
+        wall_time = self.wall_time + (time.perf_counter() - self._start if self in _active_profilers else 0.0)
+        return {"wall_time": round(wall_time, 4), "peak_rss_mb": peak_rss_mb(), "stages": stages, "rules": rules}
+
+    def to_json(self, dst_json_filepath):
+        """Writes `report()` to a JSON file."""
+        with open(dst_json_filepath, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2)
+
+    def log(self):
+        """Logs the stage and rule timings."""
+        report = self.report()
+        logging.info(f"::::: Profile ({report['wall_time']} s, peak RSS {report['peak_rss_mb']} MB) :::::")
+        for record in report["stages"]:
+            rate = f" | {record['items_per_s']} items/s" if record["items_per_s"] is not None else ""
+            io = ""
+            if record["bytes_read"] or record["bytes_written"]:
+                io = f" | read {round(record['bytes_read'] / 1024**2, 1)} MB, written {round(record['bytes_written'] / 1024**2, 1)} MB"
+            logging.info(f"- {record['stage']}: {record['calls']} call(s), wall {record['wall_time']} s, "
+                         f"CPU {record['cpu_time']} s, {record['items']} items{rate}{io}")
+        for record in report["rules"]:
+            logging.info(f"  - {record['stage']} / {record['rule']}: {record['time']} s "
+                         f"({round(record['share']*100, 1) if record['share'] is not None else '-'} %, "
+                         f"{record['time_per_call_us']} us/call)")
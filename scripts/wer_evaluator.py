@@ -1,20 +1,246 @@
-import jiwer
 import os
+import csv
+import glob
+import json
+import time
 import logging
-from normalizer import TextNormalizer
+import argparse
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from normalizer import MultiFieldNormalizer, NormalizationCache
 import corpus_utils as cu
+import profiling
+
+def encode_words(texts, vocabulary):
+    """
+    Split texts on whitespace and map every word to an integer id.
+
+    Parameters
+    ----------
+    texts : iterable of str
+        Texts to encode.
+
+    vocabulary : dict
+        Word -> id mapping, shared by references and hypotheses. Unknown words
+        are added to it with the next free id.
+
+    Returns
+    -------
+    list of list of int
+        One list of word ids per text.
+    """
+    split_texts = [text.split() for text in texts]
+    new_words = set().union(*split_texts) - vocabulary.keys()
+    vocabulary.update(zip(new_words, range(len(vocabulary), len(vocabulary) + len(new_words))))
+    return [list(map(vocabulary.__getitem__, words)) for words in split_texts]
+
+# S, D and I counts are packed in one int64 (20 bits each) so the DP moves a single array
+_DEL = 1 << 20
+_INS = 1 << 40
+
+def _edit_counts_batch(refs, hyps):
+    """
+    Levenshtein alignment of a batch of integer-encoded sentence pairs.
+
+    The DP is computed one reference row at a time for the whole batch. Within a
+    row, insertions are resolved with a cumulative minimum instead of a loop over
+    the hypothesis words. Ties prefer substitution/hit, then deletion, then
+    insertion. Returns an (N, 3) array with substitutions, deletions, insertions.
+    """
+    n = len(refs)
+    ref_lens = np.array([len(r) for r in refs])
+    hyp_lens = np.array([len(h) for h in hyps])
+    R, H = int(ref_lens.max(initial=0)), int(hyp_lens.max(initial=0))
+    ref = np.full((n, max(R, 1)), -1, dtype=np.int64)
+    hyp = np.full((n, max(H, 1)), -2, dtype=np.int64)
+    for k, (r, h) in enumerate(zip(refs, hyps)):
+        ref[k, :len(r)] = r
+        hyp[k, :len(h)] = h
+    cols = np.arange(H + 1)
+    rows = np.arange(n)
+    # Row 0: only insertions
+    cost = np.broadcast_to(cols, (n, H + 1)).copy()
+    ops = cost * _INS
+    packed = np.zeros(n, dtype=np.int64)
+    packed[ref_lens == 0] = ops[rows, hyp_lens][ref_lens == 0]
+    t_cost = np.empty_like(cost)
+    t_ops = np.empty_like(ops)
+    for i in range(1, R + 1):
+        mismatch = (ref[:, i - 1:i] != hyp[:, :H]).astype(np.int64)
+        # Best of diagonal (hit/substitution) and up (deletion) for every column
+        diag = cost[:, :-1] + mismatch
+        up = cost[:, 1:] + 1
+        use_diag = diag <= up
+        t_cost[:, 0] = cost[:, 0] + 1
+        t_cost[:, 1:] = np.where(use_diag, diag, up)
+        t_ops[:, 0] = ops[:, 0] + _DEL
+        t_ops[:, 1:] = np.where(use_diag, ops[:, :-1] + mismatch, ops[:, 1:] + _DEL)
+        # Insertions: cost[j] = min_k<=j (t_cost[k] + j - k), ties resolved towards the largest k
+        key = (t_cost - cols) * (H + 2) + (H + 1 - cols)
+        source = H + 1 - np.minimum.accumulate(key, axis=1) % (H + 2)
+        cost = np.take_along_axis(t_cost, source, axis=1) + cols - source
+        ops = np.take_along_axis(t_ops, source, axis=1) + (cols - source) * _INS
+        done = ref_lens == i
+        packed[done] = ops[rows, hyp_lens][done]
+    return np.stack([packed & (_DEL - 1), (packed >> 20) & (_DEL - 1), packed >> 40], axis=1)
+
+def word_edit_counts(references, hypotheses, batch_size: int = 1024):
+    """
+    Compute word-level edit operations for many sentence pairs in one pass.
+
+    Words are integer-encoded with a single vocabulary, sentence pairs are
+    sorted by length and aligned in batches of `batch_size` with a vectorized
+    Levenshtein DP (see `_edit_counts_batch`).
+
+    Parameters
+    ----------
+    references : list of str
+        Reference sentences.
+
+    hypotheses : list of str
+        Hypothesis sentences, aligned with `references`.
+
+    batch_size : int, optional (default=1024)
+        Number of sentence pairs aligned together.
+
+    Returns
+    -------
+    numpy.ndarray
+        int64 array of shape (N, 4) with the hits, substitutions, deletions and
+        insertions of each sentence pair. Sentence WER is
+        (S + D + I) / (H + S + D) and corpus WER is the same ratio of the sums.
+
+    Notes
+    -----
+    - Words are whitespace-separated tokens, as in `jiwer`'s default transform.
+    - The edit distance (and therefore the WER) matches `jiwer.wer`. When several
+      alignments have the same cost, the split into S/D/I may differ from jiwer.
+    """
+    if len(references) != len(hypotheses):
+        raise ValueError(f"ERROR: {len(references)} references but {len(hypotheses)} hypotheses")
+    vocabulary = {}
+    refs = encode_words(references, vocabulary)
+    hyps = encode_words(hypotheses, vocabulary)
+    counts = np.zeros((len(refs), 4), dtype=np.int64)
+    order = np.lexsort(([len(h) for h in hyps], [len(r) for r in refs])) if refs else np.array([], dtype=np.int64)
+    for start in range(0, len(order), batch_size):
+        batch = order[start:start + batch_size]
+        counts[batch, 1:] = _edit_counts_batch([refs[k] for k in batch], [hyps[k] for k in batch])
+    counts[:, 0] = np.array([len(r) for r in refs], dtype=np.int64) - counts[:, 1] - counts[:, 2]
+    return counts
+
+def wer_from_counts(counts):
+    """
+    Sentence WERs and corpus WER from the (N, 4) hits/S/D/I array of `word_edit_counts`.
+
+    Returns
+    -------
+    tuple (numpy.ndarray, float)
+        Per-sentence WER and corpus WER (total errors / total reference words).
+
+    Raises
+    ------
+    ValueError
+        If a reference is empty (its WER is undefined), as `jiwer.wer` does.
+    """
+    errors = counts[:, 1:].sum(axis=1)
+    ref_words = counts[:, :3].sum(axis=1)
+    if (ref_words == 0).any():
+        raise ValueError("ERROR: one or more references are empty strings")
+    return errors / ref_words, errors.sum() / max(ref_words.sum(), 1)
+
+class WERAccumulator:
+    """
+    Streaming accumulator of word edit counts.
+
+    Keeps running sums of hits, substitutions, deletions, insertions and
+    sentence WERs, so the mean (sentence-level) and total (corpus-level) WER of
+    any number of utterances are obtained in O(total words) time and constant
+    extra memory. Accumulators of different shards can be combined with `merge`.
+
+    Examples
+    --------
+    >>> acc = WERAccumulator()
+    >>> for batch in batches:
+    ...     acc.update(word_edit_counts(batch_refs, batch_hyps))
+    >>> acc.mean_wer, acc.total_wer
+    """
+    def __init__(self):
+        self.hits = 0
+        self.substitutions = 0
+        self.deletions = 0
+        self.insertions = 0
+        self.sentences = 0
+        self.wer_sum = 0.0
+
+    def update(self, counts):
+        """
+        Add the (N, 4) hits/S/D/I array of `word_edit_counts`.
+
+        Returns
+        -------
+        numpy.ndarray
+            The WER of each of the N sentences.
+        """
+        wers, _ = wer_from_counts(counts)
+        hits, subs, dels, ins = (int(total) for total in counts.sum(axis=0)) if len(counts) else (0, 0, 0, 0)
+        self.hits += hits
+        self.substitutions += subs
+        self.deletions += dels
+        self.insertions += ins
+        self.sentences += len(counts)
+        self.wer_sum += float(wers.sum())
+        return wers
+
+    def add(self, reference, hypothesis):
+        """Add a single sentence pair. Returns its WER."""
+        return float(self.update(word_edit_counts([reference], [hypothesis]))[0])
+
+    def merge(self, other):
+        """Add the counts of another accumulator (e.g. from another shard) to this one."""
+        self.hits += other.hits
+        self.substitutions += other.substitutions
+        self.deletions += other.deletions
+        self.insertions += other.insertions
+        self.sentences += other.sentences
+        self.wer_sum += other.wer_sum
+        return self
+
+    @property
+    def errors(self):
+        return self.substitutions + self.deletions + self.insertions
+
+    @property
+    def ref_words(self):
+        return self.hits + self.substitutions + self.deletions
+
+    @property
+    def total_wer(self):
+        """Corpus WER: total errors / total reference words (None if empty)."""
+        return self.errors / self.ref_words if self.ref_words else None
+
+    @property
+    def mean_wer(self):
+        """Mean of the sentence WERs (None if empty)."""
+        return self.wer_sum / self.sentences if self.sentences else None
+
+def _format_wer(wer):
+    """WER in % for the logs, "-" when there was nothing to evaluate (None)."""
+    return "-" if wer is None else round(wer*100,2)
 
 def calculate_wer(manifest_filepath, lang: str="es",
                   text_tag: str="text", cp_text_tag: str="cp_text",
                   pred_text_tag: str="pred_text", cp_pred_text_tag: str="cp_pred_text",
-                  cp_field: bool=False, return_wer: bool=False, verbose: bool=True):
+                  cp_field: bool=False, return_wer: bool=False, verbose: bool=True, batch_size: int=4096,
+                  cache: NormalizationCache=None):
     """
     Calculate sentence-level and corpus-level Word Error Rate (WER) from a manifest file.
 
     Parameters
     ----------
-    manifest_filepath : str
-        Path to the manifest file (JSONL format). Each entry must contain 
+    manifest_filepath : str or corpus_utils.Manifest
+        Path to the manifest file (JSONL format), or a manifest already loaded
+        as a compact `Manifest` (left unmodified). Each entry must contain
         reference text and predicted text fields.
 
     lang : str, optional (default="es")
@@ -41,6 +267,13 @@ def calculate_wer(manifest_filepath, lang: str="es",
     verbose : bool, optional (default=True)
         If True, logs mean and total WER values to the console.
 
+    batch_size : int, optional (default=4096)
+        Number of sentences aligned per batch of `word_edit_counts`.
+
+    cache : NormalizationCache, optional (default=None)
+        Memo of normalized sentences shared by the reference and prediction fields.
+        Pass the same cache to several calls to reuse it across manifests.
+
     Returns
     -------
     tuple (list of dict, dict), optional
@@ -62,55 +295,51 @@ def calculate_wer(manifest_filepath, lang: str="es",
 
     Notes
     -----
-    - Text normalization is performed using `TextNormalizer`, once for reference text and once for predictions.
-    - Per-sentence WER is computed using `jiwer.wer()`.
-    - Corpus-level WER is computed by concatenating all texts and evaluating on the full strings.
+    - Text normalization is performed using `MultiFieldNormalizer`: reference, prediction and C&P fields
+      are normalized in a single pass, so they stay row-aligned. Rows are dropped on the reference field only.
+    - Per-sentence edit operations are computed in batches with `word_edit_counts()` and
+      accumulated with `WERAccumulator`, for plain and C&P text in the same pass.
+    - Corpus-level WER is the sum of per-sentence errors over the sum of reference words
+      (no alignment across sentence boundaries).
     - Output values are raw WER scores (0.0–1.0), not percentages.
     - Log output shows percentages for readability.
     """
-    filename = (os.path.split(manifest_filepath)[1]).replace(".json","")
-
-    data = cu.read_manifest(manifest_filepath, verbose=False)
-    data_clean = [dict(item) for item in data] 
+    if isinstance(manifest_filepath, cu.Manifest):
+        filename = (manifest_filepath.name or "manifest").replace(".json","")
+        # Iterating a Manifest builds new dicts, so the normalizer does not modify it
+        data_clean = manifest_filepath
+    else:
+        filename = (os.path.split(manifest_filepath)[1]).replace(".json","")
+        data_clean = cu.read_manifest(manifest_filepath, verbose=False)
 
-    # Create the normalizers for each field
-    normalizer = TextNormalizer(lang=lang, tag=text_tag, verbose=False)
-    pred_normalizer = TextNormalizer(lang=lang, tag=pred_text_tag, verbose=False)
-    data_clean = normalizer(data_clean)
-    data_clean = pred_normalizer(data_clean)
+    # References and predictions (and their C&P versions) are normalized together, in a single pass
+    fields = {text_tag: False, pred_text_tag: False}
     if cp_field:
-        cp_normalizer = TextNormalizer(lang=lang, tag=cp_text_tag, keep_cp=True, verbose=False)
-        cp_pred_normalizer = TextNormalizer(lang=lang, tag=cp_pred_text_tag, keep_cp=True, verbose=False)
-        data_clean = cp_normalizer(data_clean)
-        data_clean = cp_pred_normalizer(data_clean)
-
-    wer_list = []
-    wer_cp_list = []
-    total_text = ""
-    total_cp_text = ""
-    total_pred_text = ""
-    total_cp_pred_text = ""
-    for item in data_clean:
-        # Calculate normalized wer for each sentence
-        wer = jiwer.wer(item["text"], item["pred_text"])
-        wer_list.append(wer)
-        item['wer'] = wer
-        total_text += " " + item["text"]
-        total_pred_text += " " + item["pred_text"]
+        fields.update({cp_text_tag: True, cp_pred_text_tag: True})
+    normalizer = MultiFieldNormalizer(lang=lang, fields=fields, verbose=False, cache=cache)
+    data_clean = normalizer(data_clean)
 
-        if cp_field:
-            # Calculate wer with C&P for each sentence
-            wer_cp = jiwer.wer(item["cp_text"], item["cp_pred_text"])
-            wer_cp_list.append(wer_cp)
-            item['wer_cp'] = wer_cp
-            total_cp_text += " " + item["cp_text"]
-            total_cp_pred_text += " " + item["cp_pred_text"]
-
-    total_wer = jiwer.wer(total_text.strip(), total_pred_text.strip())   
-    mean_wer = sum(wer_list)/len(wer_list)
+    # Plain and C&P WER are accumulated in the same pass, one batch of sentences at a time
+    accumulator = WERAccumulator()
+    cp_accumulator = WERAccumulator()
+    with profiling.stage("wer_alignment") as run:
+        for start in range(0, len(data_clean), batch_size):
+            batch = data_clean[start:start + batch_size]
+            wers = accumulator.update(word_edit_counts([item[text_tag] for item in batch], [item[pred_text_tag] for item in batch]))
+            for item, wer in zip(batch, wers):
+                item['wer'] = float(wer)
+            if cp_field:
+                # Calculate wer with C&P for each sentence
+                wers_cp = cp_accumulator.update(word_edit_counts([item[cp_text_tag] for item in batch], [item[cp_pred_text_tag] for item in batch]))
+                for item, wer_cp in zip(batch, wers_cp):
+                    item['wer_cp'] = float(wer_cp)
+        run.items = len(data_clean)
+
+    total_wer = accumulator.total_wer
+    mean_wer = accumulator.mean_wer
     if cp_field:
-        total_wer_cp = jiwer.wer(total_cp_text.strip(), total_cp_pred_text.strip())
-        mean_wer_cp = sum(wer_cp_list)/len(wer_cp_list)
+        total_wer_cp = cp_accumulator.total_wer
+        mean_wer_cp = cp_accumulator.mean_wer
     else:
         total_wer_cp = None
         mean_wer_cp = None
@@ -124,12 +353,130 @@ def calculate_wer(manifest_filepath, lang: str="es",
         }
     if verbose:
         logging.info(f"=============[ {result['filename']} ]=============")
-        logging.info(f"- Mean WER: {round(result['mean_wer']*100,2)} %")
-        logging.info(f"- Total WER: {round(result['total_wer']*100,2)} %")
+        logging.info(f"- Mean WER: {_format_wer(result['mean_wer'])} %")
+        logging.info(f"- Total WER: {_format_wer(result['total_wer'])} %")
         if cp_field:
             logging.info(f"{'-'*(30+len(result['filename']))}") 
-            logging.info(f"- Mean WER C&P: {round(result['mean_wer_cp']*100,2)} %")
-            logging.info(f"- Total WER C&P: {round(result['total_wer_cp']*100,2)} %")
+            logging.info(f"- Mean WER C&P: {_format_wer(result['mean_wer_cp'])} %")
+            logging.info(f"- Total WER C&P: {_format_wer(result['total_wer_cp'])} %")
+        if cache is not None:
+            logging.info(f"- Normalization cache: {cache.hits} hits, {cache.misses} misses ({round(cache.hit_rate*100,2)} %)")
         logging.info(f"{'='*(30+len(result['filename']))}")    
     if return_wer: 
-        return data_clean, result
\ No newline at end of file
+        return data_clean, result
+
+REPORT_FIELDS = ["filename", "mean_wer_cp", "mean_wer", "total_wer_cp", "total_wer", "sentences", "wall_time", "utt_per_s"]
+
+def _evaluate_manifest(manifest_filepath, kwargs):
+    """Worker: `calculate_wer` on one manifest, timed."""
+    start = time.perf_counter()
+    data_clean, result = calculate_wer(manifest_filepath, return_wer=True, verbose=False, **kwargs)
+    wall_time = time.perf_counter() - start
+    result["sentences"] = len(data_clean)
+    result["wall_time"] = round(wall_time, 3)
+    result["utt_per_s"] = round(len(data_clean) / wall_time, 1) if wall_time > 0 else None
+    return result
+
+def evaluate_manifests(manifests, workers: int = None, dst_xlsx_filepath: str = None, dst_csv_filepath: str = None,
+                       dst_json_filepath: str = None, verbose: bool = True, **kwargs):
+    """
+    Evaluate many ASR output manifests in a process pool with one consolidated report.
+
+    Parameters
+    ----------
+    manifests : str or list of str
+        Glob pattern (e.g. "outputs/*.json") or list of manifest paths/patterns.
+
+    workers : int, optional (default=None)
+        Number of processes. None uses one per CPU core.
+
+    dst_xlsx_filepath : str, optional
+        Excel report (`corpus_utils.resultwer2xlsx`), rewritten as each manifest completes.
+
+    dst_csv_filepath : str, optional
+        CSV report, one row appended as each manifest completes.
+
+    dst_json_filepath : str, optional
+        JSON Lines report, one line appended as each manifest completes.
+
+    verbose : bool, optional (default=True)
+        If True, logs each result as it completes.
+
+    **kwargs :
+        Passed to `calculate_wer` (lang, cp_field, tags...).
+
+    Returns
+    -------
+    list of dict
+        One `calculate_wer` result per manifest, in input order, with the extra keys:
+            * "sentences": number of evaluated sentences
+            * "wall_time": evaluation wall time in seconds
+            * "utt_per_s": throughput in utterances per second
+
+    Notes
+    -----
+    A manifest that fails is logged and left out of the report; the rest of the
+    sweep goes on.
+    """
+    patterns = [manifests] if isinstance(manifests, str) else manifests
+    manifest_filepaths = []
+    for pattern in patterns:
+        manifest_filepaths += sorted(glob.glob(pattern)) or [pattern]
+    results = {}
+    csv_file = open(dst_csv_filepath, "w", encoding="utf-8", newline="") if dst_csv_filepath else None
+    json_file = open(dst_json_filepath, "w", encoding="utf-8") if dst_json_filepath else None
+    csv_writer = csv.DictWriter(csv_file, fieldnames=REPORT_FIELDS) if csv_file else None
+    if csv_writer:
+        csv_writer.writeheader()
+    start = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(_evaluate_manifest, path, kwargs): path for path in manifest_filepaths}
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    result = future.result()
+                    if verbose:
+                        logging.info(f"[{len(results) + 1}/{len(manifest_filepaths)}] {result['filename']}: "
+                                     f"WER {_format_wer(result['total_wer'])} % | {result['sentences']} utt | "
+                                     f"{result['wall_time']} s ({result['utt_per_s']} utt/s)")
+                except Exception as e:
+                    logging.error(f"Manifest could not be evaluated: {path} ({type(e).__name__}: {e})")
+                    continue
+                results[path] = result
+                if csv_writer:
+                    csv_writer.writerow(result)
+                    csv_file.flush()
+                if json_file:
+                    json_file.write(json.dumps(result) + "\n")
+                    json_file.flush()
+                if dst_xlsx_filepath:
+                    cu.resultwer2xlsx([results[p] for p in manifest_filepaths if p in results], dst_xlsx_filepath)
+    finally:
+        if csv_file:
+            csv_file.close()
+        if json_file:
+            json_file.close()
+    if verbose:
+        wall_time = time.perf_counter() - start
+        sentences = sum(result["sentences"] for result in results.values())
+        logging.info(f"- Evaluated {len(results)}/{len(manifest_filepaths)} manifests, {sentences} utterances "
+                     f"in {round(wall_time, 2)} s ({round(sentences / max(wall_time, 1e-9), 1)} utt/s)")
+    return [results[path] for path in manifest_filepaths if path in results]
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate the WER of many ASR output manifests in parallel.")
+    parser.add_argument("manifests", nargs="+", help="Manifest paths or glob patterns (quote the patterns).")
+    parser.add_argument("--lang", default="es", help="Normalization language: 'es' or 'eu'.")
+    parser.add_argument("--cp_field", action="store_true", help="Also compute C&P WER.")
+    parser.add_argument("--workers", type=int, default=None, help="Number of processes (default: one per core).")
+    parser.add_argument("--xlsx", default=None, help="Excel report path.")
+    parser.add_argument("--csv", default=None, help="CSV report path.")
+    parser.add_argument("--json", default=None, help="JSON Lines report path.")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    evaluate_manifests(args.manifests, workers=args.workers, dst_xlsx_filepath=args.xlsx, dst_csv_filepath=args.csv,
+                       dst_json_filepath=args.json, lang=args.lang, cp_field=args.cp_field)
+
+if __name__ == "__main__":
+    main()